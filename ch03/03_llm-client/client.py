@@ -7,7 +7,11 @@ from azure.ai.inference import ChatCompletionsClient
 from azure.ai.inference.models import SystemMessage, UserMessage
 from azure.core.credentials import AzureKeyCredential
 import json
+import time
+import asyncio
 from dotenv import load_dotenv
+from llm_cache import LLMResponseCache
+from tool_selector import ToolSelector
 
 load_dotenv()
 
@@ -19,6 +23,24 @@ server_params = StdioServerParameters(
     name="CH03/03 LLM MCP Server",
 )
 
+# Tool call execution settings
+PARALLEL_TOOL_CALLS = True       # False -> call tools one by one (original behaviour)
+MAX_CONCURRENT_TOOL_CALLS = 4    # upper bound of in-flight call_tool requests
+TOOL_CALL_TIMEOUT = 30.0         # seconds, per tool call
+AGENT_MAX_TURNS = 5              # upper bound of LLM <-> tool round trips in agent mode
+TOOL_TOP_K = int(os.environ.get("TOOL_TOP_K", "8"))  # send only the k most relevant tools (0 = all)
+
+# LLM settings (set LLM_ENDPOINT=http://127.0.0.1:8001 to use llm_stub_server.py offline)
+LLM_ENDPOINT = os.environ.get("LLM_ENDPOINT", "https://models.inference.ai.azure.com")
+LLM_MODEL = os.environ.get("LLM_MODEL", "gpt-4o")
+LLM_TEMPERATURE = 1.0
+
+# Response cache: repeated prompts (e.g. evaluation runs) skip the network
+llm_cache = LLMResponseCache(
+    ttl_seconds=float(os.environ.get("LLM_CACHE_TTL", "600")),
+    max_entries=int(os.environ.get("LLM_CACHE_SIZE", "256")),
+)
+
 #---------------------------------
 def  convert_to_llm_tool(tool):
     # print(f"TOOL: {tool}")
@@ -38,28 +60,47 @@ def  convert_to_llm_tool(tool):
     return tool_schema
 
 # LLM -----------------------------
-def call_llm(prompt, functions):
-    token = os.environ["GITHUB_TOKEN"]
-    endpoint = "https://models.inference.ai.azure.com"
-    model_name = "gpt-4o"
-    
-    client = ChatCompletionsClient(
-        endpoint=endpoint,
-        credential=AzureKeyCredential(token),
-    )
-    
-    response = client.complete(
-        messages=[
-            { "role": "system", "content": "You are a helpful assistant."},
-            { "role": "user", "content": prompt},
-        ],
-        model=model_name,
-        tools=functions,
-        # Optional parameters
-        temperature=1.0,
-        max_tokens=1000,
-        top_p=1.0,
-    )
+# One long-lived client: the underlying HTTP session (connection pool, TLS) is reused across calls
+_llm_client = None
+
+def get_llm_client():
+    global _llm_client
+    if _llm_client is None:
+        token = os.environ.get("GITHUB_TOKEN", "local-stub")
+        _llm_client = ChatCompletionsClient(
+            endpoint=LLM_ENDPOINT,
+            credential=AzureKeyCredential(token),
+        )
+    return _llm_client
+
+def close_llm_client():
+    global _llm_client
+    if _llm_client is not None:
+        _llm_client.close()
+        _llm_client = None
+
+def call_llm(prompt, functions, use_cache=True):
+    messages = [
+        { "role": "system", "content": "You are a helpful assistant."},
+        { "role": "user", "content": prompt},
+    ]
+    
+    cache_key = llm_cache.make_key(LLM_MODEL, messages, functions, LLM_TEMPERATURE)
+    response = llm_cache.get(cache_key) if use_cache else None
+    if response is not None:
+        print(f"LLM CACHE HIT: {llm_cache.stats()}")
+    else:
+        response = get_llm_client().complete(
+            messages=messages,
+            model=LLM_MODEL,
+            tools=functions,
+            # Optional parameters
+            temperature=LLM_TEMPERATURE,
+            max_tokens=1000,
+            top_p=1.0,
+        )
+        if use_cache:
+            llm_cache.put(cache_key, response)
     
     response_message = response.choices[0].message
     
@@ -74,7 +115,245 @@ def call_llm(prompt, functions):
     return functions_to_call
 
 #---------------------------------
-async def run():
+async def call_tool_timed(session, index, fn, semaphore=None, timeout=TOOL_CALL_TIMEOUT):
+    """Call one tool and return a result record: {index, name, result, error, elapsed}"""
+    record = {"index": index, "name": fn["name"], "result": None, "error": None, "elapsed": 0.0}
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(1)
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                session.call_tool(fn["name"], arguments=fn["arguments"]),
+                timeout=timeout,
+            )
+            record["result"] = result
+        except asyncio.TimeoutError:
+            record["error"] = f"timeout after {timeout}s"
+        except Exception as e:
+            record["error"] = str(e)
+        record["elapsed"] = time.perf_counter() - start
+    return record
+
+async def call_tools(session, functions_to_call,
+                     parallel=PARALLEL_TOOL_CALLS,
+                     max_concurrency=MAX_CONCURRENT_TOOL_CALLS,
+                     timeout=TOOL_CALL_TIMEOUT):
+    """Execute the tool calls requested by the LLM.
+    
+    - parallel=True : independent calls are dispatched concurrently (at most max_concurrency at once)
+    - parallel=False: calls are executed one by one
+    Results are always returned in the original order of functions_to_call.
+    """
+    start = time.perf_counter()
+    if parallel:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        records = await asyncio.gather(*[
+            call_tool_timed(session, i, fn, semaphore, timeout)
+            for i, fn in enumerate(functions_to_call)
+        ])
+    else:
+        records = []
+        for i, fn in enumerate(functions_to_call):
+            records.append(await call_tool_timed(session, i, fn, timeout=timeout))
+    total = time.perf_counter() - start
+    return list(records), total
+
+def print_timing_report(records, total):
+    """Print per-call latency and the wall-clock time of the whole turn"""
+    sum_of_calls = sum(r["elapsed"] for r in records)
+    print("    TIMING REPORT:")
+    for r in records:
+        status = "ok" if r["error"] is None else f"error: {r['error']}"
+        print(f"      <{r['index']}> {r['name']:<20} {r['elapsed'] * 1000:8.1f} ms  ({status})")
+    print(f"      wall-clock: {total * 1000:.1f} ms, sum of calls: {sum_of_calls * 1000:.1f} ms")
+
+# Streaming agent loop ------------
+async def stream_llm_updates(messages, functions):
+    """Stream chat completion updates as they arrive.
+    
+    The azure client's streaming iterator is blocking, so it is drained in a worker thread
+    and every update is handed to the event loop through a queue.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    done = object()
+    
+    def producer():
+        try:
+            response = get_llm_client().complete(
+                messages=messages,
+                model=LLM_MODEL,
+                tools=functions,
+                stream=True,
+                temperature=LLM_TEMPERATURE,
+                max_tokens=1000,
+                top_p=1.0,
+            )
+            for update in response:
+                loop.call_soon_threadsafe(queue.put_nowait, update)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+    
+    worker = loop.run_in_executor(None, producer)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        await worker
+
+class ToolCallAccumulator:
+    """Assemble streamed tool-call deltas into complete tool calls.
+    
+    Tool calls are streamed one after another, so a call is complete as soon as
+    a delta for the next index starts (or the stream finishes).
+    """
+    def __init__(self):
+        self.calls = []
+        self.emitted = 0
+    
+    def add(self, tool_call_deltas):
+        """Merge deltas and return the tool calls that became complete"""
+        for delta in tool_call_deltas:
+            index = delta.get("index")
+            if index is None:
+                index = len(self.calls) if delta.get("id") else max(len(self.calls) - 1, 0)
+            while len(self.calls) <= index:
+                self.calls.append({"id": None, "name": "", "arguments": ""})
+            call = self.calls[index]
+            if delta.get("id"):
+                call["id"] = delta["id"]
+            function = delta.get("function") or {}
+            call["name"] += function.get("name") or ""
+            call["arguments"] += function.get("arguments") or ""
+        # every call before the last one has stopped receiving deltas
+        return self._emit(len(self.calls) - 1)
+    
+    def finish(self):
+        """Stream ended: the remaining calls are complete"""
+        return self._emit(len(self.calls))
+    
+    def _emit(self, upto):
+        completed = self.calls[self.emitted:upto] if upto > self.emitted else []
+        self.emitted = max(self.emitted, upto)
+        return completed
+
+def tool_result_text(record):
+    """Text sent back to the model for one tool call record"""
+    if record["error"] is not None:
+        return f"ERROR: {record['error']}"
+    texts = [c.text for c in record["result"].content if getattr(c, "text", None) is not None]
+    return "\n".join(texts)
+
+async def invalid_arguments_record(index, name, error):
+    return {"index": index, "name": name, "result": None, "error": f"invalid arguments: {error}", "elapsed": 0.0}
+
+async def run_agent_turn(session, messages, functions, semaphore, turn):
+    """One LLM turn: stream tokens, start tools as soon as their call is complete, feed results back"""
+    turn_start = time.perf_counter()
+    ttft = None
+    content_parts = []
+    accumulator = ToolCallAccumulator()
+    tool_calls = []
+    tasks = []
+    
+    def start_tool(call):
+        index = len(tasks)
+        call["id"] = call["id"] or f"call_{turn}_{index}"
+        tool_calls.append(call)
+        print(f"\n    -> TOOL CALL READY <{index}>: {call['name']}({call['arguments']})")
+        try:
+            arguments = json.loads(call["arguments"] or "{}")
+        except json.JSONDecodeError as e:
+            tasks.append(asyncio.create_task(invalid_arguments_record(index, call["name"], e)))
+            return
+        fn = {"name": call["name"], "arguments": arguments}
+        tasks.append(asyncio.create_task(call_tool_timed(session, index, fn, semaphore)))
+    
+    async for update in stream_llm_updates(messages, functions):
+        if ttft is None:
+            ttft = time.perf_counter() - turn_start
+        for choice in update.choices:
+            delta = choice.delta
+            if delta is None:
+                continue
+            if delta.content:
+                content_parts.append(delta.content)
+                print(delta.content, end="", flush=True)
+            if delta.tool_calls:
+                for call in accumulator.add(delta.tool_calls):
+                    start_tool(call)
+    llm_elapsed = time.perf_counter() - turn_start
+    for call in accumulator.finish():
+        start_tool(call)
+    print()
+    
+    records = list(await asyncio.gather(*tasks))
+    for r in records:
+        print(f"    <{r['index']}> TOOLS RESULT: {tool_result_text(r)} ({r['elapsed'] * 1000:.1f} ms)")
+    
+    assistant_message = {"role": "assistant", "content": "".join(content_parts) or None}
+    if tool_calls:
+        assistant_message["tool_calls"] = [
+            {"id": c["id"], "type": "function", "function": {"name": c["name"], "arguments": c["arguments"]}}
+            for c in tool_calls
+        ]
+    messages.append(assistant_message)
+    for call, record in zip(tool_calls, records):
+        messages.append({"role": "tool", "tool_call_id": call["id"], "content": tool_result_text(record)})
+    
+    turn_latency = time.perf_counter() - turn_start
+    return {
+        "turn": turn,
+        "ttft": ttft if ttft is not None else llm_elapsed,
+        "llm_time": llm_elapsed,
+        "tool_wait": turn_latency - llm_elapsed,
+        "turn_latency": turn_latency,
+        "tool_calls": len(tool_calls),
+    }
+
+async def run_agent(session, prompt, functions, max_turns=AGENT_MAX_TURNS):
+    """Multi-turn agent loop: keep calling the model until it answers without tool calls"""
+    messages = [
+        { "role": "system", "content": "You are a helpful assistant."},
+        { "role": "user", "content": prompt},
+    ]
+    semaphore = asyncio.Semaphore(max(1, MAX_CONCURRENT_TOOL_CALLS))
+    metrics = []
+    for turn in range(1, max_turns + 1):
+        print(f"\n[TURN {turn}] ------------------------------")
+        turn_metrics = await run_agent_turn(session, messages, functions, semaphore, turn)
+        metrics.append(turn_metrics)
+        if turn_metrics["tool_calls"] == 0:
+            break
+    else:
+        print(f"    stopped after {max_turns} turns")
+    print_agent_metrics(metrics)
+    return messages, metrics
+
+def print_agent_metrics(metrics):
+    print("\n    AGENT METRICS:")
+    for m in metrics:
+        print(f"      turn {m['turn']}: ttft {m['ttft'] * 1000:7.1f} ms, "
+              f"llm {m['llm_time'] * 1000:7.1f} ms, tool wait {m['tool_wait'] * 1000:7.1f} ms, "
+              f"turn {m['turn_latency'] * 1000:7.1f} ms, tool calls {m['tool_calls']}")
+    print(f"      total: {sum(m['turn_latency'] for m in metrics) * 1000:.1f} ms over {len(metrics)} turn(s)")
+
+#---------------------------------
+async def run(agent_mode=False):
+    try:
+        await run_session(agent_mode)
+    finally:
+        close_llm_client()
+
+async def run_session(agent_mode=False):
     async with stdio_client(server_params) as (read, write):
         async with ClientSession(read, write) as session:
             # Init the connection
@@ -100,6 +379,17 @@ async def run():
             
             prompt = "Add 2 to 20"
             
+            # send only the tools relevant to the prompt
+            selected = ToolSelector(functions).select(prompt, TOOL_TOP_K)
+            print(f"SELECTED TOOLS: {[f['function']['name'] for f in selected]} ({len(selected)}/{len(functions)})")
+            functions = selected
+            
+            if agent_mode:
+                # streaming multi-turn agent loop
+                print("\n[3] RUNNING AGENT LOOP --------------------------------")
+                await run_agent(session, prompt, functions)
+                return
+            
             # ask LLM what tools to all, if any
             print("\n[3] CALLING LLM --------------------------------")
             functions_to_call = call_llm(prompt, functions)
@@ -108,8 +398,13 @@ async def run():
             print("\n[4] CALLING TOOLS --------------------------------")
             for i, fn in enumerate(functions_to_call):
                 print(f"<{i}> CALLING TOOL: {fn}")
-                result = await session.call_tool(fn["name"], arguments=fn["arguments"])
-                print(f"    TOOLS RESULT: {result.content}\n")
+            records, total = await call_tools(session, functions_to_call)
+            for r in records:
+                if r["error"] is None:
+                    print(f"<{r['index']}> TOOLS RESULT: {r['result'].content}")
+                else:
+                    print(f"<{r['index']}> TOOLS ERROR: {r['error']}")
+            print_timing_report(records, total)
             
             # # Read a resource
             # print("\n[3] READING RESOURCE:")
@@ -130,8 +425,10 @@ async def run():
             # print(f"\n[5] CALLING TOOL - <get_greeting> result: {result}")
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(run())
+    import sys
+    # > uv run client.py        : one LLM call + one round of tool calls
+    # > uv run client.py agent  : streaming multi-turn agent loop
+    asyncio.run(run(agent_mode="agent" in sys.argv[1:]))
     
 #---------------------------------
 # > uv run client.py
@@ -0,0 +1,76 @@
+#
+# LLM 응답 캐시
+#---------------------------------
+# -- 같은 (model, messages, tools, temperature) 조합으로 LLM을 다시 호출하면
+#    네트워크를 타지 않고 이전 응답을 그대로 돌려줍니다.
+#    평가(evaluation) 실행처럼 같은 프롬프트를 반복해서 보내는 경우에 유용합니다.
+# -- TTL(유효 시간)과 최대 항목 수(size bound)를 넘으면 오래된 항목부터 버립니다 (LRU).
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+
+def _digest(value) -> str:
+    """JSON 직렬화 가능한 값의 안정적인(sort_keys) sha256 해시"""
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def tools_hash(tools) -> str:
+    """도구 스키마 목록의 해시 (캐시 키의 일부)"""
+    return _digest(tools or [])
+
+
+class LLMResponseCache:
+    """TTL + LRU 크기 제한이 있는 인메모리 LLM 응답 캐시"""
+
+    def __init__(self, ttl_seconds: float = 600.0, max_entries: int = 256, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model, messages, tools, temperature) -> str:
+        """(model, messages, tools hash, temperature) 로 캐시 키 생성"""
+        return _digest({
+            "model": model,
+            "messages": messages,
+            "tools": tools_hash(tools),
+            "temperature": temperature,
+        })
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, value = entry
+        if self._clock() - stored_at > self.ttl_seconds:
+            # 만료된 항목
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,125 @@
+#
+# 로컬 LLM stub 서버 (오프라인 테스트용)
+#---------------------------------
+# -- GitHub Models(Azure AI Inference) 의 `/chat/completions` 엔드포인트를 흉내냅니다.
+#    네트워크나 GITHUB_TOKEN 없이 client.py 를 실행해 볼 수 있습니다.
+# -- 프롬프트에서 숫자 두 개를 찾으면 `add` 도구 호출을, 그렇지 않으면 일반 텍스트 응답을 돌려줍니다.
+# -- 마지막 메시지가 도구 결과(role=tool)이면 그 결과를 이용해 최종 답변을 만듭니다 (agent loop 용).
+# -- `"stream": true` 요청에는 SSE(`data: {...}`) 청크로 토큰/도구 호출 delta 를 흘려보냅니다.
+#    STUB_TOKEN_DELAY(초) 로 청크 사이 지연을 조절할 수 있습니다.
+# -- `/stats` 에서 받은 요청 수를 확인할 수 있습니다 (캐시 적중 여부 확인용).
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+app = FastAPI()
+
+stats = {"requests": 0, "stream_requests": 0}
+
+TOKEN_DELAY = float(os.environ.get("STUB_TOKEN_DELAY", "0.02"))
+
+def build_message(messages, tools):
+    """마지막 user 메시지를 보고 assistant 메시지를 만든다"""
+    if messages and messages[-1].get("role") == "tool":
+        results = [m.get("content") for m in messages if m.get("role") == "tool"]
+        return {"role": "assistant", "content": f"The result is {results[-1]}."}, "stop"
+
+    prompt = ""
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            prompt = message.get("content") or ""
+            break
+
+    tool_names = [t["function"]["name"] for t in (tools or [])]
+    numbers = re.findall(r"-?\d+", prompt)
+    if "add" in tool_names and len(numbers) >= 2:
+        arguments = f'{{"a":{numbers[0]},"b":{numbers[1]}}}'
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{uuid.uuid4().hex[:24]}",
+                "type": "function",
+                "function": {"name": "add", "arguments": arguments},
+            }],
+        }, "tool_calls"
+    return {"role": "assistant", "content": f"(stub) {prompt}"}, "stop"
+
+def stream_chunks(message, finish_reason, model):
+    """assistant 메시지를 OpenAI 스타일 streaming delta 청크들로 쪼갠다"""
+    chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+
+    def chunk(delta, finish=None):
+        return {
+            "id": chunk_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+        }
+
+    yield chunk({"role": "assistant", "content": ""})
+    for token in re.findall(r"\S+\s*", message.get("content") or ""):
+        yield chunk({"content": token})
+    for index, tool_call in enumerate(message.get("tool_calls") or []):
+        yield chunk({"tool_calls": [{
+            "index": index,
+            "id": tool_call["id"],
+            "type": "function",
+            "function": {"name": tool_call["function"]["name"], "arguments": ""},
+        }]})
+        arguments = tool_call["function"]["arguments"]
+        for start in range(0, len(arguments), 4):
+            yield chunk({"tool_calls": [{
+                "index": index,
+                "function": {"arguments": arguments[start:start + 4]},
+            }]})
+    yield chunk({}, finish_reason)
+
+async def sse_stream(message, finish_reason, model):
+    for item in stream_chunks(message, finish_reason, model):
+        await asyncio.sleep(TOKEN_DELAY)
+        yield f"data: {json.dumps(item)}\n\n"
+    yield "data: [DONE]\n\n"
+
+@app.post("/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["requests"] += 1
+    message, finish_reason = build_message(body.get("messages", []), body.get("tools"))
+    if body.get("stream"):
+        stats["stream_requests"] += 1
+        return StreamingResponse(
+            sse_stream(message, finish_reason, body.get("model", "stub-model")),
+            media_type="text/event-stream",
+        )
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub-model"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=8001)
+
+#--실행 방법 (터미널 2개)
+# 1. stub 서버 실행
+# > uv run python llm_stub_server.py
+# 2. client 를 stub 서버로 연결
+# > LLM_ENDPOINT=http://127.0.0.1:8001 uv run python client.py
+# 3. streaming agent loop 모드
+# > LLM_ENDPOINT=http://127.0.0.1:8001 uv run python client.py agent
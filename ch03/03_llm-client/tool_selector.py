@@ -0,0 +1,94 @@
+#
+# 관련도 기반 도구 선택기 (tool selector)
+#---------------------------------
+# -- 여러 MCP 서버를 모아 수백 개의 도구를 노출하면, 매 LLM 요청마다 전체 스키마를 보내는 비용
+#    (요청 크기, 모델 지연 시간)이 커집니다.
+# -- 도구 이름/설명/파라미터 이름으로 작은 키워드 인덱스(BM25)를 만들어 두고,
+#    프롬프트와 관련도가 높은 상위 k개 도구만 골라서 LLM에 보냅니다.
+# -- 외부 라이브러리나 임베딩 모델 없이 동작합니다.
+import math
+import re
+from collections import Counter
+
+_WORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# 너무 흔해서 관련도 판단에 도움이 안 되는 단어들
+_STOP_WORDS = {
+    "a", "an", "the", "to", "of", "and", "or", "in", "on", "for", "with", "by",
+    "is", "it", "this", "that", "me", "my", "please", "get",
+}
+
+def tokenize(text: str) -> list[str]:
+    """snake_case / camelCase 를 쪼개고 소문자화, 간단한 어미(-s, -ing, -ed) 제거"""
+    tokens = []
+    for word in _WORD.findall(text or ""):
+        word = word.lower()
+        if word in _STOP_WORDS:
+            continue
+        if len(word) > 5 and word.endswith("ing"):
+            word = word[:-3]
+        elif len(word) > 4 and word.endswith("ed"):
+            word = word[:-2]
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+def tool_document(llm_tool: dict) -> list[str]:
+    """LLM 도구 스키마(convert_to_llm_tool 결과)에서 검색용 토큰 추출"""
+    function = llm_tool["function"]
+    properties = function.get("parameters", {}).get("properties", {}) or {}
+    parts = [function["name"], function.get("description") or ""]
+    for name, prop in properties.items():
+        parts.append(name)
+        parts.append(prop.get("description", "") if isinstance(prop, dict) else "")
+    # 도구 이름은 가장 강한 신호이므로 한 번 더 넣어 가중치를 준다
+    parts.append(function["name"])
+    return tokenize(" ".join(parts))
+
+class ToolSelector:
+    """도구 설명 위의 BM25 키워드 인덱스"""
+
+    def __init__(self, llm_tools: list[dict], k1: float = 1.2, b: float = 0.75):
+        self.tools = list(llm_tools)
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [Counter(tool_document(t)) for t in self.tools]
+        self._lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        doc_freq = Counter()
+        for tf in self._term_freqs:
+            doc_freq.update(tf.keys())
+        n = len(self.tools)
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+
+    def scores(self, prompt: str) -> list[float]:
+        query = tokenize(prompt)
+        result = []
+        for tf, length in zip(self._term_freqs, self._lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length) if self._avg_length else self.k1
+            for term in query:
+                freq = tf.get(term)
+                if freq:
+                    score += self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            result.append(score)
+        return result
+
+    def select(self, prompt: str, k: int) -> list[dict]:
+        """프롬프트와 관련도가 높은 상위 k개 도구 (원래 순서 유지)
+
+        - 도구 수가 k 이하이면 전체를 그대로 돌려준다
+        - 어떤 도구도 매칭되지 않으면 잘라내지 않고 전체를 돌려준다 (모델이 판단하도록)
+        """
+        if k <= 0 or len(self.tools) <= k:
+            return list(self.tools)
+        scores = self.scores(prompt)
+        if not any(scores):
+            return list(self.tools)
+        ranked = sorted(range(len(self.tools)), key=lambda i: (-scores[i], i))
+        chosen = sorted(i for i in ranked[:k] if scores[i] > 0)
+        return [self.tools[i] for i in chosen]
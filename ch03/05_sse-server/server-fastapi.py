@@ -9,6 +9,7 @@
 # 1. 라이브러리 임포트
 from fastapi import FastAPI
 from mcp.server.fastmcp import FastMCP
+from sse_cluster import RoutedSseTransport, mcp_sse_routes, sse_stats_route
 
 # 2. MCP 서버 인스턴스 생성
 mcp = FastMCP(name="CH03/05 FastAPI SSE Server", version="1.0.0")
@@ -20,8 +21,16 @@ app = FastAPI()
 # 4. FastAPI 앱에 MCP SSE 앱 마운트하기
 #    FastAPI의 `mount` 메서드를 사용하여 특정 경로에 다른 ASGI 앱을 연결합니다.
 #    이렇게 하면 FastAPI의 기능과 MCP의 기능을 하나의 서버에서 함께 사용할 수 있습니다.
-app.mount("/", mcp.sse_app())
-app.mount("/sse", mcp.sse_app())
+#    -- mcp.sse_app() 을 두 번 마운트하는 대신, SSE transport 하나(세션 테이블 하나)를
+#       "/" 와 "/sse" 두 prefix 에 라우팅합니다. (sse_cluster.py 참고)
+#    -- "/" 에 마운트하면 그 뒤에 등록한 /health 같은 FastAPI 경로가 가려지므로, 라우트를 직접 추가합니다.
+sse_transport = RoutedSseTransport(
+    "/messages/",
+    security_settings=mcp.settings.transport_security,
+    max_connections=10000,
+)
+app.router.routes.extend(mcp_sse_routes(mcp, sse_transport, prefixes=("", "/sse")))
+app.router.routes.append(sse_stats_route(sse_transport))
 
 
 # 5. MCP 서버 기능 추가 (기존과 동일)
@@ -21,6 +21,7 @@
 from starlette.applications import Starlette
 from starlette.routing import Mount, Host
 from mcp.server.fastmcp import FastMCP
+from sse_cluster import RoutedSseTransport, mcp_sse_routes, sse_stats_route, run_workers
 
 mcp = FastMCP(name="CH03/05 SSE Server", version="1.0.0")
 
@@ -31,12 +32,28 @@ mcp = FastMCP(name="CH03/05 SSE Server", version="1.0.0")
 # connections and messages respectively. The rest of the app, like adding features like tools, 
 # happens like with stdio servers.
 #  That ends up mounting an /sse and /messages route on the app instance.
-app = Starlette(
-    routes=[
-        Mount("/", app=mcp.sse_app()),
-        Mount("/sse", app=mcp.sse_app()),
-    ]
-)
+# -- mcp.sse_app() 대신 RoutedSseTransport 를 사용합니다.
+#    세션 소유 워커를 session_store 에 기록하므로, 멀티 워커 모드에서 다른 워커로 들어온
+#    POST /messages/?session_id=... 도 소유 워커로 전달됩니다. (sse_cluster.py 참고)
+# -- mcp.sse_app() 을 "/" 와 "/sse" 에 두 번 마운트하면 transport(세션 테이블)가 두 개 생기고,
+#    "/" 마운트가 모든 경로를 가져가서 "/sse" 마운트는 실제로 쓰이지 않았습니다.
+#    이제 transport 하나를 두 prefix 에 라우팅합니다: /sse, /messages/, /sse/sse, /sse/messages/
+# -- GET /sse-stats : 연결 수, heartbeat, 유휴 연결당 메모리
+MAX_SSE_CONNECTIONS = 10000
+
+def build_app(session_store=None, worker_address=None):
+    transport = RoutedSseTransport(
+        "/messages/",
+        store=session_store,
+        worker_address=worker_address,
+        security_settings=mcp.settings.transport_security,
+        max_connections=MAX_SSE_CONNECTIONS,
+    )
+    return Starlette(
+        routes=mcp_sse_routes(mcp, transport, prefixes=("", "/sse")) + [sse_stats_route(transport)]
+    )
+
+app = build_app()
 
 # 3. 서버 기능 추가
 @mcp.tool()
@@ -50,9 +67,16 @@ def get_greeting(name: str) -> str:
     return f"Hello, {name}!"
 
 # # 4. 서버 실행
+# > uv run server.py               : 단일 프로세스
+# > uv run server.py --workers 4   : 워커 4개 (0 이면 CPU 코어 수만큼), 세션 소유권은 sse_sessions.db 에 공유
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    import sys
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 1
+    if workers != 1:
+        run_workers(build_app, host="0.0.0.0", port=8000, workers=workers)
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000)
 
 #----------------------------------------
 # 1] 실행 - uvicor web server로
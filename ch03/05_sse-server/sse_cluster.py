@@ -0,0 +1,376 @@
+#
+# SSE 서버 멀티 워커(multi-worker) 지원
+#----------------------------
+# -- SSE 세션은 프로세스 메모리 안에만 존재합니다 (SseServerTransport._read_stream_writers).
+#    워커를 여러 개 띄우면 `GET /sse` 를 받은 워커와 `POST /messages/?session_id=...` 를 받은 워커가
+#    달라질 수 있고, 이때 "Could not find session" (404) 이 발생합니다.
+# -- 해결 방법:
+#    1) 세션 소유 워커를 공유 저장소(SessionStore)에 기록합니다.
+#       - InMemorySessionStore : 단일 프로세스 / 테스트용
+#       - SqliteSessionStore   : 한 호스트의 여러 워커 프로세스가 공유하는 로컬 저장소 (Redis 대용)
+#    2) 자기 세션이 아닌 POST 를 받으면 저장소에서 소유 워커를 찾아 그 워커의 내부 주소로 전달(forward)합니다.
+#    3) 각 워커는 공용 포트(모든 워커가 같은 소켓을 공유)와 자기만의 내부 포트(127.0.0.1:임의포트)를 함께 listen 합니다.
+# -- transport 하나를 여러 prefix("/sse", "/sse/sse" ...)에 라우팅할 수 있습니다 (mcp_sse_routes).
+#    세션 테이블이 하나뿐이므로 어느 경로로 접속해도 같은 /messages/ 로 메시지를 보낼 수 있습니다.
+# -- 연결 수 / heartbeat(ping) / 전송 바이트 / 유휴 연결당 메모리(RSS) 를 SseConnectionStats 로 집계하고,
+#    max_connections 로 동시 SSE 연결 수를 제한합니다.
+import contextvars
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from uuid import UUID
+
+import httpx
+from mcp.server.sse import SseServerTransport
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger("sse_cluster")
+
+# 포워딩된 요청 표시 (워커 간 무한 전달 방지)
+FORWARDED_HEADER = "x-mcp-forwarded-by"
+
+#----------------------------
+# 세션 소유권 저장소
+class SessionStore(ABC):
+    """session_id -> 소유 워커 주소 를 기록하는 저장소 인터페이스"""
+
+    @abstractmethod
+    def register(self, session_id: str, owner: str) -> None: ...
+
+    @abstractmethod
+    def lookup(self, session_id: str) -> str | None: ...
+
+    @abstractmethod
+    def unregister(self, session_id: str) -> None: ...
+
+    @abstractmethod
+    def count(self) -> int: ...
+
+class InMemorySessionStore(SessionStore):
+    """프로세스 내부 dict 저장소 (단일 워커 / 테스트용)"""
+
+    def __init__(self):
+        self._owners: dict[str, str] = {}
+
+    def register(self, session_id: str, owner: str) -> None:
+        self._owners[session_id] = owner
+
+    def lookup(self, session_id: str) -> str | None:
+        return self._owners.get(session_id)
+
+    def unregister(self, session_id: str) -> None:
+        self._owners.pop(session_id, None)
+
+    def count(self) -> int:
+        return len(self._owners)
+
+class SqliteSessionStore(SessionStore):
+    """여러 워커 프로세스가 공유하는 SQLite(WAL) 저장소 - 로컬 배포용 Redis 대용"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sse_sessions ("
+            " session_id TEXT PRIMARY KEY, owner TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def register(self, session_id: str, owner: str) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO sse_sessions (session_id, owner, created_at) VALUES (?, ?, ?)",
+            (session_id, owner, time.time()),
+        )
+
+    def lookup(self, session_id: str) -> str | None:
+        row = self._conn().execute(
+            "SELECT owner FROM sse_sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def unregister(self, session_id: str) -> None:
+        self._conn().execute("DELETE FROM sse_sessions WHERE session_id = ?", (session_id,))
+
+    def remove_owner(self, owner: str) -> None:
+        """종료된 워커가 남긴 세션 기록 정리"""
+        self._conn().execute("DELETE FROM sse_sessions WHERE owner = ?", (owner,))
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM sse_sessions").fetchone()[0]
+
+#----------------------------
+# 연결 통계
+def current_rss_bytes() -> int:
+    """현재 프로세스의 RSS (Linux: /proc/self/statm, 그 외: 최대 RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+class SseConnectionStats:
+    """SSE 연결 수, heartbeat, 전송량, 유휴 연결당 메모리 집계"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.opened = 0
+        self.closed = 0
+        self.rejected = 0
+        self.heartbeats = 0
+        self.events = 0
+        self.bytes_sent = 0
+        self.baseline_rss = current_rss_bytes()
+
+    def connection_opened(self) -> None:
+        self.active += 1
+        self.opened += 1
+        self.peak = max(self.peak, self.active)
+
+    def connection_closed(self) -> None:
+        self.active -= 1
+        self.closed += 1
+
+    def body_sent(self, body: bytes) -> None:
+        self.bytes_sent += len(body)
+        # sse_starlette 의 ping 은 주석(`: ping - ...`) 으로 전송된다
+        if body.startswith(b":"):
+            self.heartbeats += 1
+        else:
+            self.events += 1
+
+    def snapshot(self, sessions: int) -> dict:
+        rss = current_rss_bytes()
+        growth = max(rss - self.baseline_rss, 0)
+        return {
+            "active_connections": self.active,
+            "peak_connections": self.peak,
+            "opened": self.opened,
+            "closed": self.closed,
+            "rejected": self.rejected,
+            "sessions": sessions,
+            "heartbeats_sent": self.heartbeats,
+            "events_sent": self.events,
+            "bytes_sent": self.bytes_sent,
+            "rss_bytes": rss,
+            "rss_growth_bytes": growth,
+            "rss_per_connection_bytes": growth // self.active if self.active else None,
+        }
+
+#----------------------------
+# 세션 생성/종료를 감지하는 SSE transport
+_new_sessions: contextvars.ContextVar[list | None] = contextvars.ContextVar("_new_sessions", default=None)
+
+class _SessionTable(dict):
+    """SseServerTransport._read_stream_writers 대체: 새 세션 ID 를 현재 연결(task)에 알려준다"""
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        sink = _new_sessions.get()
+        if sink is not None:
+            sink.append(key)
+
+class RoutedSseTransport(SseServerTransport):
+    """세션 소유권을 SessionStore 에 기록하고, 다른 워커의 세션 메시지는 소유 워커로 전달하는 transport"""
+
+    def __init__(self, endpoint: str, store: SessionStore | None = None,
+                 worker_address: str | None = None, security_settings=None,
+                 max_connections: int = 0):
+        super().__init__(endpoint, security_settings=security_settings)
+        self._read_stream_writers = _SessionTable()
+        self.store = store if store is not None else InMemorySessionStore()
+        self.worker_address = worker_address or f"pid-{os.getpid()}"
+        self.max_connections = max_connections  # 0 = 제한 없음
+        self.stats = SseConnectionStats()
+        self._http: httpx.AsyncClient | None = None
+
+    def at_capacity(self) -> bool:
+        return 0 < self.max_connections <= self.stats.active
+
+    @asynccontextmanager
+    async def connect_sse(self, scope, receive, send):
+        stats = self.stats
+
+        async def counting_send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                stats.body_sent(message["body"])
+            await send(message)
+
+        sink = []
+        token = _new_sessions.set(sink)
+        stats.connection_opened()
+        try:
+            async with super().connect_sse(scope, receive, counting_send) as streams:
+                _new_sessions.reset(token)
+                token = None
+                for session_id in sink:
+                    self.store.register(session_id.hex, self.worker_address)
+                yield streams
+        finally:
+            stats.connection_closed()
+            if token is not None:
+                _new_sessions.reset(token)
+            # 연결 종료: 세션 테이블/저장소에서 제거 (기본 transport 는 제거하지 않아 메모리가 계속 늘어남)
+            for session_id in sink:
+                self._read_stream_writers.pop(session_id, None)
+                self.store.unregister(session_id.hex)
+
+    def is_local(self, session_id: str) -> bool:
+        try:
+            return UUID(hex=session_id) in self._read_stream_writers
+        except ValueError:
+            return False
+
+    async def handle_post_message(self, scope, receive, send) -> None:
+        request = Request(scope, receive)
+        session_id = request.query_params.get("session_id")
+        if session_id is None or self.is_local(session_id) or request.headers.get(FORWARDED_HEADER):
+            return await super().handle_post_message(scope, receive, send)
+
+        owner = self.store.lookup(session_id)
+        if owner is None or owner == self.worker_address or not owner.startswith("http"):
+            return await super().handle_post_message(scope, receive, send)
+
+        response = await self._forward(request, owner)
+        await response(scope, receive, send)
+
+    async def _forward(self, request: Request, owner: str) -> Response:
+        """소유 워커의 내부 주소로 POST 를 그대로 전달"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=10.0)
+        path = request.scope.get("raw_path", b"").decode() or request.url.path
+        url = f"{owner}{path}?{request.url.query}"
+        headers = {
+            "content-type": request.headers.get("content-type", "application/json"),
+            FORWARDED_HEADER: self.worker_address,
+        }
+        try:
+            upstream = await self._http.post(url, content=await request.body(), headers=headers)
+        except httpx.HTTPError as e:
+            logger.warning("Forwarding to %s failed: %s", owner, e)
+            return Response("Owning worker unreachable", status_code=502)
+        logger.debug("Forwarded %s to %s -> %s", path, owner, upstream.status_code)
+        return Response(upstream.content, status_code=upstream.status_code)
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+#----------------------------
+# 워커 프로세스 실행
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+def _worker_main(app_factory, public_sock: socket.socket, store_path: str, log_level: str) -> None:
+    import uvicorn
+
+    internal_sock = _bind("127.0.0.1", 0)
+    worker_address = f"http://127.0.0.1:{internal_sock.getsockname()[1]}"
+    store = SqliteSessionStore(store_path)
+    app = app_factory(store, worker_address)
+    logger.info("Worker %s serving (internal %s)", os.getpid(), worker_address)
+
+    config = uvicorn.Config(app, log_level=log_level)
+    server = uvicorn.Server(config)
+    try:
+        server.run(sockets=[public_sock, internal_sock])
+    finally:
+        store.remove_owner(worker_address)
+
+def run_workers(app_factory, host: str = "0.0.0.0", port: int = 8000, workers: int = 0,
+                store_path: str = "sse_sessions.db", log_level: str = "info") -> None:
+    """공용 포트를 공유하는 워커 프로세스 N개 실행
+
+    app_factory(store, worker_address) 는 각 워커 안에서 ASGI app 을 만든다.
+    workers=0 이면 CPU 코어 수만큼 실행한다.
+    """
+    workers = workers or os.cpu_count() or 1
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(store_path + suffix):
+            os.remove(store_path + suffix)
+    SqliteSessionStore(store_path)  # 테이블 생성
+
+    public_sock = _bind(host, port)
+    processes = []
+    for _ in range(workers):
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(app_factory, public_sock, store_path, log_level),
+        )
+        process.start()
+        processes.append(process)
+    print(f"Started {workers} SSE workers on http://{host}:{port} (session store: {store_path})")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+    finally:
+        public_sock.close()
+
+#----------------------------
+# transport -> Starlette routes
+def mcp_sse_routes(mcp, transport: RoutedSseTransport, prefixes=("",),
+                   sse_path: str = "/sse", message_path: str = "/messages/"):
+    """FastMCP.sse_app() 과 같은 라우트(/sse, /messages/)를 prefix 마다 만든다
+
+    mcp.sse_app() 을 여러 번 마운트하면 prefix 마다 transport(세션 테이블)가 따로 생기지만,
+    여기서는 모든 prefix 가 같은 transport 하나를 공유한다.
+    """
+    from starlette.routing import Mount, Route
+
+    server = mcp._mcp_server
+
+    async def handle_sse(request: Request) -> Response:
+        if transport.at_capacity():
+            transport.stats.rejected += 1
+            return Response("Too many SSE connections", status_code=503)
+        async with transport.connect_sse(request.scope, request.receive, request._send) as streams:
+            await server.run(streams[0], streams[1], server.create_initialization_options())
+        return Response()
+
+    routes = []
+    for prefix in prefixes:
+        prefix = prefix.rstrip("/")
+        routes.append(Route(prefix + sse_path, endpoint=handle_sse, methods=["GET"]))
+        routes.append(Mount(prefix + message_path, app=transport.handle_post_message))
+    return routes
+
+def sse_stats_route(transport: RoutedSseTransport, path: str = "/sse-stats"):
+    """연결 통계 JSON 엔드포인트"""
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    async def sse_stats(request: Request) -> Response:
+        return JSONResponse(transport.stats.snapshot(len(transport._read_stream_writers)))
+
+    return Route(path, endpoint=sse_stats, methods=["GET"])
@@ -9,6 +9,8 @@ import mcp.types as types
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 from mcp.shared.session import RequestResponder
+from stream_client import subscribe_many, summarize_streams
+from log_collector import LogEntry, RingBufferLogCollector
 
 
 # Configure logging
@@ -20,13 +22,14 @@ logging.basicConfig(
 logger = logging.getLogger('MCP_CLIENT')
 
 #---------------------------------------------
-class LoggingCollector:
-    def __init__(self):
-        self.log_messages: list[types.LoggingMessageNotificationParams] = []
-    
-    async def __call__(self, params: types.LoggingMessageNotificationParams) -> None:
-        self.log_messages.append(params)
-        logger.info("MCP Log: %s - %s", params.level, params.data)
+class LoggingCollector(RingBufferLogCollector):
+    """Keeps only the most recent `capacity` log messages (ring buffer) plus per-level counters"""
+    def __init__(self, capacity: int = 1000, debug_sample_every: int = 1):
+        super().__init__(capacity=capacity, debug_sample_every=debug_sample_every, echo=self.log_entry)
+
+    @staticmethod
+    def log_entry(entry: LogEntry) -> None:
+        logger.info("MCP Log: %s - %s", entry.level, entry.data)
 
 #---------------------------------------------
 #-- Create a Logging Collector
@@ -68,9 +71,9 @@ async def main():
             tool_result = await session.call_tool("process_file", {"message": "hello from client"})
             logger.info("Tool Result: %s", tool_result)
             
-            if logging_collector.log_messages:
-                logger.info("Collected log messages:")
-                for log in logging_collector.log_messages:
+            if logging_collector.logs:
+                logger.info("Collected log messages: %s", logging_collector.stats())
+                for log in logging_collector.logs:
                     logger.info("Log: %s", log)
 
 #---------------------------------------------
@@ -81,16 +84,44 @@ def stream_progress(message="hello", url="http://localhost:8000/stream"):
         with requests.get(url, params=params, stream=True, timeout=10) as r:
             r.raise_for_status()
             logger.info("--- Streaming Progress ---")
-            for line in r.iter_lines():
-                if line:
+            # SSE framing: "id:" / "data:" lines, a blank line ends an event, ":" lines are heartbeats
+            event_id, data = None, []
+            for line in r.iter_lines(decode_unicode=True):
+                if line.startswith(":"):
+                    continue
+                if line.startswith("id:"):
+                    event_id = line[3:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].removeprefix(" "))
+                elif not line and data:
+                    content = "\n".join(data)
                     # Still print the streamed content to stdout for visibility
-                    decoded_line = line.decode().strip()
-                    print(decoded_line)
-                    logger.info("Stream content: %s", decoded_line)
+                    print(content)
+                    logger.info("Stream content [%s]: %s", event_id, content)
+                    event_id, data = None, []
             logger.info("--- Stream Ended ---")
     except requests.RequestException as e:
         logger.error("Error during streaming: %s", e)
 
+#---------------------------------------------
+async def stream_many(streams=200, message="hello", url="http://localhost:8000/stream", **params):
+    """Subscribe to `/stream` `streams` times concurrently over one pooled async client"""
+    logger.info("Opening %d concurrent streams to %s", streams, url)
+    # one httpx log line per request would drown the summary
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = await subscribe_many(url, streams, params={"message": message, **params})
+    summary = summarize_streams(results)
+    logger.info("streams=%d ok=%d errors=%d events=%d bytes=%d",
+                summary["streams"], summary["ok"], summary["errors"],
+                summary["events_total"], summary["bytes_total"])
+    for name in ("connect", "first_event", "event_gap"):
+        logger.info("%-12s p50=%sms p99=%sms max=%sms", name, *summary[name].values())
+    logger.info("per stream: %s events/s, %s bytes/s",
+                summary["per_stream_events_per_s"], summary["per_stream_bytes_per_s"])
+    for error in summary["error_samples"]:
+        logger.error("stream error: %s", error)
+    return summary
+
 #---------------------------------------------
 if __name__ == "__main__":
     import sys
@@ -99,6 +130,10 @@ if __name__ == "__main__":
         # MCP client mode
         logger.info("Running MCP client mode...")
         asyncio.run(main())
+    elif len(sys.argv) > 1 and sys.argv[1] == "streams":
+        # Many concurrent classic HTTP streams (async client)
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+        asyncio.run(stream_many(count))
     else:
         # Classic HTTP streaming clientmode
         logger.info("Running HTTP streaming mode...")
@@ -109,6 +144,8 @@ if __name__ == "__main__":
 # > uv run client.py mcp
 # 2. Classic HTTP streaming client mode
 # > uv run client.py
+# 3. Many concurrent classic HTTP streams (async httpx client, per-stream latency/throughput)
+# > uv run client.py streams 500
 
 #-- 출력 결과
 #---------------------------------------------
@@ -0,0 +1,318 @@
+#
+# Streamable-HTTP 이어받기(resumability)용 Event Store
+#
+# -- event store 가 없으면 `process_file` 실행 중 연결이 끊긴 클라이언트는 그 뒤의 진행 알림을 모두 잃고
+#    도구를 처음부터 다시 실행해야 합니다.
+# -- event store 를 FastMCP 에 넘기면 서버가 SSE 이벤트마다 `id:` 를 붙여 저장하고,
+#    클라이언트가 `Last-Event-ID` 헤더로 다시 접속(GET /mcp/)하면 그 이후 이벤트를 재전송(replay)합니다.
+#
+# -- RingBufferEventStore : 스트림별 ring buffer (메모리), 개수/바이트/나이(age) 기준으로 오래된 이벤트부터 제거
+# -- SqliteEventStore     : SQLite(WAL) 에 저장, 서버 재시작 후에도 유지
+# -- TieredEventStore     : 메모리 ring buffer (hot) + SQLite (cold) - 메모리에서 밀려난 이벤트도 SQLite 에서 재전송
+# -- transport 가 넘겨주는 stream id 는 요청 id("1", "2", ...) 또는 "_GET_stream" 이라 세션끼리 겹칩니다.
+#    scope_event_store_per_session() 으로 세션마다 SessionScopedEventStore 를 붙여 stream id 앞에 세션 id 를 붙입니다.
+#    SDK 에 transport 생성 hook 이 없어서 mcp 1.11 의 내부 속성에 의존합니다 (버전 고정):
+#      StreamableHTTPSessionManager._server_instances (dict), StreamableHTTPServerTransport._event_store
+#    SDK 가 바뀌어 속성이 없으면 서버 시작 시 RuntimeError 로 멈춥니다 (세션 간 이벤트가 섞인 채로 뜨지 않도록).
+import sqlite3
+import time
+from collections import deque
+from dataclasses import dataclass
+from importlib.metadata import PackageNotFoundError, version
+
+from mcp.server.streamable_http import GET_STREAM_KEY, EventCallback, EventId, EventMessage, EventStore, StreamId
+from mcp.types import JSONRPCError, JSONRPCMessage, JSONRPCResponse
+
+
+def make_event_id(seq: int, stream_id: StreamId) -> EventId:
+    # 순번이 앞에 오므로 event id 만으로 스트림과 순서를 알 수 있다
+    return f"{seq}/{stream_id}"
+
+def parse_event_id(event_id: EventId) -> tuple[int, StreamId] | None:
+    seq, sep, stream_id = event_id.partition("/")
+    if not sep or not seq.isdigit():
+        return None
+    return int(seq), stream_id
+
+def encode_message(message: JSONRPCMessage) -> str:
+    return message.model_dump_json(by_alias=True, exclude_none=True)
+
+def response_stream_id(stream_id: StreamId, message: JSONRPCMessage, has_stream, prefix: str = "") -> StreamId:
+    """요청 스트림이 이미 끊긴 뒤 나온 응답은 transport 가 GET 스트림으로 보내므로,
+    원래 요청 스트림(= 요청 id)에 저장해서 Last-Event-ID 재전송에 결과까지 포함되게 한다"""
+    if stream_id == GET_STREAM_KEY and isinstance(message.root, JSONRPCResponse | JSONRPCError):
+        request_stream = str(message.root.id)
+        if has_stream(prefix + request_stream):
+            return request_stream
+    return stream_id
+
+#---------------------------------------------
+@dataclass
+class _StoredEvent:
+    seq: int
+    stream_id: StreamId
+    stored_at: float
+    payload: str
+
+class RingBufferEventStore(EventStore):
+    """스트림별 ring buffer 메모리 event store
+
+    - max_events_per_stream : 스트림 하나가 보관하는 최대 이벤트 수
+    - max_bytes             : 전체 저장 바이트 상한 (넘으면 가장 오래된 이벤트부터 제거)
+    - max_age_seconds       : 이보다 오래된 이벤트 제거
+    """
+
+    def __init__(self, max_events_per_stream: int = 1000, max_bytes: int = 16 * 1024 * 1024,
+                 max_age_seconds: float = 600.0, clock=time.monotonic):
+        self.max_events_per_stream = max_events_per_stream
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._seq = 0
+        self._streams: dict[StreamId, deque[_StoredEvent]] = {}
+        self._order: deque[_StoredEvent] = deque()   # 전체 저장 순서 (제거 순서)
+        self.total_bytes = 0
+        self.evicted = 0
+
+    async def store_event(self, stream_id: StreamId, message: JSONRPCMessage) -> EventId:
+        stream_id = response_stream_id(stream_id, message, self.has_stream)
+        return self.append(stream_id, encode_message(message))
+
+    def has_stream(self, stream_id: StreamId) -> bool:
+        return stream_id in self._streams
+
+    def append(self, stream_id: StreamId, payload: str, seq: int | None = None) -> EventId:
+        if seq is None:
+            self._seq += 1
+            seq = self._seq
+        else:
+            self._seq = max(self._seq, seq)
+        event = _StoredEvent(seq, stream_id, self._clock(), payload)
+        stream = self._streams.setdefault(stream_id, deque())
+        stream.append(event)
+        self._order.append(event)
+        self.total_bytes += len(payload)
+        if len(stream) > self.max_events_per_stream:
+            self._discard(stream.popleft())
+        self._evict()
+        return make_event_id(seq, stream_id)
+
+    def _discard(self, event: _StoredEvent) -> None:
+        # _order 에서는 lazy 하게 제거된다 (payload 를 비워 표시)
+        self.total_bytes -= len(event.payload)
+        event.payload = ""
+        event.seq = -1
+        self.evicted += 1
+
+    def _evict(self) -> None:
+        deadline = self._clock() - self.max_age_seconds
+        while self._order:
+            oldest = self._order[0]
+            if oldest.seq == -1:
+                self._order.popleft()
+                continue
+            if self.total_bytes <= self.max_bytes and oldest.stored_at >= deadline:
+                break
+            self._order.popleft()
+            stream = self._streams.get(oldest.stream_id)
+            if stream and stream[0] is oldest:
+                stream.popleft()
+                if not stream:
+                    del self._streams[oldest.stream_id]
+            self._discard(oldest)
+
+    def events_after(self, seq: int, stream_id: StreamId) -> list[_StoredEvent] | None:
+        """seq 이후의 이벤트. seq 자체가 이미 제거되었으면 None (이어받기 불가)"""
+        self._evict()
+        stream = self._streams.get(stream_id)
+        if not stream or stream[0].seq > seq:
+            return None
+        return [event for event in stream if event.seq > seq]
+
+    async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> StreamId | None:
+        parsed = parse_event_id(last_event_id)
+        if parsed is None:
+            return None
+        seq, stream_id = parsed
+        events = self.events_after(seq, stream_id)
+        if events is None:
+            return None
+        for event in events:
+            await send_callback(EventMessage(
+                JSONRPCMessage.model_validate_json(event.payload),
+                make_event_id(event.seq, stream_id),
+            ))
+        return stream_id
+
+    def stats(self) -> dict:
+        return {
+            "streams": len(self._streams),
+            "events": sum(len(s) for s in self._streams.values()),
+            "bytes": self.total_bytes,
+            "evicted": self.evicted,
+        }
+
+#---------------------------------------------
+class SqliteEventStore(EventStore):
+    """SQLite(WAL) event store - 서버 재시작 후에도 이어받기 가능"""
+
+    def __init__(self, path: str = "mcp_events.db", max_bytes: int = 256 * 1024 * 1024,
+                 max_age_seconds: float = 24 * 3600, prune_every: int = 256):
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.prune_every = prune_every
+        self._writes = 0
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT, stream_id TEXT NOT NULL,"
+            " stored_at REAL NOT NULL, size INTEGER NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS events_stream ON events (stream_id, seq)")
+
+    async def store_event(self, stream_id: StreamId, message: JSONRPCMessage) -> EventId:
+        stream_id = response_stream_id(stream_id, message, self.has_stream)
+        seq = self.append(stream_id, encode_message(message))
+        return make_event_id(seq, stream_id)
+
+    def has_stream(self, stream_id: StreamId) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM events WHERE stream_id = ? LIMIT 1", (stream_id,)
+        ).fetchone() is not None
+
+    def append(self, stream_id: StreamId, payload: str) -> int:
+        cursor = self._conn.execute(
+            "INSERT INTO events (stream_id, stored_at, size, payload) VALUES (?, ?, ?, ?)",
+            (stream_id, time.time(), len(payload), payload),
+        )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+        return cursor.lastrowid
+
+    def prune(self) -> None:
+        """나이(age) / 전체 바이트 기준 정리"""
+        self._conn.execute("DELETE FROM events WHERE stored_at < ?", (time.time() - self.max_age_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM events").fetchone()[0]
+        if total > self.max_bytes:
+            # 오래된 것부터 초과분만큼 제거
+            cutoff = self._conn.execute(
+                "SELECT seq FROM (SELECT seq, SUM(size) OVER (ORDER BY seq) AS running FROM events)"
+                " WHERE running >= ? ORDER BY seq LIMIT 1",
+                (total - self.max_bytes,),
+            ).fetchone()
+            if cutoff:
+                self._conn.execute("DELETE FROM events WHERE seq <= ?", (cutoff[0],))
+
+    def events_after(self, seq: int, stream_id: StreamId) -> list[tuple[int, str]] | None:
+        exists = self._conn.execute(
+            "SELECT 1 FROM events WHERE seq = ? AND stream_id = ?", (seq, stream_id)
+        ).fetchone()
+        if not exists:
+            return None
+        return self._conn.execute(
+            "SELECT seq, payload FROM events WHERE stream_id = ? AND seq > ? ORDER BY seq",
+            (stream_id, seq),
+        ).fetchall()
+
+    async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> StreamId | None:
+        parsed = parse_event_id(last_event_id)
+        if parsed is None:
+            return None
+        seq, stream_id = parsed
+        rows = self.events_after(seq, stream_id)
+        if rows is None:
+            return None
+        for row_seq, payload in rows:
+            await send_callback(EventMessage(
+                JSONRPCMessage.model_validate_json(payload),
+                make_event_id(row_seq, stream_id),
+            ))
+        return stream_id
+
+    def close(self) -> None:
+        self._conn.close()
+
+#---------------------------------------------
+class TieredEventStore(EventStore):
+    """메모리 ring buffer (hot) + SQLite (cold)
+
+    이벤트는 두 곳에 모두 기록되고, 재전송은 먼저 메모리에서 찾은 뒤
+    메모리에서 이미 밀려난 경우 SQLite 에서 찾는다. 순번(seq)은 SQLite 가 발급한다.
+    """
+
+    def __init__(self, hot: RingBufferEventStore, cold: SqliteEventStore):
+        self.hot = hot
+        self.cold = cold
+
+    async def store_event(self, stream_id: StreamId, message: JSONRPCMessage) -> EventId:
+        stream_id = response_stream_id(stream_id, message, self.has_stream)
+        payload = encode_message(message)
+        seq = self.cold.append(stream_id, payload)
+        return self.hot.append(stream_id, payload, seq=seq)
+
+    def has_stream(self, stream_id: StreamId) -> bool:
+        return self.hot.has_stream(stream_id) or self.cold.has_stream(stream_id)
+
+    async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> StreamId | None:
+        parsed = parse_event_id(last_event_id)
+        if parsed is None:
+            return None
+        if self.hot.events_after(*parsed) is not None:
+            return await self.hot.replay_events_after(last_event_id, send_callback)
+        return await self.cold.replay_events_after(last_event_id, send_callback)
+
+#---------------------------------------------
+class SessionScopedEventStore(EventStore):
+    """세션 하나에 묶인 event store 보기(view)
+
+    stream id 를 "<session_id>:<stream_id>" 로 저장하므로 세션끼리 이벤트가 섞이지 않고,
+    다른 세션의 Last-Event-ID 로는 재전송되지 않는다.
+    """
+
+    def __init__(self, store: EventStore, session_id: str):
+        self.store = store
+        self.prefix = f"{session_id}:"
+
+    async def store_event(self, stream_id: StreamId, message: JSONRPCMessage) -> EventId:
+        stream_id = response_stream_id(stream_id, message, self.store.has_stream, self.prefix)
+        return await self.store.store_event(self.prefix + stream_id, message)
+
+    async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> StreamId | None:
+        parsed = parse_event_id(last_event_id)
+        if parsed is None or not parsed[1].startswith(self.prefix):
+            return None
+        stream_id = await self.store.replay_events_after(last_event_id, send_callback)
+        return stream_id[len(self.prefix):] if stream_id else None
+
+def _unsupported_sdk(detail: str) -> RuntimeError:
+    try:
+        installed = version("mcp")
+    except PackageNotFoundError:
+        installed = "unknown"
+    return RuntimeError(
+        f"scope_event_store_per_session() is pinned to mcp 1.11 internals ({detail}); installed mcp {installed}"
+    )
+
+def scope_event_store_per_session(session_manager) -> None:
+    """StreamableHTTPSessionManager 가 세션(transport)을 만들 때마다 SessionScopedEventStore 를 붙인다
+
+    mcp 1.11 전용 - 세션 manager 의 private dict `_server_instances` 를 바꿔 끼우므로,
+    그 속성이 없거나 dict 가 아니면 RuntimeError (서버 시작 시 확인)
+    """
+    store = session_manager.event_store
+    if store is None:
+        return
+    if not isinstance(getattr(session_manager, "_server_instances", None), dict):
+        raise _unsupported_sdk("StreamableHTTPSessionManager._server_instances is missing or not a dict")
+
+    class _ServerInstances(dict):
+        def __setitem__(self, session_id, transport):
+            if not hasattr(transport, "_event_store"):
+                raise _unsupported_sdk("StreamableHTTPServerTransport._event_store is missing")
+            transport._event_store = SessionScopedEventStore(store, session_id)
+            super().__setitem__(session_id, transport)
+
+    session_manager._server_instances = _ServerInstances(session_manager._server_instances)
@@ -0,0 +1,234 @@
+#
+# 청크 단위 파일 처리 파이프라인 (process_file 도구용)
+#---------------------------------
+# -- 파일을 고정 크기 청크로 읽어 generator 단계들을 차례로 통과시킵니다.
+#      read_chunks -> hash_stage(sha256) -> count_lines_stage -> progress_stage -> transform(선택) -> 출력 파일
+#    파일 전체를 메모리에 올리지 않으므로 10 GB 파일도 청크 몇 개 분량의 메모리로 처리됩니다.
+# -- 파일 하나의 파이프라인은 process pool 의 worker 에서 실행되고 (CPU 작업이 이벤트 루프를 막지 않음),
+#    여러 파일은 worker 들에서 병렬로 처리됩니다.
+# -- worker 는 `report_every` 바이트마다 진행 상황을 queue 로 보내고, 서버 쪽에서는 ProgressThrottle 로
+#    알림 빈도를 제한합니다 (최소 간격 + 최소 진행률 변화, 마지막 100% 는 항상 전송).
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024          # 1 MiB
+REPORT_EVERY = 16 * 1024 * 1024   # worker -> 서버 진행 보고 단위 (bytes)
+
+#---------------------------------
+# pipeline stages (worker 프로세스에서 실행)
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+def hash_stage(chunks, hasher):
+    for chunk in chunks:
+        hasher.update(chunk)
+        yield chunk
+
+def count_lines_stage(chunks, stats):
+    """줄 수 세기 (마지막 줄에 개행이 없어도 한 줄로 셈)"""
+    last = b""
+    for chunk in chunks:
+        stats["lines"] += chunk.count(b"\n")
+        last = chunk
+        yield chunk
+    if last and not last.endswith(b"\n"):
+        stats["lines"] += 1
+
+def progress_stage(chunks, stats, report):
+    """입력 바이트 수를 세고 `report(bytes)` 를 청크마다 호출"""
+    for chunk in chunks:
+        stats["bytes"] += len(chunk)
+        report(stats["bytes"])
+        yield chunk
+
+def upper_stage(chunks):
+    for chunk in chunks:
+        yield chunk.upper()
+
+def lower_stage(chunks):
+    for chunk in chunks:
+        yield chunk.lower()
+
+def gzip_stage(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
+
+# transform 이름 -> (stage, 출력 파일 확장자)
+TRANSFORMS = {
+    "upper": (upper_stage, ".upper"),
+    "lower": (lower_stage, ".lower"),
+    "gzip": (gzip_stage, ".gz"),
+}
+
+def process_path(index, path, chunk_size, transform, output_dir, progress_queue, report_every=REPORT_EVERY):
+    """파일 하나를 파이프라인으로 처리 (process pool worker 에서 실행)"""
+    started = time.perf_counter()
+    hasher = hashlib.sha256()
+    stats = {"lines": 0, "bytes": 0}
+    reported = 0
+
+    def report(processed):
+        nonlocal reported
+        if processed - reported >= report_every:
+            progress_queue.put((index, processed))
+            reported = processed
+
+    chunks = read_chunks(path, chunk_size)
+    chunks = hash_stage(chunks, hasher)
+    chunks = count_lines_stage(chunks, stats)
+    chunks = progress_stage(chunks, stats, report)
+    output_path = None
+    if transform:
+        stage, suffix = TRANSFORMS[transform]
+        output_path = Path(output_dir) / (Path(path).name + suffix)
+        with open(output_path, "wb") as out:
+            for data in stage(chunks):
+                out.write(data)
+    else:
+        for _ in chunks:
+            pass
+
+    progress_queue.put((index, stats["bytes"]))
+    return {
+        "path": str(path),
+        "bytes": stats["bytes"],
+        "lines": stats["lines"],
+        "sha256": hasher.hexdigest(),
+        "output": str(output_path) if output_path else None,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+#---------------------------------
+# server side (이벤트 루프)
+class ProgressThrottle:
+    """진행 알림 빈도 제한
+
+    - 직전 전송 후 `min_interval` 초가 지났고 진행률이 `min_delta` 이상 변했을 때만 전송
+    - 완료(100%) 는 항상 전송
+    """
+
+    def __init__(self, min_interval: float = 0.5, min_delta: float = 0.01):
+        self.min_interval = min_interval
+        self.min_delta = min_delta
+        self._last_time = 0.0
+        self._last_fraction = None
+        self.sent = 0
+        self.suppressed = 0
+
+    def should_send(self, done: int, total: int) -> bool:
+        fraction = done / total if total else 1.0
+        now = time.monotonic()
+        if fraction >= 1.0 and self._last_fraction != 1.0:
+            send = True
+        elif self._last_fraction is None:
+            send = True
+        else:
+            send = (now - self._last_time >= self.min_interval
+                    and fraction - self._last_fraction >= self.min_delta)
+        if send:
+            self._last_time = now
+            self._last_fraction = fraction
+            self.sent += 1
+        else:
+            self.suppressed += 1
+        return send
+
+_pool = None
+_manager = None
+
+def get_process_pool():
+    """파이프라인 worker 용 process pool (최초 호출 시 생성, 서버 전체에서 공유)"""
+    global _pool, _manager
+    if _pool is None:
+        # uvicorn 스레드가 떠 있는 프로세스에서 fork 하지 않도록 spawn 사용
+        context = multiprocessing.get_context("spawn")
+        workers = int(os.environ.get("FILE_PIPELINE_WORKERS", os.cpu_count() or 2))
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        _manager = context.Manager()
+    return _pool, _manager
+
+def shutdown_process_pool():
+    global _pool, _manager
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _manager.shutdown()
+        _pool = _manager = None
+
+def resolve_path(base_dir, name) -> Path:
+    """`base_dir` 아래의 파일만 허용 (`../` 등으로 벗어나면 ValueError)"""
+    base = Path(base_dir).resolve()
+    path = (base / name).resolve()
+    if not path.is_relative_to(base):
+        raise ValueError(f"path outside of {base}: {name}")
+    if not path.is_file():
+        raise ValueError(f"not a file: {name}")
+    return path
+
+async def run_pipeline(paths, on_progress, on_result, chunk_size=CHUNK_SIZE, transform=None,
+                       output_dir=None, throttle=None):
+    """파일들을 process pool 에서 병렬 처리
+
+    - `on_progress(done_bytes, total_bytes)`: throttle 을 통과한 진행 상황만 호출
+    - `on_result(result)`: 파일 하나가 끝날 때마다 부분 결과로 호출 (완료 순서)
+    """
+    if transform is not None and transform not in TRANSFORMS:
+        raise ValueError(f"unknown transform: {transform} (choose from {', '.join(TRANSFORMS)})")
+    throttle = throttle or ProgressThrottle()
+    pool, manager = get_process_pool()
+    progress_queue = manager.Queue()
+    loop = asyncio.get_running_loop()
+    total = sum(os.path.getsize(p) for p in paths)
+    done = [0] * len(paths)
+
+    futures = {
+        asyncio.ensure_future(loop.run_in_executor(
+            pool, process_path, index, str(path), chunk_size, transform,
+            str(output_dir or Path(path).parent), progress_queue,
+        )): index
+        for index, path in enumerate(paths)
+    }
+
+    def drain():
+        changed = False
+        while True:
+            try:
+                index, processed = progress_queue.get_nowait()
+            except queue.Empty:
+                return changed
+            done[index] = processed
+            changed = True
+
+    results = [None] * len(paths)
+    pending = set(futures)
+    try:
+        while pending:
+            finished, pending = await asyncio.wait(pending, timeout=0.1)
+            # queue proxy 호출은 manager 프로세스와의 IPC 이므로 스레드에서 처리
+            changed = await asyncio.to_thread(drain)
+            for future in finished:
+                result = future.result()
+                results[futures[future]] = result
+                done[futures[future]] = result["bytes"]
+                await on_result(result)
+                changed = True
+            if changed and sum(done) < total and throttle.should_send(sum(done), total):
+                await on_progress(sum(done), total)
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+    if throttle.should_send(total, total):
+        await on_progress(total, total)
+    return results
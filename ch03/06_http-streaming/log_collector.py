@@ -0,0 +1,149 @@
+#
+# 크기가 고정된 MCP 로그 수집기 (logging_callback 용)
+#---------------------------------
+# -- 서버가 보내는 `notifications/message` 를 리스트에 계속 append 하면, monitor_system 처럼
+#    로그를 많이 보내는 도구에 오래 붙어 있는 클라이언트는 메모리가 끝없이 늘어납니다.
+# -- RingBufferLogCollector
+#    - 최근 `capacity` 개만 보관하는 ring buffer (collections.deque(maxlen=...))
+#    - 레벨별 카운터는 버려진 메시지까지 포함해 모두 집계
+#    - debug 메시지는 `debug_sample_every` 개 중 1개만 보관 (카운터는 전부 셈)
+#    - `async for entry in collector` 로 새 로그를 받아 볼 수 있음 (구독자별 bounded queue,
+#      느린 구독자는 가장 오래된 항목부터 버림)
+# -- `python log_collector.py` 로 24시간 분량을 빠르게 흘려 넣는 soak test 를 실행할 수 있습니다.
+import asyncio
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from mcp import types
+
+@dataclass(slots=True)
+class LogEntry:
+    seq: int
+    received_at: float
+    level: str
+    logger: str | None
+    data: Any
+
+_CLOSED = object()
+
+class RingBufferLogCollector:
+    """최근 로그만 보관하는 logging_callback"""
+
+    def __init__(self, capacity: int = 1000, debug_sample_every: int = 1, max_data_chars: int = 4096,
+                 subscriber_queue_size: int = 256, echo: Callable[[LogEntry], None] | None = None):
+        self.capacity = capacity
+        self.debug_sample_every = max(debug_sample_every, 1)
+        self.max_data_chars = max_data_chars
+        self.subscriber_queue_size = subscriber_queue_size
+        self.echo = echo
+        self._entries: deque[LogEntry] = deque(maxlen=capacity)
+        self._subscribers: set[asyncio.Queue] = set()
+        self.level_counts: Counter = Counter()
+        self.received = 0
+        self.evicted = 0           # ring buffer 가 가득 차서 밀려난 수
+        self.sampled_out = 0       # debug sampling 으로 보관하지 않은 수
+        self.subscriber_dropped = 0
+
+    async def __call__(self, params: types.LoggingMessageNotificationParams) -> None:
+        self.received += 1
+        self.level_counts[params.level] += 1
+        if params.level == "debug" and (self.level_counts["debug"] - 1) % self.debug_sample_every:
+            self.sampled_out += 1
+            return
+
+        data = params.data
+        if isinstance(data, str) and len(data) > self.max_data_chars:
+            data = data[:self.max_data_chars] + "...(truncated)"
+        entry = LogEntry(self.received, time.time(), params.level, params.logger, data)
+        if len(self._entries) == self.capacity:
+            self.evicted += 1
+        self._entries.append(entry)
+
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.subscriber_dropped += 1
+            queue.put_nowait(entry)
+        if self.echo is not None:
+            self.echo(entry)
+
+    @property
+    def logs(self) -> list[LogEntry]:
+        """보관 중인 로그 (오래된 것부터)"""
+        return list(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "retained": len(self._entries),
+            "capacity": self.capacity,
+            "evicted": self.evicted,
+            "sampled_out": self.sampled_out,
+            "subscribers": len(self._subscribers),
+            "subscriber_dropped": self.subscriber_dropped,
+            "levels": dict(self.level_counts),
+        }
+
+    async def subscribe(self):
+        """새로 들어오는 로그를 차례로 돌려주는 async iterator (close() 하면 끝남)"""
+        queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self._subscribers.add(queue)
+        try:
+            while (entry := await queue.get()) is not _CLOSED:
+                yield entry
+        finally:
+            self._subscribers.discard(queue)
+
+    def __aiter__(self):
+        return self.subscribe()
+
+    def close(self):
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(_CLOSED)
+
+#---------------------------------
+# soak test: monitor_system 수준(초당 10개, 그중 절반 debug)으로 24시간 동안 들어올 로그를 빠르게 흘려 넣고
+#            tracemalloc 으로 수집기 메모리가 일정한지 확인
+async def soak(hours: float = 24.0, per_second: int = 10, capacity: int = 1000, debug_sample_every: int = 10):
+    import tracemalloc
+
+    collector = RingBufferLogCollector(capacity=capacity, debug_sample_every=debug_sample_every)
+    received = []
+
+    async def consumer():
+        async for entry in collector:
+            received.append(entry.seq)
+            if len(received) > 1000:
+                received.clear()
+
+    task = asyncio.create_task(consumer())
+    total = int(hours * 3600 * per_second)
+    levels = ["debug", "info", "debug", "warning", "debug", "info", "debug", "error", "debug", "info"]
+    tracemalloc.start()
+    baseline = None
+    checkpoints = 12
+    for i in range(1, total + 1):
+        await collector(types.LoggingMessageNotificationParams(
+            level=levels[i % len(levels)], logger="monitor", data=f"cpu={i % 100}% mem={(i * 7) % 100}% tick={i}",
+        ))
+        if i % 1000 == 0:
+            await asyncio.sleep(0)   # consumer 에게 양보
+        if i % (total // checkpoints) == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            baseline = baseline or current
+            print(f"  simulated {i / per_second / 3600:5.1f}h  messages={i:>9}  "
+                  f"traced={current / 1024:8.1f} KiB  ({(current - baseline) / 1024:+.1f} KiB)")
+    collector.close()
+    await task
+    tracemalloc.stop()
+    print(collector.stats())
+
+if __name__ == "__main__":
+    asyncio.run(soak())
+
+#--실행 방법
+# > uv run python log_collector.py
@@ -1,16 +1,37 @@
 #
 # HTTP Streaming 서버 구현
 #
-from fastapi import FastAPI
-from fastapi.responses import StreamingResponse, HTMLResponse
+from fastapi import FastAPI, Query
+from fastapi.responses import HTMLResponse
 from mcp.server.fastmcp import FastMCP, Context
 from mcp.types import TextContent
 import asyncio
 import uvicorn
 import os
+from pathlib import Path
+from event_store import RingBufferEventStore, SqliteEventStore, TieredEventStore, scope_event_store_per_session
+from file_pipeline import CHUNK_SIZE, resolve_path, run_pipeline
+from sse_stream import SseResponse, stream_stats
+
+# Event store for resumable streams (MCP_EVENT_STORE=memory|sqlite|none)
+# -- 연결이 끊긴 클라이언트는 `Last-Event-ID` 헤더로 다시 접속해 놓친 진행 알림을 받을 수 있습니다.
+#    memory: 스트림별 ring buffer, sqlite: ring buffer + SQLite(mcp_events.db) 2단 저장
+def create_event_store(kind: str):
+    if kind == "none":
+        return None
+    hot = RingBufferEventStore(
+        max_events_per_stream=1000,
+        max_bytes=16 * 1024 * 1024,
+        max_age_seconds=600,
+    )
+    if kind == "sqlite":
+        return TieredEventStore(hot, SqliteEventStore("mcp_events.db", max_age_seconds=24 * 3600))
+    return hot
+
+event_store = create_event_store(os.environ.get("MCP_EVENT_STORE", "memory"))
 
 # Create an MCP Server
-mcp = FastMCP(name="http-streaming-server")
+mcp = FastMCP(name="http-streaming-server", event_store=event_store)
 
 app = FastAPI()
 
@@ -21,32 +42,103 @@ async def root():
         html_content = f.read()
     return HTMLResponse(content=html_content)
 
-async def event_stream(message: str):
-    for i in range(1, 4):
-        yield f"Processing file {i}/3...\n"
-        await asyncio.sleep(1)
-    yield f"Here's the file content: {message}\n"
+async def event_stream(message: str, count: int = 3, interval: float = 1.0, size: int = 0):
+    # size > 0 이면 이벤트마다 size 바이트 payload 를 붙임 (부하 테스트용)
+    payload = " " + "x" * size if size else ""
+    for i in range(1, count + 1):
+        yield f"Processing file {i}/{count}...{payload}"
+        await asyncio.sleep(interval)
+    yield f"Here's the file content: {message}"
 
 @app.get("/stream")
-async def stream(message: str = "hello"):
-    return StreamingResponse(event_stream(message), media_type="text/event-stream")
-
-@mcp.tool(description="A tool that simulates file processing and sends progress notifications")
-async def process_file(message: str, ctx: Context) -> TextContent:
-    files = [f"file_{i}.txt" for i in range(1, 4)]
-    for idx, file in enumerate(files):
-        await ctx.info(f"Processing {file} ({idx}/{len(files)})...")
-        await asyncio.sleep(1)
+async def stream(message: str = "hello",
+                 count: int = Query(3, ge=1, le=100_000),
+                 interval: float = Query(1.0, ge=0, le=60),
+                 size: int = Query(0, ge=0, le=64 * 1024)):
+    # bounded buffer + heartbeat + 느린 클라이언트 차단 (sse_stream.py)
+    return SseResponse(event_stream(message, count, interval, size))
+
+@app.get("/stream-stats")
+async def get_stream_stats():
+    return stream_stats
+
+# process_file 이 읽을 수 있는 디렉터리 (이 밖의 경로는 거부)와 transform 결과를 쓰는 디렉터리
+FILES_DIR = Path(os.environ.get("MCP_FILES_DIR", Path(__file__).parent))
+OUTPUT_DIR = Path(os.environ.get("MCP_OUTPUT_DIR", Path(__file__).parent / "output"))
+DEFAULT_FILES = ["README.md", "06_how-to-work.md", "welcome.html"]
+
+@mcp.tool(description="Process files in chunks (sha256, line count, optional transform: upper|lower|gzip) "
+                      "and send progress notifications")
+async def process_file(message: str, ctx: Context, paths: list[str] | None = None,
+                       transform: str | None = None, chunk_size: int = CHUNK_SIZE) -> TextContent:
+    files = [resolve_path(FILES_DIR, name) for name in (paths or DEFAULT_FILES)]
+    if transform:
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    async def on_progress(done, total):
+        percent = done * 100 // total if total else 100
+        await ctx.report_progress(done, total)
+        await ctx.info(f"Processing {len(files)} files: {percent}% ({done}/{total} bytes)")
+
+    async def on_result(result):
+        # 파일 하나가 끝날 때마다 부분 결과를 먼저 흘려보냄
+        await ctx.info(f"Processed {Path(result['path']).name}: {result['bytes']} bytes, "
+                       f"{result['lines']} lines, sha256={result['sha256'][:16]}...")
+
+    results = await run_pipeline(files, on_progress, on_result, chunk_size=max(chunk_size, 4096),
+                                 transform=transform, output_dir=OUTPUT_DIR)
     await ctx.info(f"All files processed")
-    return TextContent(type="text", text=f"Processed files: {', '.join(files)} | Messages: {message}")
+    summary = "; ".join(
+        f"{Path(r['path']).name} ({r['bytes']} bytes, {r['lines']} lines, sha256={r['sha256']})"
+        + (f" -> {Path(r['output']).name}" if r["output"] else "")
+        for r in results
+    )
+    return TextContent(type="text", text=f"Processed files: {summary} | Messages: {message}")
+
+class NoSlashRedirect:
+    """`/mcp` 요청을 내부에서 `/mcp/` 로 바꿔 전달하는 ASGI wrapper
+
+    FastMCP 는 `/mcp` 를 Mount 로 붙이기 때문에 `/mcp` 요청마다
+    307 redirect -> `/mcp/` 재요청이 한 번씩 더 생깁니다 (요청 수 2배).
+    """
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path.rstrip("/")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == self.path:
+            scope = dict(scope, path=self.path + "/", raw_path=(self.path + "/").encode())
+        await self.app(scope, receive, send)
+
+def create_mcp_app():
+    """streamable-http ASGI 앱 (`/mcp`, `/mcp/` 모두 redirect 없이 처리)"""
+    starlette_app = mcp.streamable_http_app()
+    if not mcp.settings.stateless_http:
+        # every session gets its own view of the event store (stateless 모드는 event store 를 쓰지 않음)
+        scope_event_store_per_session(mcp.session_manager)
+    return NoSlashRedirect(starlette_app, mcp.settings.streamable_http_path)
 
 if __name__ == "__main__":
     import sys
     if "mcp" in sys.argv:
         # Configure MCP server with streamable-http transport
-        print("Starting MCP Server wiht streamable-http transport...")
-        # MCP server will create its own FastAPI app with the /mcp endpoint
-        mcp.run(transport="streamable-http")
+        if "--stateless" in sys.argv:
+            # stateless 모드: 세션 ID / GET 스트림 / DELETE 없이 요청마다 새 transport 로 처리하고
+            # SSE 대신 일반 JSON 으로 응답합니다 (서버 -> 클라이언트 알림은 전달되지 않음).
+            # 세션 상태가 없으므로 여러 인스턴스를 load balancer 뒤에 그대로 둘 수 있습니다.
+            # (FASTMCP_STATELESS_HTTP=true FASTMCP_JSON_RESPONSE=true 환경 변수와 같음)
+            mcp.settings.stateless_http = True
+            mcp.settings.json_response = True
+        mode = "stateless" if mcp.settings.stateless_http else "stateful"
+        print(f"Starting MCP Server wiht streamable-http transport ({mode})...")
+        # MCP server will create its own Starlette app with the /mcp endpoint
+        uvicorn.run(
+            create_mcp_app(),
+            host=mcp.settings.host,
+            port=mcp.settings.port,
+            log_level=mcp.settings.log_level.lower(),
+        )
     else:
         # Start FastAPI app for classic HTTP Streaming
         print("Starting FastAPI server for classic HTTP Streaming...")
@@ -57,6 +149,15 @@ if __name__ == "__main__":
 # > uv run mcp dev server.py mcp
 # 2. Classic HTTP streaming server mode
 # > uv run server.py
+#    (SSE 형식 + bounded buffer + heartbeat, 느린 클라이언트는 끊음. 통계: GET /stream-stats)
+#    > curl -N "http://localhost:8000/stream?message=hi&count=5&interval=0.5"
+# 3. MCP server mode + SQLite event store (끊긴 스트림을 Last-Event-ID 로 이어받기)
+# > MCP_EVENT_STORE=sqlite uv run server.py mcp
+# 4. MCP server mode + stateless JSON 응답 (세션 없음, 수평 확장용)
+# > uv run server.py mcp --stateless
+# 5. process_file 로 실제 파일 처리 (MCP_FILES_DIR 아래 파일만 허용, transform 결과는 MCP_OUTPUT_DIR 에 저장)
+# > MCP_FILES_DIR=/data MCP_OUTPUT_DIR=/data/out uv run server.py mcp
+#   call_tool("process_file", {"message": "hi", "paths": ["big.log"], "transform": "gzip"})
 
 #-- 출력 결과
 #---------------------------------------------
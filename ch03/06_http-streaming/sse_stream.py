@@ -0,0 +1,156 @@
+#
+# backpressure 를 고려한 SSE 응답 (classic /stream 엔드포인트용)
+#---------------------------------
+# -- 이벤트를 만드는 producer 와 클라이언트로 보내는 consumer 를 bounded buffer 로 분리합니다.
+#    - buffer 는 이벤트 개수(max_events)와 바이트(high_water_bytes) 두 가지로 제한됩니다.
+#      클라이언트가 느려 buffer 가 high-water mark 에 닿으면 producer 는 그 자리에서 기다립니다.
+#    - uvicorn 은 socket 쓰기 버퍼가 차면 send() 를 기다리게 합니다. send() 가
+#      `slow_client_timeout` 초 넘게 끝나지 않으면 느린 클라이언트로 보고 연결을 끊습니다.
+#      (연결 하나가 서버 메모리와 producer 를 무한정 붙잡지 못하게 함)
+#    - 보낼 이벤트가 `heartbeat_interval` 초 동안 없으면 `: heartbeat` 주석을 보내
+#      프록시/로드밸런서가 유휴 연결을 끊지 않게 합니다.
+# -- 이벤트는 SSE 형식(`id:` / `data:` + 빈 줄)으로 보내므로 클라이언트가 이벤트 경계를 알 수 있습니다.
+# -- 연결당 메모리는 high_water_bytes + transport 쓰기 버퍼(기본 64 KiB) 정도로 묶입니다.
+import asyncio
+import logging
+from collections import deque
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# 서버 전체 통계 (`/stream-stats`)
+stream_stats = {
+    "active": 0,
+    "completed": 0,
+    "slow_disconnects": 0,
+    "client_disconnects": 0,
+    "events_sent": 0,
+    "heartbeats_sent": 0,
+    "buffered_bytes": 0,
+}
+
+HEARTBEAT = b": heartbeat\n\n"
+
+def format_sse(data: str, event_id=None, event=None) -> bytes:
+    """SSE 프레임 만들기 (여러 줄 data 는 줄마다 `data:` 를 붙임)"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    for line in str(data).splitlines() or [""]:
+        lines.append(f"data: {line}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+class EventBuffer:
+    """producer -> consumer 사이의 bounded buffer (이벤트 수 + 바이트 제한)"""
+
+    def __init__(self, max_events: int, high_water_bytes: int):
+        self.max_events = max_events
+        self.high_water_bytes = high_water_bytes
+        self._frames = deque()
+        self._bytes = 0
+        self._closed = False
+        self._cond = asyncio.Condition()
+
+    def _has_room(self, size: int) -> bool:
+        # 빈 buffer 에는 high-water mark 보다 큰 이벤트도 하나는 들어갈 수 있어야 함
+        if not self._frames:
+            return True
+        return len(self._frames) < self.max_events and self._bytes + size <= self.high_water_bytes
+
+    async def put(self, frame: bytes):
+        """자리가 날 때까지 기다렸다가 추가 (backpressure)"""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._has_room(len(frame)))
+            self._frames.append(frame)
+            self._bytes += len(frame)
+            stream_stats["buffered_bytes"] += len(frame)
+            self._cond.notify_all()
+
+    async def close(self):
+        async with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    async def get(self, timeout: float):
+        """다음 프레임 / timeout 동안 없으면 HEARTBEAT / 닫혔으면 None"""
+        async with self._cond:
+            try:
+                await asyncio.wait_for(self._cond.wait_for(lambda: self._frames or self._closed), timeout)
+            except asyncio.TimeoutError:
+                return HEARTBEAT
+            if not self._frames:
+                return None
+            frame = self._frames.popleft()
+            self._bytes -= len(frame)
+            stream_stats["buffered_bytes"] -= len(frame)
+            self._cond.notify_all()
+            return frame
+
+    def clear(self):
+        stream_stats["buffered_bytes"] -= self._bytes
+        self._frames.clear()
+        self._bytes = 0
+
+class SseResponse(StreamingResponse):
+    """문자열 async iterator(`source`) 를 backpressure / heartbeat / 느린 클라이언트 차단과 함께 SSE 로 전송"""
+
+    def __init__(self, source, max_events: int = 64, high_water_bytes: int = 64 * 1024,
+                 heartbeat_interval: float = 15.0, slow_client_timeout: float = 10.0, headers=None):
+        super().__init__(
+            source,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **(headers or {})},
+        )
+        self.buffer = EventBuffer(max_events, high_water_bytes)
+        self.heartbeat_interval = heartbeat_interval
+        self.slow_client_timeout = slow_client_timeout
+        self._error = None
+
+    async def _produce(self):
+        try:
+            event_id = 0
+            async for data in self.body_iterator:
+                event_id += 1
+                await self.buffer.put(format_sse(data, event_id))
+        except Exception as e:
+            self._error = e
+        finally:
+            await self.buffer.close()
+
+    async def stream_response(self, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        stream_stats["active"] += 1
+        producer = asyncio.create_task(self._produce())
+        completed = False
+        try:
+            while (frame := await self.buffer.get(self.heartbeat_interval)) is not None:
+                try:
+                    await asyncio.wait_for(
+                        send({"type": "http.response.body", "body": frame, "more_body": True}),
+                        self.slow_client_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    # 응답을 끝내지 않고 돌아가면 uvicorn 이 연결을 닫음
+                    stream_stats["slow_disconnects"] += 1
+                    logger.warning("closing slow SSE client (send blocked > %ss)", self.slow_client_timeout)
+                    completed = True
+                    return
+                if frame is HEARTBEAT:
+                    stream_stats["heartbeats_sent"] += 1
+                else:
+                    stream_stats["events_sent"] += 1
+            if self._error is not None:
+                raise self._error
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            stream_stats["completed"] += 1
+            completed = True
+        finally:
+            if not completed and self._error is None:
+                # 클라이언트가 먼저 끊으면 StreamingResponse 가 이 task 를 취소함
+                stream_stats["client_disconnects"] += 1
+            stream_stats["active"] -= 1
+            producer.cancel()
+            self.buffer.clear()
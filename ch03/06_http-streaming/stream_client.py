@@ -0,0 +1,163 @@
+#
+# 비동기 SSE 스트리밍 클라이언트 (classic /stream 여러 개 동시 구독)
+#---------------------------------
+# -- httpx.AsyncClient 하나의 connection pool 로 수백 개의 `/stream` 구독을 동시에 처리합니다.
+#    HTTP/1.1 keep-alive 연결을 재사용하고, `h2` 패키지가 설치되어 있으면 HTTP/2 도 쓸 수 있습니다
+#    (uvicorn 은 HTTP/1.1 만 지원하므로 HTTP/2 는 hypercorn 등 앞단 서버가 있을 때만 의미가 있음).
+# -- SseParser 는 받은 바이트를 bytearray 에 모아 이벤트 경계(빈 줄)만 찾고,
+#    이벤트 하나가 완성되면 `data:` 필드만 한 번 decode 합니다 (줄마다 str 로 바꾸지 않음).
+# -- 스트림별로 연결 시간, 첫 이벤트까지 시간(TTFE), 이벤트 간격, 처리량(events/s, bytes/s)을 기록합니다.
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+@dataclass
+class SseEvent:
+    id: str | None
+    event: str | None
+    data: str
+
+class SseParser:
+    """청크 단위로 들어오는 바이트에서 SSE 이벤트를 꺼내는 incremental parser"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.last_event_id = None
+
+    def feed(self, chunk: bytes) -> list[SseEvent]:
+        buffer = self._buffer
+        buffer += chunk
+        if b"\r" in buffer:
+            # CRLF / CR 줄바꿈도 허용 (드묾: 필요할 때만 정규화)
+            # 끝의 "\r" 은 다음 청크의 "\n" 과 짝일 수 있으므로 남겨 둠
+            keep = buffer.endswith(b"\r")
+            body = (buffer[:-1] if keep else buffer).replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+            buffer[:] = body + (b"\r" if keep else b"")
+        events = []
+        start = 0
+        while (end := buffer.find(b"\n\n", start)) != -1:
+            event = self._parse_block(buffer[start:end])
+            if event is not None:
+                events.append(event)
+            start = end + 2
+        if start:
+            del buffer[:start]
+        return events
+
+    def _parse_block(self, block) -> SseEvent | None:
+        event_id = event_type = None
+        data_parts = []
+        for line in block.split(b"\n"):
+            if not line or line[0] == 0x3A:   # ":" 로 시작하면 주석 (heartbeat)
+                continue
+            name, _, value = line.partition(b":")
+            if value[:1] == b" ":
+                value = value[1:]
+            if name == b"data":
+                data_parts.append(value)
+            elif name == b"id":
+                event_id = value.decode()
+            elif name == b"event":
+                event_type = value.decode()
+        if event_id is not None:
+            self.last_event_id = event_id
+        if not data_parts:
+            return None
+        return SseEvent(event_id, event_type, b"\n".join(data_parts).decode("utf-8"))
+
+@dataclass
+class StreamStats:
+    index: int
+    status: int | None = None
+    connect_s: float | None = None       # 요청 -> 응답 헤더
+    first_event_s: float | None = None   # 요청 -> 첫 이벤트 (TTFE)
+    duration_s: float | None = None
+    events: int = 0
+    bytes: int = 0
+    gaps_s: list[float] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def events_per_s(self):
+        return self.events / self.duration_s if self.duration_s else None
+
+    @property
+    def bytes_per_s(self):
+        return self.bytes / self.duration_s if self.duration_s else None
+
+async def subscribe(client: httpx.AsyncClient, url: str, params: dict, stats: StreamStats, on_event=None):
+    """`/stream` 하나를 끝까지 읽으며 stats 를 채움"""
+    parser = SseParser()
+    started = time.perf_counter()
+    last = None
+    try:
+        async with client.stream("GET", url, params=params, headers={"Accept": "text/event-stream"}) as response:
+            stats.status = response.status_code
+            stats.connect_s = time.perf_counter() - started
+            response.raise_for_status()
+            async for chunk in response.aiter_raw():
+                stats.bytes += len(chunk)
+                for event in parser.feed(chunk):
+                    now = time.perf_counter()
+                    if last is None:
+                        stats.first_event_s = now - started
+                    else:
+                        stats.gaps_s.append(now - last)
+                    last = now
+                    stats.events += 1
+                    if on_event is not None:
+                        on_event(stats.index, event)
+    except httpx.HTTPError as e:
+        stats.error = repr(e)
+    stats.duration_s = time.perf_counter() - started
+    return stats
+
+async def subscribe_many(url: str, streams: int, params: dict | None = None, max_connections: int | None = None,
+                         http2: bool = False, on_event=None, timeout: float = 60.0) -> list[StreamStats]:
+    """`streams` 개의 구독을 하나의 connection pool 로 동시에 실행"""
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            http2 = False
+    max_connections = max_connections or streams
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    # 스트림은 길게 열려 있으므로 read timeout 은 서버 heartbeat 간격보다 길게
+    timeouts = httpx.Timeout(timeout, connect=10.0, pool=None)
+    async with httpx.AsyncClient(limits=limits, timeout=timeouts, http2=http2) as client:
+        return await asyncio.gather(*(
+            subscribe(client, url, params or {}, StreamStats(index), on_event)
+            for index in range(streams)
+        ))
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+def summarize_streams(results: list[StreamStats]) -> dict:
+    ok = [r for r in results if r.error is None and r.status == 200]
+    ms = lambda v: round(v * 1000, 2) if v is not None else None
+
+    def dist(values):
+        return {"p50_ms": ms(percentile(values, 50)), "p99_ms": ms(percentile(values, 99)),
+                "max_ms": ms(max(values)) if values else None}
+
+    gaps = [g for r in ok for g in r.gaps_s]
+    return {
+        "streams": len(results),
+        "ok": len(ok),
+        "errors": len(results) - len(ok),
+        "error_samples": [r.error for r in results if r.error][:5],
+        "connect": dist([r.connect_s for r in ok if r.connect_s is not None]),
+        "first_event": dist([r.first_event_s for r in ok if r.first_event_s is not None]),
+        "event_gap": dist(gaps),
+        "events_total": sum(r.events for r in ok),
+        "bytes_total": sum(r.bytes for r in ok),
+        "per_stream_events_per_s": round(statistics.mean(r.events_per_s for r in ok), 2) if ok else None,
+        "per_stream_bytes_per_s": round(statistics.mean(r.bytes_per_s for r in ok), 1) if ok else None,
+    }
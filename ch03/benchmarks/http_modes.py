@@ -0,0 +1,160 @@
+#
+# Streamable-HTTP stateful vs stateless 처리량 비교 (requests/s)
+#----------------------------
+# -- ch03/06_http-streaming 서버를 두 모드로 차례로 띄우고 같은 JSON-RPC 요청을 보내 초당 처리량을 비교합니다.
+#    - stateful : `server.py mcp`             (세션 ID, SSE 응답, 종료 시 DELETE)
+#    - stateless: `server.py mcp --stateless` (세션 없음, JSON 응답)
+# -- 시나리오
+#    - warm: 연결/세션을 한 번 만든 뒤 `tools/list` 를 반복 (요청 자체의 비용)
+#    - cold: 매 호출마다 새 클라이언트 (stateful 은 initialize -> initialized -> 요청 -> DELETE,
+#            stateless 는 요청 1개). 짧게 붙었다 떨어지는 클라이언트가 많은 경우의 비용
+# -- load_test.py 와 같은 결과 JSON 형식/저장 위치를 사용합니다.
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+
+import httpx
+
+from load_test import TARGETS, ServerProcess, repo_version, save_result, summarize
+
+MODES = {"stateful": "streamable-http", "stateless": "streamable-http-stateless"}
+
+HEADERS = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+PROTOCOL_VERSION = "2025-06-18"
+
+def rpc(method, params=None, request_id=None):
+    message = {"jsonrpc": "2.0", "method": method}
+    if params is not None:
+        message["params"] = params
+    if request_id is not None:
+        message["id"] = request_id
+    return message
+
+INITIALIZE = rpc("initialize", {
+    "protocolVersion": PROTOCOL_VERSION,
+    "capabilities": {},
+    "clientInfo": {"name": "http-modes-bench", "version": "0.1"},
+}, request_id=0)
+INITIALIZED = rpc("notifications/initialized")
+
+def parse_response(response):
+    """JSON 응답과 SSE 응답(`data: {...}`) 모두에서 JSON-RPC 메시지를 꺼낸다"""
+    response.raise_for_status()
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        for line in response.text.splitlines():
+            if line.startswith("data:"):
+                return json.loads(line[5:])
+        raise ValueError("empty SSE response")
+    return response.json()
+
+class Client:
+    """MCP 세션 하나 (stateless 모드에서는 세션 없이 요청만 보냄)"""
+
+    def __init__(self, http, url, stateful):
+        self.http = http
+        self.url = url
+        self.stateful = stateful
+        self.headers = dict(HEADERS)
+        self.next_id = 1
+
+    async def open(self):
+        if not self.stateful:
+            return
+        response = await self.http.post(self.url, json=INITIALIZE, headers=self.headers)
+        parse_response(response)
+        self.headers["mcp-session-id"] = response.headers["mcp-session-id"]
+        self.headers["mcp-protocol-version"] = PROTOCOL_VERSION
+        await self.http.post(self.url, json=INITIALIZED, headers=self.headers)
+
+    async def request(self, method, params=None):
+        self.next_id += 1
+        response = await self.http.post(self.url, json=rpc(method, params, self.next_id), headers=self.headers)
+        message = parse_response(response)
+        if "error" in message:
+            raise RuntimeError(message["error"])
+        return message["result"]
+
+    async def close(self):
+        if self.stateful:
+            await self.http.delete(self.url, headers=self.headers)
+
+async def worker(http, url, stateful, scenario, deadline, latencies, errors):
+    client = Client(http, url, stateful)
+    if scenario == "warm":
+        await client.open()
+    while time.perf_counter() < deadline:
+        t = time.perf_counter()
+        try:
+            if scenario == "cold":
+                client = Client(http, url, stateful)
+                await client.open()
+                await client.request("tools/list")
+                await client.close()
+            else:
+                await client.request("tools/list")
+            latencies.append(time.perf_counter() - t)
+        except Exception as e:
+            errors.append(repr(e))
+    if scenario == "warm":
+        await client.close()
+
+async def run_mode(mode, scenario, concurrency, duration, port):
+    target = TARGETS[MODES[mode]]
+    url = target["url"](port)
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with ServerProcess(target, port):
+        async with httpx.AsyncClient(timeout=30.0, limits=limits) as http:
+            started = time.perf_counter()
+            deadline = started + duration
+            await asyncio.gather(*(
+                worker(http, url, mode == "stateful", scenario, deadline, latencies, errors)
+                for _ in range(concurrency)
+            ))
+            elapsed = time.perf_counter() - started
+    return {
+        "target": f"http-{mode}-{scenario}",
+        "version": repo_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "mode": mode,
+        "scenario": scenario,
+        "clients": concurrency,
+        "duration_s": round(elapsed, 3),
+        "calls": len(latencies),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "throughput": {"calls_per_s": round(len(latencies) / elapsed, 1) if elapsed else None},
+        "latency": {"call": summarize(latencies)},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="streamable-http stateful vs stateless requests/s")
+    parser.add_argument("--mode", choices=[*MODES, "all"], default="all")
+    parser.add_argument("--scenario", choices=["warm", "cold", "all"], default="all")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--save", action="store_true", help="save result JSON under results/")
+    args = parser.parse_args()
+
+    modes = list(MODES) if args.mode == "all" else [args.mode]
+    scenarios = ["warm", "cold"] if args.scenario == "all" else [args.scenario]
+    for scenario in scenarios:
+        for mode in modes:
+            result = asyncio.run(run_mode(mode, scenario, args.concurrency, args.duration, args.port))
+            path = save_result(result) if args.save else None
+            lat = result["latency"]["call"]
+            print(f"[{scenario:<4}] {mode:<9} calls/s={result['throughput']['calls_per_s']:<8} "
+                  f"p50={lat.get('p50_ms')}ms p99={lat.get('p99_ms')}ms errors={result['errors']}"
+                  + (f" -> {path}" if path else ""))
+
+if __name__ == "__main__":
+    main()
+
+#--실행 방법 (프로젝트 루트에서)
+# > uv run python ch03/benchmarks/http_modes.py --concurrency 32 --duration 5
+# > uv run python ch03/benchmarks/http_modes.py --scenario cold --save
@@ -0,0 +1,322 @@
+#
+# SSE / Streamable-HTTP 서버 부하 테스트 (load test)
+#----------------------------
+# -- ch03/05_sse-server (SSE) 와 ch03/06_http-streaming (streamable-http) 서버를 로컬에서 띄우고,
+#    N개의 MCP 클라이언트를 동시에 실행해 initialize -> list_tools -> call_tool 순서로 요청합니다.
+# -- 측정 항목
+#    - 단계별 지연 시간 p50 / p99 / max (initialize, list_tools, call_tool, 세션 전체)
+#    - 처리량 (sessions/s, requests/s)
+#    - 세션당 서버 메모리 (모든 클라이언트가 연결된 상태의 서버 RSS 증가분 / 세션 수)
+#    - 이벤트 루프 지연: 부하 중 서버에 가벼운 probe 요청을 주기적으로 보내 응답 시간을 측정
+#      (server_probe), 부하 생성기 자신의 루프 지연도 함께 기록 (client_loop_lag)
+# -- 결과는 JSON 으로 저장되며 `compare` 로 두 결과를 비교할 수 있습니다.
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+CH03 = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# 대상 서버 정의
+TARGETS = {
+    "sse": {
+        "cwd": CH03 / "05_sse-server",
+        "command": lambda port: [sys.executable, "-m", "uvicorn", "server:app",
+                                 "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        "env": lambda port: {},
+        "url": lambda port: f"http://127.0.0.1:{port}/sse",
+        "probe": lambda port: ("GET", f"http://127.0.0.1:{port}/sse-stats"),
+        "tool": ("add", {"a": 1, "b": 2}),
+    },
+    "streamable-http": {
+        "cwd": CH03 / "06_http-streaming",
+        "command": lambda port: [sys.executable, "server.py", "mcp"],
+        "env": lambda port: {"FASTMCP_PORT": str(port), "FASTMCP_LOG_LEVEL": "WARNING"},
+        "url": lambda port: f"http://127.0.0.1:{port}/mcp",
+        # 세션 없는 POST 는 바로 400 으로 응답하므로 서버 루프 응답성 probe 로 쓸 수 있다
+        "probe": lambda port: ("POST", f"http://127.0.0.1:{port}/mcp"),
+        "tool": ("process_file", {"message": "bench"}),
+    },
+    "streamable-http-stateless": {
+        "cwd": CH03 / "06_http-streaming",
+        "command": lambda port: [sys.executable, "server.py", "mcp", "--stateless"],
+        "env": lambda port: {"FASTMCP_PORT": str(port), "FASTMCP_LOG_LEVEL": "WARNING"},
+        "url": lambda port: f"http://127.0.0.1:{port}/mcp",
+        # 본문 없는 POST 는 JSON parse error(400) 로 바로 응답
+        "probe": lambda port: ("POST", f"http://127.0.0.1:{port}/mcp"),
+        "tool": ("process_file", {"message": "bench"}),
+    },
+}
+
+#----------------------------
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lower, upper = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+def summarize(values):
+    """초 단위 값 목록 -> ms 단위 요약"""
+    if not values:
+        return {"count": 0}
+    ms = [v * 1000 for v in values]
+    return {
+        "count": len(ms),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(max(ms), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+    }
+
+def process_rss_bytes(pid):
+    """서버 프로세스 RSS (Linux: /proc, 그 외: ps)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        out = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True)
+        return int(out.stdout.strip()) * 1024
+    except (OSError, ValueError):
+        return None
+
+def repo_version():
+    try:
+        out = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=CH03,
+                             capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+#----------------------------
+class ServerProcess:
+    """벤치마크 대상 서버를 하위 프로세스로 실행"""
+
+    def __init__(self, target, port):
+        self.target = target
+        self.port = port
+        self.process = None
+
+    async def __aenter__(self):
+        env = {**os.environ, **self.target["env"](self.port)}
+        self.process = subprocess.Popen(
+            self.target["command"](self.port), cwd=self.target["cwd"], env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        method, url = self.target["probe"](self.port)
+        async with httpx.AsyncClient(timeout=1.0) as client:
+            for _ in range(100):
+                try:
+                    await client.request(method, url)
+                    return self
+                except httpx.HTTPError:
+                    await asyncio.sleep(0.1)
+        raise RuntimeError(f"server did not start: {self.target['command'](self.port)}")
+
+    async def __aexit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+#----------------------------
+async def run_client(transport, url, tool, barrier, timings, errors):
+    """시뮬레이션 MCP 클라이언트 1개: initialize -> (모두 연결될 때까지 대기) -> list_tools -> call_tool"""
+    name, arguments = tool
+    connect = sse_client(url) if transport == "sse" else streamablehttp_client(url)
+    started = time.perf_counter()
+    try:
+        async with connect as streams:
+            async with ClientSession(streams[0], streams[1]) as session:
+                t = time.perf_counter()
+                await session.initialize()
+                timings["initialize"].append(time.perf_counter() - t)
+
+                await barrier.wait()   # 모든 세션이 열린 상태에서 메모리 측정
+                await barrier.wait()
+
+                t = time.perf_counter()
+                await session.list_tools()
+                timings["list_tools"].append(time.perf_counter() - t)
+
+                t = time.perf_counter()
+                result = await session.call_tool(name, arguments)
+                timings["call_tool"].append(time.perf_counter() - t)
+                if result.isError:
+                    errors.append(f"tool error: {result.content}")
+        timings["session"].append(time.perf_counter() - started)
+    except Exception as e:
+        errors.append(repr(e))
+        barrier.abort()
+
+async def probe_loop(method, url, samples, stop, interval=0.05):
+    """부하 중 서버 응답성 측정"""
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        while not stop.is_set():
+            t = time.perf_counter()
+            try:
+                await client.request(method, url)
+                samples.append(time.perf_counter() - t)
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(interval)
+
+async def loop_lag_monitor(samples, stop, interval=0.01):
+    """부하 생성기 자신의 이벤트 루프 지연"""
+    while not stop.is_set():
+        t = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(time.perf_counter() - t - interval, 0.0))
+
+async def run_benchmark(target_name, clients, port):
+    target = TARGETS[target_name]
+    timings = {"initialize": [], "list_tools": [], "call_tool": [], "session": []}
+    errors = []
+    probe_samples, lag_samples = [], []
+
+    async with ServerProcess(target, port) as server:
+        pid = server.process.pid
+        rss_before = process_rss_bytes(pid)
+        barrier = asyncio.Barrier(clients + 1)
+        stop = asyncio.Event()
+        method, probe_url = target["probe"](port)
+        monitors = [
+            asyncio.create_task(probe_loop(method, probe_url, probe_samples, stop)),
+            asyncio.create_task(loop_lag_monitor(lag_samples, stop)),
+        ]
+
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(run_client(target_name, target["url"](port), target["tool"], barrier, timings, errors))
+            for _ in range(clients)
+        ]
+        rss_connected = None
+        try:
+            await barrier.wait()
+            rss_connected = process_rss_bytes(pid)
+            await barrier.wait()
+        except asyncio.BrokenBarrierError:
+            pass
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*monitors)
+
+    completed = len(timings["session"])
+    requests = sum(len(timings[k]) for k in ("initialize", "list_tools", "call_tool"))
+    memory_per_session = None
+    if rss_before is not None and rss_connected is not None and clients:
+        memory_per_session = max(rss_connected - rss_before, 0) // clients
+    return {
+        "target": target_name,
+        "version": repo_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "clients": clients,
+        "completed_sessions": completed,
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "elapsed_s": round(elapsed, 3),
+        "throughput": {
+            "sessions_per_s": round(completed / elapsed, 3) if elapsed else None,
+            "requests_per_s": round(requests / elapsed, 3) if elapsed else None,
+        },
+        "latency": {k: summarize(v) for k, v in timings.items()},
+        "memory": {
+            "server_rss_before_bytes": rss_before,
+            "server_rss_connected_bytes": rss_connected,
+            "per_session_bytes": memory_per_session,
+        },
+        "event_loop": {
+            "server_probe": summarize(probe_samples),
+            "client_loop_lag": summarize(lag_samples),
+        },
+    }
+
+#----------------------------
+def save_result(result, output=None):
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{result['target']}-{result['clients']}c-{stamp}.json"
+    Path(output).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    return output
+
+def compare(baseline_path, current_path):
+    """두 결과 JSON 의 주요 지표 비교 (+ 는 증가)"""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    current = json.loads(Path(current_path).read_text(encoding="utf-8"))
+    rows = [("throughput.sessions_per_s", ("throughput", "sessions_per_s")),
+            ("throughput.requests_per_s", ("throughput", "requests_per_s")),
+            ("memory.per_session_bytes", ("memory", "per_session_bytes")),
+            ("event_loop.server_probe.p99_ms", ("event_loop", "server_probe", "p99_ms"))]
+    for op in ("initialize", "list_tools", "call_tool", "session"):
+        for stat in ("p50_ms", "p99_ms"):
+            rows.append((f"latency.{op}.{stat}", ("latency", op, stat)))
+
+    def lookup(data, keys):
+        for key in keys:
+            data = data.get(key) if isinstance(data, dict) else None
+        return data
+
+    print(f"baseline: {baseline.get('version')} ({baseline.get('timestamp')})")
+    print(f"current : {current.get('version')} ({current.get('timestamp')})")
+    for label, keys in rows:
+        old, new = lookup(baseline, keys), lookup(current, keys)
+        if old is None or new is None:
+            continue
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"  {label:<34} {old:>14} -> {new:>14}  ({change})")
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP SSE / streamable-http load test")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="run a benchmark")
+    run.add_argument("--target", choices=[*TARGETS, "all"], default="all")
+    run.add_argument("--clients", type=int, nargs="+", default=[10, 50])
+    run.add_argument("--port", type=int, default=8765)
+    run.add_argument("--output", help="result file (single target / client count only)")
+    cmp_ = sub.add_parser("compare", help="compare two result files")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        compare(args.baseline, args.current)
+        return
+
+    targets = list(TARGETS) if args.target == "all" else [args.target]
+    for target in targets:
+        for clients in args.clients:
+            result = asyncio.run(run_benchmark(target, clients, args.port))
+            path = save_result(result, args.output)
+            lat = result["latency"]
+            print(f"[{target}] clients={clients} sessions/s={result['throughput']['sessions_per_s']} "
+                  f"call_tool p50={lat['call_tool'].get('p50_ms')}ms p99={lat['call_tool'].get('p99_ms')}ms "
+                  f"mem/session={result['memory']['per_session_bytes']}B errors={result['errors']} -> {path}")
+
+if __name__ == "__main__":
+    main()
+
+#--실행 방법 (프로젝트 루트에서)
+# > uv run python ch03/benchmarks/load_test.py run --target sse --clients 10 100
+# > uv run python ch03/benchmarks/load_test.py run --target streamable-http --clients 20
+# > uv run python ch03/benchmarks/load_test.py compare ch03/benchmarks/results/a.json ch03/benchmarks/results/b.json
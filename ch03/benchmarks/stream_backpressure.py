@@ -0,0 +1,166 @@
+#
+# classic /stream 엔드포인트 느린 클라이언트 부하 테스트
+#----------------------------
+# -- ch03/06_http-streaming 의 FastAPI 서버(`uvicorn server:app`)를 띄우고, 수천 개의 느린 reader 를 동시에 연결합니다.
+#    - 각 reader 는 소켓 수신 버퍼를 작게 잡고 `--read-bytes` 바이트를 `--read-interval` 초마다 한 번씩만 읽습니다.
+#    - 서버는 이벤트를 쉬지 않고 만들도록 요청합니다 (`count`, `interval=0`, `size`).
+# -- backpressure 가 없다면 서버는 못 보낸 이벤트를 연결마다 계속 쌓아 메모리가 늘어납니다.
+#    SseResponse 는 연결당 buffer 를 high-water mark 로 묶고 느린 클라이언트를 끊기 때문에
+#    서버 RSS 가 연결 수에 비례한 만큼만 늘고 이후에는 평평해야 합니다.
+# -- 측정: 시간에 따른 서버 RSS, `/stream-stats` (active / slow_disconnects / buffered_bytes)
+import argparse
+import asyncio
+import resource
+import socket
+import sys
+import time
+from datetime import datetime
+
+import httpx
+
+from load_test import CH03, ServerProcess, process_rss_bytes, repo_version, save_result
+
+STREAM_TARGET = {
+    "cwd": CH03 / "06_http-streaming",
+    "command": lambda port: [sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1",
+                             "--port", str(port), "--backlog", "8192", "--log-level", "critical"],
+    "env": lambda port: {},
+    "probe": lambda port: ("GET", f"http://127.0.0.1:{port}/stream-stats"),
+}
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+async def slow_reader(port, path, read_bytes, read_interval, duration, connect_limit, counters):
+    """소켓 수신 버퍼를 작게 잡고 천천히 읽는 SSE 클라이언트"""
+    async with connect_limit:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.setblocking(False)
+        try:
+            await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", port))
+            reader, writer = await asyncio.open_connection(sock=sock, limit=read_bytes * 2)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: text/event-stream\r\n\r\n".encode())
+            await writer.drain()
+        except OSError as e:
+            counters["connect_errors"] += 1
+            counters["errors"].append(repr(e))
+            sock.close()
+            return
+    counters["connected"] += 1
+    deadline = time.monotonic() + duration
+    try:
+        while time.monotonic() < deadline:
+            data = await reader.read(read_bytes)
+            if not data:
+                counters["closed_by_server"] += 1
+                return
+            counters["bytes_read"] += len(data)
+            await asyncio.sleep(read_interval)
+    except OSError:
+        counters["closed_by_server"] += 1
+    finally:
+        writer.close()
+
+async def sample_server(port, pid, samples, stop, interval=0.5):
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        started = time.monotonic()
+        while not stop.is_set():
+            try:
+                stats = (await client.get(f"http://127.0.0.1:{port}/stream-stats")).json()
+            except httpx.HTTPError:
+                stats = None
+            samples.append({
+                "t": round(time.monotonic() - started, 2),
+                "rss_bytes": process_rss_bytes(pid),
+                "stats": stats,
+            })
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+async def run_benchmark(args):
+    counters = {"connected": 0, "connect_errors": 0, "closed_by_server": 0, "bytes_read": 0, "errors": []}
+    samples = []
+    path = f"/stream?message=bench&count={args.count}&interval=0&size={args.size}"
+    async with ServerProcess(STREAM_TARGET, args.port) as server:
+        pid = server.process.pid
+        rss_idle = process_rss_bytes(pid)
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_server(args.port, pid, samples, stop))
+        connect_limit = asyncio.Semaphore(256)
+        readers = [
+            asyncio.create_task(slow_reader(args.port, path, args.read_bytes, args.read_interval,
+                                            args.duration, connect_limit, counters))
+            for _ in range(args.clients)
+        ]
+        await asyncio.gather(*readers)
+        stop.set()
+        await sampler
+
+    rss = [s["rss_bytes"] for s in samples if s["rss_bytes"]]
+    # 연결이 모두 붙은 뒤 구간(후반 절반)의 RSS 변화량: 평평하면 0 근처
+    tail = rss[len(rss) // 2:]
+    last_stats = next((s["stats"] for s in reversed(samples) if s["stats"]), {})
+    return {
+        "target": "classic-stream",
+        "version": repo_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "clients": args.clients,
+        "config": {k: getattr(args, k) for k in ("count", "size", "read_bytes", "read_interval", "duration")},
+        "clients_connected": counters["connected"],
+        "connect_errors": counters["connect_errors"],
+        "closed_by_server": counters["closed_by_server"],
+        "bytes_read": counters["bytes_read"],
+        "error_samples": counters["errors"][:5],
+        "memory": {
+            "server_rss_idle_bytes": rss_idle,
+            "server_rss_peak_bytes": max(rss) if rss else None,
+            "server_rss_end_bytes": rss[-1] if rss else None,
+            "per_connection_bytes": (max(rss) - rss_idle) // args.clients if rss and rss_idle else None,
+            "second_half_growth_bytes": (tail[-1] - tail[0]) if len(tail) > 1 else None,
+        },
+        "server_stats": last_stats,
+        "samples": samples,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="slow-reader load test for the classic /stream endpoint")
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds each reader stays connected")
+    parser.add_argument("--count", type=int, default=10_000, help="events requested per stream")
+    parser.add_argument("--size", type=int, default=1024, help="payload bytes per event")
+    parser.add_argument("--read-bytes", type=int, default=512)
+    parser.add_argument("--read-interval", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", help="result file (default: results/classic-stream-<N>c-<time>.json)")
+    args = parser.parse_args()
+
+    limit = raise_fd_limit()
+    if limit < args.clients * 2 + 100:
+        print(f"warning: open file limit {limit} is low for {args.clients} clients (client + server sockets)")
+
+    result = asyncio.run(run_benchmark(args))
+    path = save_result(result, args.output)
+    memory = result["memory"]
+    mb = lambda value: f"{value / 1024 / 1024:.1f}MB" if value is not None else "n/a"
+    print(f"clients={args.clients} connected={result['clients_connected']} "
+          f"slow_disconnects={result['server_stats'].get('slow_disconnects')} "
+          f"rss idle={mb(memory['server_rss_idle_bytes'])} peak={mb(memory['server_rss_peak_bytes'])} "
+          f"end={mb(memory['server_rss_end_bytes'])} second-half growth={mb(memory['second_half_growth_bytes'])} "
+          f"-> {path}")
+    for sample in result["samples"][::max(len(result["samples"]) // 10, 1)]:
+        stats = sample["stats"] or {}
+        print(f"  t={sample['t']:>6}s rss={mb(sample['rss_bytes']):>9} active={stats.get('active')} "
+              f"buffered={stats.get('buffered_bytes')} slow_disconnects={stats.get('slow_disconnects')}")
+
+if __name__ == "__main__":
+    main()
+
+#--실행 방법 (프로젝트 루트에서, 열린 파일 수 제한이 clients x 2 이상이어야 함)
+# > uv run python ch03/benchmarks/stream_backpressure.py --clients 5000 --duration 30
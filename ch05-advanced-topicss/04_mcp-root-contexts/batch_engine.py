@@ -0,0 +1,171 @@
+#
+# 배치 처리 엔진 (process_data_batch / batch_process 용)
+#---------------------------------
+# -- 기존 도구는 항목을 하나씩 `await asyncio.sleep(0.5)` 하며 처리해서 1,000개면 8분이 넘게 걸립니다.
+# -- BatchEngine
+#    - 동시 처리 수 제한: TaskGroup 안에 `concurrency` 개의 worker 만 띄우고, worker 들이 항목을 차례로 가져감
+#      (항목 수만큼 task 를 만들지 않으므로 10만 개 배치도 메모리가 일정)
+#    - CPU 작업은 `run_sync()` 로 thread pool (기본) 또는 process pool 에서 실행 -> event loop 가 막히지 않음
+#    - 항목별 재시도: 실패하면 `max_retries` 번까지 다시 시도 (retry_delay * 2^n 만큼 쉬고)
+#    - 결과는 입력 순서대로, 실패한 항목은 errors 에 모아서 반환
+# -- 환경 변수: BATCH_CONCURRENCY (기본 16), BATCH_EXECUTOR (thread / process)
+# -- process pool 은 spawn 이라 자식마다 서버 script 를 `__mp_main__` 으로 다시 import 함
+#    -> 서버 모듈의 전역 초기화는 부작용이 없어야 함 (저장소는 session_store.LazyStore 로 처음 사용할 때 열기)
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+import json_codec
+
+DEFAULT_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", 16))
+DEFAULT_EXECUTOR = os.environ.get("BATCH_EXECUTOR", "thread")
+
+_process_pool: ProcessPoolExecutor | None = None
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """CPU 작업용 process pool (최초 호출 시 생성, 서버 전체에서 공유)"""
+    global _process_pool
+    if _process_pool is None:
+        # 서버의 event loop / stdio 스레드를 fork 로 복제하지 않도록 spawn 사용
+        context = multiprocessing.get_context("spawn")
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 2, mp_context=context)
+    return _process_pool
+
+def shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+#---------------------------------
+# 항목 변환 (CPU 작업, process pool 에서도 돌 수 있도록 module 수준 함수)
+def transform_item(item: str, format: str = "json") -> dict:
+    """항목을 요청된 형식으로 직렬화하고 checksum 을 계산"""
+    if format == "csv":
+        output = '"' + item.replace('"', '""') + '"'
+    elif format == "xml":
+        escaped = item.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        output = f"<item>{escaped}</item>"
+    else:
+        output = json_codec.dumps({"item": item})
+    return {
+        "output": output,
+        "sha256": hashlib.sha256(item.encode("utf-8")).hexdigest(),
+    }
+
+#---------------------------------
+@dataclass
+class BatchResult:
+    results: list[Any]                           # 입력 순서, 실패한 자리는 None
+    errors: list[dict] = field(default_factory=list)
+    attempts: int = 0                            # 재시도를 포함한 전체 시도 횟수
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> list[Any]:
+        failed = {error["index"] for error in self.errors}
+        return [result for idx, result in enumerate(self.results) if idx not in failed]
+
+class BatchEngine:
+    """항목들을 제한된 동시성으로 처리하는 엔진"""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, max_retries: int = 0,
+                 retry_delay: float = 0.1, executor: str | Executor = DEFAULT_EXECUTOR):
+        self.concurrency = max(concurrency, 1)
+        self.max_retries = max(max_retries, 0)
+        self.retry_delay = retry_delay
+        self.executor = executor
+
+    def _executor(self) -> Executor | None:
+        if self.executor == "process":
+            return get_process_pool()
+        if self.executor == "thread":
+            return None                          # loop 의 기본 ThreadPoolExecutor
+        return self.executor
+
+    async def run_sync(self, func: Callable, *args, **kwargs):
+        """동기(CPU) 함수를 pool 에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), partial(func, *args, **kwargs))
+
+    async def run(self, items: list, handler: Callable[[int, Any], Awaitable[Any]],
+                  on_done: Callable[[int, int, int, Exception | None], Awaitable[None]] | None = None) -> BatchResult:
+        """`handler(index, item)` 을 모든 항목에 대해 실행
+
+        on_done(done, total, index, error) 은 항목이 끝날 때마다(성공/최종 실패) 호출됩니다.
+        """
+        total = len(items)
+        batch = BatchResult(results=[None] * total)
+        pending = iter(enumerate(items))
+        done = 0
+        started = time.perf_counter()
+
+        async def worker():
+            nonlocal done
+            # 단일 event loop 안에서는 next() 가 원자적이므로 worker 끼리 항목이 겹치지 않음
+            for idx, item in pending:
+                error = await self._run_one(batch, idx, item, handler)
+                done += 1
+                if on_done is not None:
+                    await on_done(done, total, idx, error)
+
+        async with asyncio.TaskGroup() as group:
+            for _ in range(min(self.concurrency, total)):
+                group.create_task(worker())
+
+        batch.errors.sort(key=lambda error: error["index"])
+        batch.elapsed = time.perf_counter() - started
+        return batch
+
+    async def _run_one(self, batch: BatchResult, idx: int, item, handler) -> Exception | None:
+        for attempt in range(self.max_retries + 1):
+            batch.attempts += 1
+            try:
+                batch.results[idx] = await handler(idx, item)
+                return None
+            except Exception as e:
+                error = e
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self.retry_delay * 2 ** attempt)
+        batch.errors.append({"index": idx, "item": item, "error": str(error), "attempts": self.max_retries + 1})
+        return error
+
+#---------------------------------
+# 동작 확인: 0.5초 I/O + CPU 변환, 그리고 일부 항목은 처음 몇 번 실패하도록
+async def demo(items: int = 1000, concurrency: int = 64, max_retries: int = 3, executor: str = "thread"):
+    engine = BatchEngine(concurrency=concurrency, max_retries=max_retries, retry_delay=0.05, executor=executor)
+    failures: dict[int, int] = {}
+
+    async def handler(idx, item):
+        await asyncio.sleep(0.5)
+        if idx % 50 == 0 and failures.get(idx, 0) < (2 if idx % 100 else max_retries + 1):
+            failures[idx] = failures.get(idx, 0) + 1
+            raise RuntimeError(f"일시적 오류 ({failures[idx]}회)")
+        return {"index": idx, **await engine.run_sync(transform_item, item, "xml")}
+
+    batch = await engine.run([f"item-{i}" for i in range(items)], handler)
+    ordered = all(result["index"] == idx for idx, result in enumerate(batch.results) if result is not None)
+    print(f"{items} items, concurrency={concurrency}, executor={executor}: {batch.elapsed:.1f}s "
+          f"(sequential: {items * 0.5:.0f}s)")
+    print(f"  succeeded={len(batch.succeeded)} failed={len(batch.errors)} attempts={batch.attempts} ordered={ordered}")
+    print(f"  first error: {batch.errors[0] if batch.errors else None}")
+    shutdown_process_pool()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+    asyncio.run(demo(args.items, args.concurrency, executor=args.executor))
+
+#--실행 방법
+# > uv run python batch_engine.py --items 1000 --concurrency 64
+# > uv run python batch_engine.py --executor process
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+JSON 직렬화 비교
+- 리소스 응답과 비슷한 payload (세션 하나, tasks://active 한 페이지, 세션 로그, 지표 이력, 시간 변환 결과) 를
+- 기존 방식 (json.dumps indent=2) 과 json_codec 의 설치된 backend 별 compact / pretty 출력으로 직렬화해서
+- 한 번에 걸리는 시간 (µs) 과 크기 (byte) 를 비교
+"""
+import argparse
+import json
+import statistics
+import time
+
+import json_codec
+from task_ids import new_task_id
+
+def make_session(i: int) -> dict:
+    return {
+        "id": new_task_id(),
+        "name": f"데이터 처리 작업 {i}",
+        "description": "고객 데이터 정제 및 리포트 생성",
+        "status": "running",
+        "created_at": "2026-10-19T09:00:00.000000",
+        "started_at": "2026-10-19T09:00:01.250000",
+        "progress": 42.5,
+        "config": {"priority": "high", "notify_on_complete": True, "max_retries": 3, "tags": ["report", "daily"]},
+        "log_seq": 3,
+    }
+
+def payloads() -> dict[str, object]:
+    return {
+        "task session": {"session": make_session(0), "version": 7, "accessed_at": "2026-10-19T09:00:02"},
+        "active page (100)": {
+            "active_tasks": 1234,
+            "tasks": [make_session(i) for i in range(100)],
+            "next_cursor": new_task_id(),
+            "timestamp": "2026-10-19T09:00:02",
+        },
+        "session logs (500)": {
+            "session_id": new_task_id(),
+            "after": 0,
+            "logs": [
+                {"seq": i + 1, "timestamp": "2026-10-19T09:00:02.123456", "step": "처리 실행", "progress": i / 500}
+                for i in range(500)
+            ],
+            "last_seq": 500,
+            "has_more": False,
+        },
+        "metric series (1000)": {
+            "field": "cpu",
+            "method": "lttb",
+            "resolution": "raw",
+            "series": [["2026-10-19T09:00:00", round(20 + (i * 7) % 60 + i / 1000, 2)] for i in range(1000)],
+        },
+        "time conversion": {
+            "source": {"timezone": "Asia/Seoul", "datetime": "2026-10-19T18:00:00+09:00", "is_dst": False},
+            "target": {"timezone": "Europe/Paris", "datetime": "2026-10-19T11:00:00+02:00", "is_dst": True},
+            "time_difference": "-7.0h",
+        },
+    }
+
+def timed(func, repeat: int) -> float:
+    """반복 실행한 중앙값 (µs)"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(samples)
+
+def main(repeat: int):
+    encoders = {"json indent=2 (before)": lambda obj: json.dumps(obj, indent=2, ensure_ascii=False)}
+    for name in json_codec.available_backends():
+        _, dumps, _ = json_codec.select_backend(name)
+        encoders[f"{name} compact"] = dumps
+        encoders[f"{name} pretty"] = lambda obj, dumps=dumps: dumps(obj, pretty=True)
+
+    print(f"backends: {', '.join(json_codec.available_backends())} (default: {json_codec.BACKEND})")
+    for label, obj in payloads().items():
+        baseline = encoders["json indent=2 (before)"]
+        base_us = timed(lambda: baseline(obj), repeat)
+        base_size = len(baseline(obj).encode("utf-8"))
+        print(f"\n{label}")
+        for name, dumps in encoders.items():
+            us = timed(lambda: dumps(obj), repeat)
+            size = len(dumps(obj).encode("utf-8"))
+            print(f"  {name:24} {us:9.1f} µs  x{base_us / us:4.1f}  {size:8,} B  ({size / base_size - 1:+.0%})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.repeat)
+
+#--실행 방법
+# > uv run python bench_json.py
+# > uv run --with orjson --with msgspec python bench_json.py     (빠른 backend 포함)
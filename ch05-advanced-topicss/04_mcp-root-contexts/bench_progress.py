@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+진행 알림 빈도 제한 효과 측정
+- 같은 배치 작업(항목마다 progress + debug 로그)을 ctx 직접 호출 / ProgressReporter 두 방식으로 실행
+- 클라이언트가 받은 알림 수와, stdio/HTTP 로 나갈 JSON-RPC 바이트 수를 비교
+- 서버와 클라이언트는 메모리 스트림으로 연결 (서버 프로세스 불필요)
+"""
+import argparse
+import asyncio
+import time
+
+from mcp import types
+from mcp.server.fastmcp import FastMCP, Context
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from progress_reporter import ProgressReporter
+
+mcp = FastMCP(name="Progress Benchmark")
+
+@mcp.tool()
+async def naive_batch(items: int, ctx: Context) -> int:
+    """항목마다 report_progress + debug (기존 방식)"""
+    for idx in range(items):
+        await ctx.report_progress(progress=(idx + 1) / items, total=1.0, message=f"항목 {idx + 1}/{items} 처리 중")
+        await ctx.debug(f"항목 처리 완료: item-{idx}")
+        await asyncio.sleep(0)
+    return items
+
+@mcp.tool()
+async def throttled_batch(items: int, ctx: Context, max_rate: float = 10.0) -> int:
+    """같은 작업을 ProgressReporter 로"""
+    async with ProgressReporter(ctx, max_rate=max_rate) as reporter:
+        for idx in range(items):
+            await reporter.progress(progress=(idx + 1) / items, total=1.0, message=f"항목 {idx + 1}/{items} 처리 중")
+            await reporter.debug(f"항목 처리 완료: item-{idx}")
+            await asyncio.sleep(0)
+    return items
+
+def wire_bytes(notification: types.ServerNotification) -> int:
+    """transport 가 보내는 JSON-RPC 한 줄의 크기 (stdio 는 줄 끝 개행 포함)"""
+    message = types.JSONRPCNotification(
+        **{"jsonrpc": "2.0", **notification.model_dump(by_alias=True, mode="json", exclude_none=True)}
+    )
+    return len(message.model_dump_json(by_alias=True, exclude_none=True).encode("utf-8")) + 1
+
+async def run_tool(tool: str, items: int) -> dict:
+    counts = {"progress": 0, "log": 0, "bytes": 0, "last_progress": None}
+
+    async def message_handler(message):
+        if isinstance(message, types.ServerNotification):
+            counts["bytes"] += wire_bytes(message)
+            if isinstance(message.root, types.ProgressNotification):
+                counts["progress"] += 1
+            elif isinstance(message.root, types.LoggingMessageNotification):
+                counts["log"] += 1
+
+    async def progress_callback(progress, total, message):
+        counts["last_progress"] = progress
+
+    async with create_connected_server_and_client_session(mcp._mcp_server, message_handler=message_handler) as client:
+        started = time.perf_counter()
+        await client.call_tool(tool, {"items": items}, progress_callback=progress_callback)
+        counts["elapsed_s"] = round(time.perf_counter() - started, 2)
+    return counts
+
+async def main(items: int):
+    print(f"{items} items, progress + debug log per item")
+    results = {}
+    for tool in ("naive_batch", "throttled_batch"):
+        results[tool] = result = await run_tool(tool, items)
+        print(f"  {tool:<16} progress={result['progress']:>7} logs={result['log']:>7} "
+              f"bytes={result['bytes']:>11,} last_progress={result['last_progress']} elapsed={result['elapsed_s']}s")
+    naive, throttled = results["naive_batch"], results["throttled_batch"]
+    print(f"  notifications: {naive['progress'] + naive['log']:,} -> {throttled['progress'] + throttled['log']:,}"
+          f"  bytes: {naive['bytes']:,} -> {throttled['bytes']:,}"
+          f"  ({(1 - throttled['bytes'] / naive['bytes']) * 100:.1f}% less)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.items))
+
+#--실행 방법
+# > uv run python bench_progress.py --items 100000
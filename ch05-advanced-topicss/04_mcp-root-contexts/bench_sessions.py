@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+작업 세션 저장소 규모 테스트
+- SQLite 저장소에 세션 N 개(기본 100만, 그중 1% 활성)를 넣고
+- ID 조회 / 활성 세션 수 / tasks://active 첫 페이지와 마지막 페이지 조회 시간을 측정
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from session_store import SqliteSessionStore
+from task_ids import new_task_id
+
+ACTIVE_STATUSES = ["initialized", "queued", "running"]
+
+def timed(func, repeat: int = 50) -> float:
+    """반복 실행한 중앙값 (ms)"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def main(sessions: int, active_every: int, page_size: int):
+    path = Path(tempfile.mkdtemp()) / "bench_sessions.db"
+    store = SqliteSessionStore(path, batch_size=10_000)
+    started = time.perf_counter()
+    ids = []
+    for i in range(sessions):
+        session_id = new_task_id()
+        ids.append(session_id)
+        status = ACTIVE_STATUSES[i % 3] if i % active_every == 0 else "completed"
+        store.create({"id": session_id, "name": f"task-{i}", "status": status,
+                      "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "config": {"priority": "medium"}})
+    store.flush()
+    print(f"{sessions:,} sessions inserted in {time.perf_counter() - started:.1f}s "
+          f"({os.path.getsize(path) / 2**20:.0f} MiB)")
+
+    active = store.count_by_status(ACTIVE_STATUSES)
+    last_page_cursor = store.list_by_status(ACTIVE_STATUSES)[-page_size - 1]["id"]
+    store._cache.clear()
+    print(f"  get by id (cold)      {timed(lambda: store.get(ids[len(ids) // 2]) and store._cache.clear()):7.3f} ms")
+    print(f"  count active          {timed(lambda: store.count_by_status(ACTIVE_STATUSES)):7.3f} ms  ({active:,})")
+    print(f"  active first page     {timed(lambda: store.list_by_status(ACTIVE_STATUSES, limit=page_size + 1)):7.3f} ms")
+    print(f"  active last page      {timed(lambda: store.list_by_status(ACTIVE_STATUSES, limit=page_size + 1, after=last_page_cursor)):7.3f} ms")
+    print(f"  all sessions, page    {timed(lambda: store.list_all(limit=page_size + 1, after=ids[-page_size * 2])):7.3f} ms")
+    store.close()
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--active-every", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+    main(args.sessions, args.active_every, args.page_size)
+
+#--실행 방법
+# > uv run python bench_sessions.py --sessions 1000000
@@ -12,8 +12,20 @@ from pydantic import BaseModel, Field
 import asyncio
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-import json
 import base64
+import time
+from pathlib import Path
+from urllib.parse import parse_qs
+from progress_reporter import ProgressReporter, SessionNotifier
+from batch_engine import BatchEngine, DEFAULT_CONCURRENCY, transform_item
+from session_store import FINISHED_STATUSES, LazyStore, SessionStore, open_store
+import json_codec
+from elicitation_cache import ElicitationCache
+from task_scheduler import TaskScheduler
+from resource_subscriptions import SubscriptionManager
+from task_ids import new_task_id
+from system_metrics import FIELDS as METRIC_FIELDS, MetricsSampler, RunningStats
+from timeseries import TimeSeriesStore
 
 # FastMCP 서버 생성
 mcp = FastMCP(
@@ -22,8 +34,39 @@ mcp = FastMCP(
     description="Context의 고급 기능을 보여주는 데모 서버"
 )
 
-# 데이터 저장소 (메모리 기반)
-task_sessions: Dict[str, Dict[str, Any]] = {}
+# 리소스 구독 (resources/subscribe) - 바뀐 리소스를 구독한 세션에만 resources/updated 전송 (0.5초에 한 번까지)
+subscriptions = SubscriptionManager(min_interval=0.5)
+subscriptions.install(mcp)
+
+# 데이터 저장소 (기본: 이 폴더의 task_sessions.db, TASK_STORE=memory 이면 메모리)
+ACTIVE_STATUSES = ['initialized', 'queued', 'running']
+
+def open_task_sessions() -> SessionStore:
+    store = open_store(Path(__file__).parent / "task_sessions.db")
+    # 지난 실행에서 끝나지 못한 세션은 실행하던 job 이 없으므로 failed 로 정리 (tasks://active 에 계속 남지 않도록)
+    # queued / running 뿐 아니라 initialized 도 포함: create_task_session 이 세션을 만들자마자 scheduler 에
+    # 넣으므로, initialized 로 남은 세션도 사라진 job 을 기다리는 세션임
+    store.mark_interrupted(
+        ACTIVE_STATUSES,
+        status="failed",
+        error="서버가 재시작되어 작업이 중단되었습니다",
+        interrupted=True,
+        completed_at=datetime.now().isoformat()
+    )
+    return store
+
+# 처음 사용할 때 열림 (process pool 의 spawn 자식이 이 모듈을 import 해도 저장소를 열거나 세션을 정리하지 않음)
+task_sessions = LazyStore(open_task_sessions)
+# execute_task 의 background 실행 (TASK_WORKERS 개 동시 실행, 우선순위 high > medium > low)
+scheduler = TaskScheduler()
+# monitor_system 이 공유하는 /proc sampler
+system_metrics = MetricsSampler(interval=1.0)
+# 수집된 sample 의 해상도별 이력 (raw / 10s / 1m / 1h, MONITOR_RETENTION 으로 보관 기간 설정)
+metrics_history = TimeSeriesStore(METRIC_FIELDS, sample_interval=system_metrics.interval)
+system_metrics.sinks.append(metrics_history.add)
+# 반복되는 설정 질문의 응답 캐시 (기본 ask: 마지막 답을 미리 채워서 물어봄,
+# 질문을 건너뛰려면 ELICIT_POLICY=remember|defaults 또는 도구의 elicit_policy 로 명시, ELICIT_CACHE_TTL 초)
+elicitations = ElicitationCache()
 resource_data: Dict[str, Any] = {}
 
 # 사용자 입력 스키마들
@@ -61,19 +104,25 @@ class DataProcessingOptions(BaseModel):
 async def create_task_session(
     task_name: str,
     description: str,
-    ctx: Context
+    ctx: Context,
+    elicit_policy: Optional[str] = None
 ) -> Dict[str, Any]:
-    """작업 세션 생성 with Context"""
+    """작업 세션 생성 with Context
+    
+    elicit_policy: ask (기본, 마지막 답을 채워서 물어봄) / remember (최근 답이 있으면 묻지 않음) / defaults (묻지 않음)
+    """
     
     # 세션 ID 생성
-    session_id = f"task_{datetime.now().timestamp()}"
+    session_id = new_task_id()
     
     await ctx.info(f"새 작업 세션 생성 중: {task_name}")
     
-    # 사용자에게 작업 설정 요청
-    config_result = await ctx.elicit(
+    # 사용자에게 작업 설정 요청 (policy 에 따라 기억된 답을 쓰거나, 마지막 답을 기본값으로 채워서)
+    config_result = await elicitations.elicit(
+        ctx,
         message=f"'{task_name}' 작업의 설정을 구성해주세요",
-        schema=TaskConfiguration
+        schema=TaskConfiguration,
+        policy=elicit_policy
     )
     
     # print(f"config_result: {config_result}")
@@ -84,108 +133,204 @@ async def create_task_session(
     config = config_result.data
     
     # 세션 데이터 저장
-    task_sessions[session_id] = {
+    task_sessions.create({
         "id": session_id,
         "name": task_name,
         "description": description,
         "config": config.model_dump(),  # Convert Pydantic model to dict for JSON serialization
         "status": "initialized",
         "created_at": datetime.now().isoformat(),
-        "logs": [],
-        "progress": 0
-    }
+        "progress": 0,
+        "version": 0
+    })
     
     await ctx.info(f"작업 세션 생성 완료: {session_id}")
     
-    # 리소스 목록 변경 알림
-    await ctx.session.send_resource_list_changed()
+    # 활성 작업 목록 구독자에게 변경 알림 (task://session/{id} 는 template 이라 목록은 그대로)
+    await subscriptions.notify("tasks://active")
+    
+    # 실행은 background scheduler 에 맡기고 바로 응답
+    job = await enqueue_task(session_id, ctx)
     
     return {
         "session_id": session_id,
         "config": config,
-        "message": f"작업 '{task_name}'이 생성되었습니다"
+        "status": "queued",
+        "priority": job.priority,
+        "queue_position": scheduler.position(session_id),
+        "message": f"작업 '{task_name}'이 생성되어 실행 대기 중입니다 (진행 상황: task://session/{session_id})"
     }
 
+def session_uri(session_id: str) -> str:
+    return f"task://session/{session_id}"
+
+async def update_session(session_id: str, **fields):
+    """세션을 저장하고 구독자에게 변경 알림 (상태가 바뀌면 tasks://active 구독자에게도)
+
+    바뀔 때마다 세션 레코드의 version 을 1 올림 (저장소에 함께 저장되므로 재시작 / 구독 해제 후에도 줄지 않음)
+    """
+    version = task_sessions.get(session_id).get("version", 0) + 1
+    task_sessions.update(session_id, version=version, **fields)
+    if "status" in fields:
+        await subscriptions.notify(session_uri(session_id), "tasks://active")
+        if fields["status"] in FINISHED_STATUSES:
+            # 끝난 세션은 더 바뀌지 않으므로 구독 기록을 지움 (마지막 알림은 위에서 보냄)
+            subscriptions.forget(session_uri(session_id))
+    else:
+        await subscriptions.notify(session_uri(session_id))
+
+# 작업 단계들
+TASK_STEPS = [
+    ("초기화", 0.1),
+    ("데이터 로드", 0.3),
+    ("데이터 검증", 0.5),
+    ("처리 실행", 0.8),
+    ("결과 저장", 0.95),
+    ("완료", 1.0)
+]
+
+async def run_task_session(session_id: str, notifier: SessionNotifier):
+    """scheduler worker 에서 실행되는 작업 본체
+
+    tool 응답은 이미 끝났으므로 진행 상황은 로그 알림과, task://session/{id} 를 구독한
+    세션에게 가는 resources/updated 알림으로 전달됩니다.
+    """
+    session = task_sessions.get(session_id)
+    started = datetime.now()
+    await update_session(session_id, status="running", started_at=started.isoformat())
+    
+    # 진행/디버그 알림은 reporter 를 통해 초당 최대 10번으로 제한
+    reporter = ProgressReporter(notifier)
+    try:
+        await reporter.info(f"작업 실행 시작: {session['name']}")
+        for step_name, progress in TASK_STEPS:
+            # 진행 상황 업데이트
+            await reporter.progress(
+                progress=progress,
+                total=1.0,
+                message=f"{step_name} 진행 중..."
+            )
+            
+            # 세션 진행률 업데이트 (로그는 seq 가 붙어 task://session/{id}/logs?after=<seq> 로 조회 가능)
+            task_sessions.append_log(session_id, {
+                "timestamp": datetime.now().isoformat(),
+                "step": step_name,
+                "progress": progress
+            })
+            await update_session(session_id, progress=progress * 100)
+            
+            # 디버그 로그
+            await reporter.debug(f"[{session_id}] {step_name} - {progress:.0%}")
+            
+            # 시뮬레이션 딜레이
+            await asyncio.sleep(1)
+            
+            # 특정 단계에서 경고 발생 시뮬레이션
+            if step_name == "데이터 검증" and session['config']['priority'] == "high":
+                await reporter.warning("고우선순위 작업 - 추가 검증 수행 중")
+                await asyncio.sleep(0.5)
+    except asyncio.CancelledError:
+        await update_session(session_id, status="cancelled", completed_at=datetime.now().isoformat())
+        await reporter.warning(f"작업 취소됨: {session['name']}")
+        await reporter.aclose()
+        await notifier.report_progress(progress=task_sessions.get(session_id)['progress'], total=100, message="취소됨")
+        raise
+    except Exception as e:
+        await update_session(session_id, status="failed", error=str(e), completed_at=datetime.now().isoformat())
+        await reporter.error(f"작업 실패: {session['name']} - {str(e)}")
+        await reporter.aclose()
+        raise
+    
+    finished = datetime.now()
+    await update_session(
+        session_id,
+        status="completed",
+        completed_at=finished.isoformat(),
+        execution_time=f"{(finished - started).total_seconds():.1f}초"
+    )
+    
+    # 완료 알림
+    if session['config']['notify_on_complete']:
+        await reporter.info(f"✅ 작업 완료: {session['name']}")
+    await reporter.aclose()
+
+async def enqueue_task(session_id: str, ctx: Context):
+    """작업을 우선순위 큐에 넣음 (이미 대기 / 실행 중이면 그 작업을 그대로 돌려줌)"""
+    session = task_sessions.get(session_id)
+    notifier = SessionNotifier(ctx.session, logger="task_scheduler")
+    job = await scheduler.submit(
+        session_id,
+        session['config']['priority'],
+        lambda: run_task_session(session_id, notifier)
+    )
+    if job.status == "queued" and session['status'] != "queued":
+        await update_session(session_id, status="queued", queued_at=datetime.now().isoformat())
+    return job
+
 @mcp.tool()
 async def execute_task(
     session_id: str,
     ctx: Context
 ) -> Dict[str, Any]:
-    """작업 실행 with 상세한 진행 상황 보고"""
+    """작업 실행 요청 (background 에서 실행, 진행 상황은 알림 / task://session/{id} 로 확인)"""
     
     if session_id not in task_sessions:
         await ctx.error(f"세션을 찾을 수 없습니다: {session_id}")
         return {"status": "error", "message": "세션이 존재하지 않습니다"}
     
-    session = task_sessions[session_id]
-    await ctx.info(f"작업 실행 시작: {session['name']}")
-    
-    # 작업 단계들
-    steps = [
-        ("초기화", 0.1),
-        ("데이터 로드", 0.3),
-        ("데이터 검증", 0.5),
-        ("처리 실행", 0.8),
-        ("결과 저장", 0.95),
-        ("완료", 1.0)
-    ]
-    
-    session['status'] = "running"
-    
-    for step_name, progress in steps:
-        # 진행 상황 업데이트
-        await ctx.report_progress(
-            progress=progress,
-            total=1.0,
-            message=f"{step_name} 진행 중..."
-        )
-        
-        # 세션 진행률 업데이트
-        session['progress'] = progress * 100
-        session['logs'].append({
-            "timestamp": datetime.now().isoformat(),
-            "step": step_name,
-            "progress": progress
-        })
-        
-        # 디버그 로그
-        await ctx.debug(f"[{session_id}] {step_name} - {progress:.0%}")
-        
-        # 시뮬레이션 딜레이
-        await asyncio.sleep(1)
-        
-        # 특정 단계에서 경고 발생 시뮬레이션
-        if step_name == "데이터 검증" and session['config']['priority'] == "high":
-            await ctx.warning("고우선순위 작업 - 추가 검증 수행 중")
-            await asyncio.sleep(0.5)
-    
-    session['status'] = "completed"
-    session['completed_at'] = datetime.now().isoformat()
-    
-    # 완료 알림
-    if session['config']['notify_on_complete']:
-        await ctx.info(f"✅ 작업 완료: {session['name']}")
+    job = await enqueue_task(session_id, ctx)
+    await ctx.info(f"작업 실행 요청: {session_id} ({job.status}, 우선순위 {job.priority})")
     
     return {
-        "status": "success",
+        "status": job.status,
         "session_id": session_id,
-        "execution_time": "6초",
-        "logs": session['logs']
+        "priority": job.priority,
+        "queue_position": scheduler.position(session_id),
+        "resource": f"task://session/{session_id}"
     }
 
+@mcp.tool()
+async def cancel_task(
+    session_id: str,
+    ctx: Context
+) -> Dict[str, Any]:
+    """대기 중이거나 실행 중인 작업 취소"""
+    
+    job = scheduler.get(session_id)
+    if job is None:
+        return {"status": "error", "message": "대기 / 실행 중인 작업이 아닙니다"}
+    
+    was_queued = job.status == "queued"
+    await scheduler.cancel(session_id)
+    if task_sessions.get(session_id)['status'] not in FINISHED_STATUSES:
+        # 대기 중이었거나 시작 전에 취소된 작업 (실행 중이던 작업은 run_task_session 이 기록)
+        await update_session(session_id, status="cancelled", completed_at=datetime.now().isoformat())
+    await ctx.info(f"작업 취소 요청: {session_id}")
+    
+    return {"status": "cancelled", "session_id": session_id, "was": "queued" if was_queued else "running"}
+
 @mcp.tool()
 async def process_data_batch(
     data_items: List[str],
-    ctx: Context
+    ctx: Context,
+    session_id: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    elicit_policy: Optional[str] = None
 ) -> Dict[str, Any]:
-    """배치 데이터 처리 with 사용자 옵션"""
+    """배치 데이터 처리 with 사용자 옵션 (session_id 를 주면 그 세션의 max_retries 사용)
+    
+    elicit_policy: ask / remember / defaults (처리 옵션을 물어볼지, create_task_session 과 같음)
+    """
     
     await ctx.info(f"{len(data_items)}개 항목 처리 준비")
     
     # 처리 옵션 요청
-    options_result = await ctx.elicit(
+    options_result = await elicitations.elicit(
+        ctx,
         message="데이터 처리 옵션을 선택해주세요",
-        schema=DataProcessingOptions
+        schema=DataProcessingOptions,
+        context=session_id or "",
+        policy=elicit_policy
     )
     
     if options_result.action != "accept" or not options_result.data:
@@ -193,47 +338,67 @@ async def process_data_batch(
     
     options = options_result.data
     
-    processed_items = []
-    errors = []
+    # 재시도 횟수는 작업 설정(TaskConfiguration)을 따름
+    if session_id in task_sessions:
+        max_retries = task_sessions.get(session_id)['config']['max_retries']
+    else:
+        max_retries = TaskConfiguration().max_retries
     
-    for idx, item in enumerate(data_items):
-        try:
-            # 진행 상황 보고
-            progress = (idx + 1) / len(data_items)
-            await ctx.report_progress(
-                progress=progress,
-                total=1.0,
-                message=f"항목 {idx + 1}/{len(data_items)} 처리 중: {item}"
-            )
-            
-            # 처리 시뮬레이션
-            await asyncio.sleep(0.5)
-            
-            # 처리 결과
-            result = {
-                "item": item,
-                "processed": True,
-                "timestamp": datetime.now().isoformat()
+    engine = BatchEngine(concurrency=concurrency, max_retries=max_retries)
+    reporter = ProgressReporter(ctx)
+    
+    async def process_item(idx: int, item: str) -> Dict[str, Any]:
+        # 처리 시뮬레이션 (I/O 대기는 동시에 진행됨)
+        await asyncio.sleep(0.5)
+        
+        # 형식 변환 / checksum 은 thread pool 에서
+        transformed = await engine.run_sync(transform_item, item, options.format)
+        
+        # 처리 결과
+        result = {
+            "item": item,
+            "processed": True,
+            "output": transformed["output"],
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        if options.include_metadata:
+            result["metadata"] = {
+                "index": idx,
+                "size": len(item),
+                "format": options.format,
+                "sha256": transformed["sha256"]
             }
-            
-            if options.include_metadata:
-                result["metadata"] = {
-                    "index": idx,
-                    "size": len(item),
-                    "format": options.format
-                }
-            
-            processed_items.append(result)
-            
-        except Exception as e:
-            await ctx.error(f"항목 처리 실패: {item} - {str(e)}")
-            errors.append({"item": item, "error": str(e)})
+        
+        return result
+    
+    async def on_done(done: int, total: int, idx: int, error: Optional[Exception]):
+        # 진행 상황 보고
+        await reporter.progress(
+            progress=done / total,
+            total=1.0,
+            message=f"항목 {done}/{total} 처리 완료: {data_items[idx]}"
+        )
+        if error is not None:
+            await reporter.error(f"항목 처리 실패: {data_items[idx]} - {str(error)}")
+    
+    batch = await engine.run(data_items, process_item, on_done=on_done)
+    
+    # 보류 중인 마지막 진행 상황 / 로그 전송
+    await reporter.aclose()
+    
+    processed_items = batch.succeeded
+    errors = [
+        {"item": error["item"], "error": error["error"], "attempts": error["attempts"]}
+        for error in batch.errors
+    ]
     
     # 결과 포맷팅
     output = {
         "processed": len(processed_items),
         "failed": len(errors),
         "format": options.format,
+        "elapsed_seconds": round(batch.elapsed, 2),
         "items": processed_items
     }
     
@@ -241,101 +406,209 @@ async def process_data_batch(
         output["errors"] = errors
         await ctx.warning(f"{len(errors)}개 항목 처리 실패")
     
-    await ctx.info(f"배치 처리 완료: {len(processed_items)}개 성공")
+    await ctx.info(f"배치 처리 완료: {len(processed_items)}개 성공 ({batch.elapsed:.1f}초, 동시 처리 {engine.concurrency}개)")
     
     return output
 
 @mcp.tool()
 async def monitor_system(
     duration_seconds: int,
-    ctx: Context
+    ctx: Context,
+    max_points: int = 60
 ) -> Dict[str, Any]:
-    """시스템 모니터링 with 실시간 업데이트"""
+    """시스템 모니터링 with 실시간 업데이트 (/proc 에서 1초마다 수집, 응답의 metrics 는 최대 max_points 개)"""
     
-    await ctx.info(f"{duration_seconds}초 동안 시스템 모니터링 시작")
+    # sample 이 하나도 없으면 평균 / 최대를 낼 수 없음
+    if duration_seconds < 1:
+        raise ValueError(f"duration_seconds 는 1 이상이어야 합니다: {duration_seconds}")
     
-    metrics = []
+    await ctx.info(f"{duration_seconds}초 동안 시스템 모니터링 시작")
     
-    for i in range(duration_seconds):
-        # 메트릭 수집 (시뮬레이션)
-        metric = {
-            "timestamp": datetime.now().isoformat(),
-            "cpu": 20 + (i * 2) % 30,
-            "memory": 40 + (i * 3) % 20,
-            "disk": 60 + (i % 10)
-        }
-        
-        metrics.append(metric)
-        
-        # 실시간 상태 보고
-        status_msg = f"CPU: {metric['cpu']}%, MEM: {metric['memory']}%, DISK: {metric['disk']}%"
-        
-        # 진행률과 함께 상태 보고
-        await ctx.report_progress(
-            progress=(i + 1) / duration_seconds,
-            total=1.0,
-            message=status_msg
-        )
-        
-        # 임계값 체크
-        if metric['cpu'] > 40:
-            await ctx.warning(f"⚠️ CPU 사용률 높음: {metric['cpu']}%")
-        
-        if metric['memory'] > 50:
-            await ctx.error(f"🚨 메모리 사용률 위험: {metric['memory']}%")
-        
-        await asyncio.sleep(1)
+    collected = 0
+    first_at = last_at = None
+    stats = {name: RunningStats() for name in ("cpu", "memory", "disk")}
+    
+    reporter = ProgressReporter(ctx)
+    # 동시에 호출된 모니터링 도구들은 같은 sampler 의 sample 을 함께 받음
+    async with system_metrics.subscribe() as samples:
+        for i in range(duration_seconds):
+            sample = await samples.next()
+            metric = sample.as_dict()
+            collected += 1
+            first_at = first_at or sample.timestamp
+            last_at = sample.timestamp
+            for name, running in stats.items():
+                running.add(getattr(sample, name))
+            
+            # 실시간 상태 보고
+            status_msg = f"CPU: {metric['cpu']}%, MEM: {metric['memory']}%, DISK: {metric['disk']}%"
+            
+            # 진행률과 함께 상태 보고
+            await reporter.progress(
+                progress=(i + 1) / duration_seconds,
+                total=1.0,
+                message=status_msg
+            )
+            
+            # 임계값 체크
+            if metric['cpu'] > 40:
+                await reporter.warning(f"⚠️ CPU 사용률 높음: {metric['cpu']}%")
+            
+            if metric['memory'] > 50:
+                await reporter.error(f"🚨 메모리 사용률 위험: {metric['memory']}%")
     
+    await reporter.aclose()
     await ctx.info("모니터링 완료")
     
-    # 요약 통계
-    avg_cpu = sum(m['cpu'] for m in metrics) / len(metrics)
-    avg_mem = sum(m['memory'] for m in metrics) / len(metrics)
+    # 모든 sample 대신 이력 저장소에서 max_points 개로 줄인 값을 돌려줌
+    resolution, metrics = (
+        metrics_history.rows(first_at, last_at, max(max_points, 1), fields=("cpu", "memory", "disk"))
+        if collected else ("raw", [])
+    )
     
     return {
         "duration": duration_seconds,
-        "metrics_collected": len(metrics),
+        "metrics_collected": collected,
+        "source": system_metrics.source.name,
+        "resolution": resolution,
         "summary": {
-            "avg_cpu": round(avg_cpu, 2),
-            "avg_memory": round(avg_mem, 2),
-            "max_cpu": max(m['cpu'] for m in metrics),
-            "max_memory": max(m['memory'] for m in metrics)
+            "avg_cpu": round(stats["cpu"].mean, 2),
+            "avg_memory": round(stats["memory"].mean, 2),
+            "max_cpu": round(stats["cpu"].max, 2),
+            "max_memory": round(stats["memory"].max, 2),
+            **{name: running.summary() for name, running in stats.items()}
         },
         "metrics": metrics
     }
 
+@mcp.tool()
+async def query_metrics(
+    field: str = "cpu",
+    minutes: float = 60,
+    points: int = 100,
+    method: str = "lttb"
+) -> Dict[str, Any]:
+    """수집된 시스템 지표 이력 조회 (최근 minutes 분, points 개 이하로 downsampling)
+    
+    field: cpu / memory / disk / disk_read / disk_write
+    method: lttb (모양 보존) 또는 minmax (bucket 별 최솟값 / 최댓값, spike 보존)
+    """
+    
+    end = time.time()
+    result = metrics_history.query(field, end - minutes * 60, end, max(points, 1), method)
+    result["history"] = metrics_history.stats()
+    return result
+
 # 동적 리소스 (리소스는 Context를 지원하지 않음)
+# 리소스 응답은 compact JSON (json_codec), 사람이 읽을 때만 query 에 pretty=1
+LOG_PAGE_SIZE = 500
+
+def query_params(uri: str, query: str) -> dict[str, str]:
+    if not query.startswith("?"):
+        raise ValueError(f"알 수 없는 리소스: {uri}{query}")
+    return {key: values[0] for key, values in parse_qs(query[1:]).items()}
+
+def is_pretty(params: dict[str, str]) -> bool:
+    return params.get("pretty", "0").lower() in ("1", "true", "yes")
+
 @mcp.resource("task://session/{session_id}")
 def get_task_session(session_id: str) -> str:
-    """작업 세션 정보 리소스"""
+    """작업 세션 정보 리소스 (로그 제외, 로그는 task://session/{session_id}/logs?after=<log_seq>)"""
     
     if session_id not in task_sessions:
-        return json.dumps({
+        return json_codec.dumps({
             "error": "세션을 찾을 수 없습니다",
             "session_id": session_id
-        }, indent=2, ensure_ascii=False)
-    
-    session = task_sessions[session_id]
+        })
     
-    return json.dumps({
+    session = task_sessions.get(session_id)
+    return json_codec.dumps({
         "session": session,
+        "version": session.get("version", 0),
         "accessed_at": datetime.now().isoformat()
-    }, indent=2, ensure_ascii=False)
+    })
+
+def session_logs(session_id: str, after: int = 0, limit: int = LOG_PAGE_SIZE, pretty: bool = False) -> str:
+    if session_id not in task_sessions:
+        return json_codec.dumps({"error": "세션을 찾을 수 없습니다", "session_id": session_id}, pretty)
+    
+    limit = max(1, min(limit, LOG_PAGE_SIZE))
+    logs = task_sessions.logs(session_id, after=after, limit=limit)
+    last_seq = task_sessions.get(session_id).get("log_seq", 0)
+    return json_codec.dumps({
+        "session_id": session_id,
+        "after": after,
+        "logs": logs,
+        "last_seq": logs[-1]["seq"] if logs else after,
+        "has_more": bool(logs) and logs[-1]["seq"] < last_seq
+    }, pretty)
+
+@mcp.resource("task://session/{session_id}/logs")
+def get_task_session_logs(session_id: str) -> str:
+    """작업 세션의 단계 로그 (처음부터)"""
+    return session_logs(session_id)
+
+@mcp.resource("task://session/{session_id}/logs{query}")
+def get_task_session_logs_after(session_id: str, query: str) -> str:
+    """작업 세션의 단계 로그 중 seq 가 after 보다 큰 것만 (task://session/{id}/logs?after=3&limit=100)"""
+    
+    params = query_params(f"task://session/{session_id}/logs", query)
+    return session_logs(
+        session_id,
+        after=int(params.get("after", 0)),
+        limit=int(params.get("limit", LOG_PAGE_SIZE)),
+        pretty=is_pretty(params)
+    )
+
+ACTIVE_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def active_tasks_page(cursor: Optional[str] = None, limit: int = ACTIVE_PAGE_SIZE, pretty: bool = False) -> str:
+    """활성 작업을 생성 순서로 한 페이지씩 (cursor = 이전 페이지의 next_cursor)"""
+    
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    # 하나 더 읽어서 다음 페이지가 있는지 확인
+    page = task_sessions.list_by_status(ACTIVE_STATUSES, limit=limit + 1, after=cursor)
+    next_cursor = page[limit - 1]['id'] if len(page) > limit else None
+    
+    return json_codec.dumps({
+        "active_tasks": task_sessions.count_by_status(ACTIVE_STATUSES),
+        "tasks": page[:limit],
+        "next_cursor": next_cursor,
+        "timestamp": datetime.now().isoformat()
+    }, pretty)
 
 @mcp.resource("tasks://active")
 def get_active_tasks() -> str:
-    """활성 작업 목록"""
+    """활성 작업 목록 (첫 페이지, 다음 페이지는 tasks://active?cursor=<next_cursor>)"""
+    return active_tasks_page()
+
+@mcp.resource("tasks://active{query}")
+def get_active_tasks_page(query: str) -> str:
+    """활성 작업 목록 페이지 (tasks://active?cursor=<next_cursor>&limit=100&pretty=1)"""
     
-    active = [
-        session for session in task_sessions.values()
-        if session['status'] in ['initialized', 'running']
-    ]
+    params = query_params("tasks://active", query)
+    limit = int(params.get("limit", ACTIVE_PAGE_SIZE))
+    return active_tasks_page(params.get("cursor"), limit, is_pretty(params))
+
+@mcp.resource("scheduler://metrics")
+def get_scheduler_metrics() -> str:
+    """작업 scheduler 지표 (우선순위별 큐 길이, 실행 수, 대기 시간)"""
+    
+    return json_codec.dumps({
+        **scheduler.metrics(),
+        "timestamp": datetime.now().isoformat()
+    })
+
+@mcp.resource("elicitation://metrics")
+def get_elicitation_metrics() -> str:
+    """Elicitation 지표 (policy, 물어본 횟수 / 마지막 답으로 미리 채운 횟수,
+    remember / defaults policy 로 건너뛴 횟수, 응답 대기 시간)"""
     
-    return json.dumps({
-        "active_tasks": len(active),
-        "tasks": active,
+    return json_codec.dumps({
+        **elicitations.stats(),
         "timestamp": datetime.now().isoformat()
-    }, indent=2, ensure_ascii=False)
+    })
 
 if __name__ == "__main__":
     mcp.run() 
\ No newline at end of file
@@ -7,7 +7,15 @@ from mcp.server.fastmcp import FastMCP, Context
 import asyncio
 from datetime import datetime
 from typing import Dict, List, Any
-import json
+from pathlib import Path
+from urllib.parse import parse_qs
+from progress_reporter import ProgressReporter
+from batch_engine import BatchEngine, DEFAULT_CONCURRENCY, transform_item
+from session_store import LazyStore, open_store
+import json_codec
+from task_ids import new_task_id
+from system_metrics import FIELDS as METRIC_FIELDS, MetricsSampler, RunningStats
+from timeseries import TimeSeriesStore
 
 # FastMCP 서버 생성
 mcp = FastMCP(
@@ -16,13 +24,19 @@ mcp = FastMCP(
     description="Context 기본 기능 데모"
 )
 
-# 데이터 저장소
-tasks = {}
+# 데이터 저장소 (기본: 이 폴더의 simple_tasks.db, TASK_STORE=memory 이면 메모리)
+# 처음 사용할 때 열림 (process pool 의 spawn 자식이 이 모듈을 import 해도 저장소를 열지 않음)
+tasks = LazyStore(lambda: open_store(Path(__file__).parent / "simple_tasks.db"))
+# monitor_metrics 가 공유하는 /proc sampler
+system_metrics = MetricsSampler(interval=1.0)
+metrics_history = TimeSeriesStore(METRIC_FIELDS, sample_interval=system_metrics.interval)
+system_metrics.sinks.append(metrics_history.add)
 
 @mcp.tool()
 async def simple_task(name: str, duration: int, ctx: Context) -> Dict[str, Any]:
     """간단한 작업 실행 with Context 로깅"""
-    task_id = f"task_{datetime.now().timestamp()}"
+    task_id = new_task_id()
+    started_at = datetime.now().isoformat()
     
     # 정보 로그
     await ctx.info(f"작업 시작: {name}")
@@ -30,27 +44,30 @@ async def simple_task(name: str, duration: int, ctx: Context) -> Dict[str, Any]:
     # 디버그 로그
     await ctx.debug(f"작업 ID: {task_id}, 예상 시간: {duration}초")
     
-    # 진행 상황 보고
-    for i in range(duration):
-        progress = (i + 1) / duration
-        await ctx.report_progress(
-            progress=progress,
-            total=1.0,
-            message=f"{name} - {i+1}/{duration}초 경과"
-        )
-        # await ctx.debug(f"progress: {progress*100:.0f}%")
-        await asyncio.sleep(1)
+    # 진행 상황 보고 (reporter: 초당 최대 10번, 마지막 100% 는 항상 전송)
+    async with ProgressReporter(ctx) as reporter:
+        for i in range(duration):
+            progress = (i + 1) / duration
+            await reporter.progress(
+                progress=progress,
+                total=1.0,
+                message=f"{name} - {i+1}/{duration}초 경과"
+            )
+            # await reporter.debug(f"progress: {progress*100:.0f}%")
+            await asyncio.sleep(1)
     
     # 완료 로그
     await ctx.info(f"작업 완료: {name}")
     
     # 결과 저장
-    tasks[task_id] = {
+    tasks.create({
         "id": task_id,
         "name": name,
         "duration": duration,
+        "status": "completed",
+        "created_at": started_at,
         "completed_at": datetime.now().isoformat()
-    }
+    })
     
     return {
         "task_id": task_id,
@@ -59,112 +76,158 @@ async def simple_task(name: str, duration: int, ctx: Context) -> Dict[str, Any]:
     }
 
 @mcp.tool()
-async def batch_process(items: List[str], ctx: Context) -> Dict[str, Any]:
-    """배치 처리 with 진행 상황"""
+async def batch_process(
+    items: List[str],
+    ctx: Context,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = 3
+) -> Dict[str, Any]:
+    """배치 처리 with 진행 상황 (최대 concurrency 개씩 동시 처리, 실패 시 max_retries 번 재시도)"""
     await ctx.info(f"배치 처리 시작: {len(items)}개 항목")
     
-    processed = []
-    errors = []
+    engine = BatchEngine(concurrency=concurrency, max_retries=max_retries)
+    reporter = ProgressReporter(ctx)
     
-    for idx, item in enumerate(items):
-        try:
-            # 진행 상황 보고
-            progress = (idx + 1) / len(items)
-            await ctx.report_progress(
-                progress=progress,
-                total=1.0,
-                message=f"처리 중: {item}"
-            )
-            # 처리 시뮬레이션
-            await asyncio.sleep(0.5)
-            
-            # 가끔 경고 발생
-            if idx == 2:
-                await ctx.warning(f"항목 '{item}'에서 경고 발생")
-            
-            processed.append({
-                "item": item,
-                "processed_at": datetime.now().isoformat()
-            })
-            
-            # await ctx.debug(f"progress: {progress*100:.0f}%")
-            # await ctx.debug(f"항목 처리 완료: {item}")
-        except Exception as e:
-            await ctx.error(f"항목 처리 실패: {item} - {str(e)}")
-            errors.append({"item": item, "error": str(e)})
+    async def process_item(idx: int, item: str) -> Dict[str, Any]:
+        # 처리 시뮬레이션
+        await asyncio.sleep(0.5)
+        
+        # 가끔 경고 발생
+        if idx == 2:
+            await reporter.warning(f"항목 '{item}'에서 경고 발생")
+        
+        return {
+            "item": item,
+            "sha256": (await engine.run_sync(transform_item, item))["sha256"],
+            "processed_at": datetime.now().isoformat()
+        }
+    
+    async def on_done(done: int, total: int, idx: int, error: Exception | None):
+        # 진행 상황 보고
+        await reporter.progress(
+            progress=done / total,
+            total=1.0,
+            message=f"처리 완료: {items[idx]}"
+        )
+        if error is not None:
+            await reporter.error(f"항목 처리 실패: {items[idx]} - {str(error)}")
+        # await reporter.debug(f"항목 처리 완료: {items[idx]}")
+    
+    batch = await engine.run(items, process_item, on_done=on_done)
+    processed = batch.succeeded
+    errors = [{"item": error["item"], "error": error["error"]} for error in batch.errors]
     
+    await reporter.aclose()
     await ctx.info(f"배치 처리 완료: 성공 {len(processed)}개, 실패 {len(errors)}개")
     
     return {
         "total": len(items),
         "processed": len(processed),
         "failed": len(errors),
+        "elapsed_seconds": round(batch.elapsed, 2),
         "items": processed
     }
 
 @mcp.tool()
 async def monitor_metrics(
     seconds: int,
-    ctx: Context
+    ctx: Context,
+    max_points: int = 60
 ) -> Dict[str, Any]:
-    """메트릭 모니터링 with 로그 레벨"""
+    """메트릭 모니터링 with 로그 레벨 (/proc 에서 1초마다 수집, 응답의 metrics 는 최대 max_points 개)"""
+    
+    # sample 이 하나도 없으면 평균 / 최대 / p95 를 낼 수 없음
+    if seconds < 1:
+        raise ValueError(f"seconds 는 1 이상이어야 합니다: {seconds}")
     
     await ctx.info(f"모니터링 시작 ({seconds}초)")
     
-    metrics = []
+    first_at = last_at = None
+    cpu_stats, memory_stats = RunningStats(), RunningStats()
     
-    for i in range(seconds):
-        # 메트릭 생성
-        cpu = 40 + (i * 5) % 40
-        memory = 30 + (i * 3) % 30
-        
-        metric = {
-            "time": i + 1,
-            "cpu": cpu,
-            "memory": memory
-        }
-        metrics.append(metric)
-        
-        # 진행 상황
-        progress = (i + 1) / seconds
-        await ctx.report_progress(
-            progress=progress,
-            total=1.0,
-            message=f"CPU: {cpu}%, MEM: {memory}%"
-        )
-        # await ctx.debug(f"progress: {progress*100:.0f}%")
-        
-        # 조건에 따른 로그 레벨
-        if cpu > 50:
-            await ctx.error(f"🚨 CPU 사용률 위험: {cpu}%")
-        elif cpu > 40:
-            await ctx.warning(f"⚠️ CPU 사용률 높음: {cpu}%")
-        else:
-            await ctx.debug(f"CPU 정상: {cpu}%")
-        
-        await asyncio.sleep(1)
+    reporter = ProgressReporter(ctx)
+    async with system_metrics.subscribe() as samples:
+        for i in range(seconds):
+            # 메트릭 수집 (동시에 호출된 도구들과 sampler 공유)
+            sample = await samples.next()
+            cpu = round(sample.cpu, 1)
+            memory = round(sample.memory, 1)
+            cpu_stats.add(sample.cpu)
+            memory_stats.add(sample.memory)
+            first_at = first_at or sample.timestamp
+            last_at = sample.timestamp
+            
+            # 진행 상황
+            progress = (i + 1) / seconds
+            await reporter.progress(
+                progress=progress,
+                total=1.0,
+                message=f"CPU: {cpu}%, MEM: {memory}%"
+            )
+            # await reporter.debug(f"progress: {progress*100:.0f}%")
+            
+            # 조건에 따른 로그 레벨
+            if cpu > 50:
+                await reporter.error(f"🚨 CPU 사용률 위험: {cpu}%")
+            elif cpu > 40:
+                await reporter.warning(f"⚠️ CPU 사용률 높음: {cpu}%")
+            else:
+                await reporter.debug(f"CPU 정상: {cpu}%")
     
+    await reporter.aclose()
     await ctx.info("모니터링 완료")
     
+    # 이력 저장소에서 max_points 개 이하로 줄여서 반환
+    _, metrics = (
+        metrics_history.rows(first_at, last_at, max(max_points, 1), fields=("cpu", "memory"))
+        if first_at else (None, [])
+    )
+    
     return {
         "duration": seconds,
         "metrics": metrics,
         "summary": {
-            "avg_cpu": sum(m['cpu'] for m in metrics) / len(metrics),
-            "avg_memory": sum(m['memory'] for m in metrics) / len(metrics),
-            "max_cpu": max(m['cpu'] for m in metrics),
-            "max_memory": max(m['memory'] for m in metrics)
+            "avg_cpu": round(cpu_stats.mean, 2),
+            "avg_memory": round(memory_stats.mean, 2),
+            "max_cpu": round(cpu_stats.max, 2),
+            "max_memory": round(memory_stats.max, 2),
+            "p95_cpu": round(cpu_stats.p95.value(), 2),
+            "p95_memory": round(memory_stats.p95.value(), 2)
         }
     }
 
 # 리소스
+LIST_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def tasks_page(cursor: str | None = None, limit: int = LIST_PAGE_SIZE, pretty: bool = False) -> str:
+    """저장된 작업을 생성 순서로 한 페이지씩 (cursor = 이전 페이지의 next_cursor)"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    # 하나 더 읽어서 다음 페이지가 있는지 확인
+    page = tasks.list_all(limit=limit + 1, after=cursor)
+    next_cursor = page[limit - 1]['id'] if len(page) > limit else None
+    return json_codec.dumps({
+        "tasks": page[:limit],
+        "count": tasks.count(),
+        "next_cursor": next_cursor
+    }, pretty)
+
 @mcp.resource("tasks://list")
 def list_tasks() -> str:
-    """작업 목록"""
-    return json.dumps({
-        "tasks": list(tasks.values()),
-        "count": len(tasks)
-    }, indent=2, ensure_ascii=False)
+    """작업 목록 (첫 페이지, 다음 페이지는 tasks://list?cursor=<next_cursor>)"""
+    return tasks_page()
+
+@mcp.resource("tasks://list{query}")
+def list_tasks_page(query: str) -> str:
+    """작업 목록 페이지 (tasks://list?cursor=<next_cursor>&limit=100&pretty=1)"""
+    if not query.startswith("?"):
+        raise ValueError(f"알 수 없는 리소스: tasks://list{query}")
+    params = {key: values[0] for key, values in parse_qs(query[1:]).items()}
+    return tasks_page(
+        params.get("cursor"),
+        int(params.get("limit", LIST_PAGE_SIZE)),
+        params.get("pretty", "0").lower() in ("1", "true", "yes")
+    )
 
 if __name__ == "__main__":
     mcp.run() 
\ No newline at end of file
@@ -7,6 +7,10 @@ from pydantic import BaseModel, Field
 from mcp.server.fastmcp import Context, FastMCP
 from datetime import datetime
 from typing import Optional
+import json_codec
+from pending_elicitations import FallbackElicitation, PendingElicitations, combine_schemas, split_result
+from elicitation_cache import with_defaults
+from reservation_engine import ReservationEngine, format_time, parse_date, parse_time
 
 # Note: elicitation requires MCP client support
 # This example shows the proper implementation structure
@@ -16,12 +20,16 @@ mcp = FastMCP(name="Elicitation Demo")
 # 다양한 Elicitation 스키마들
 
 class BookingPreferences(BaseModel):
-    """레스토랑 예약 설정"""
+    """레스토랑 예약 설정 (대체 날짜 / 시간의 기본값은 가장 가까운 빈 자리)"""
     checkAlternative: bool = Field(description="다른 날짜를 확인하시겠습니까?")
     alternativeDate: str = Field(
         default="2024-12-26",
         description="대체 날짜 (YYYY-MM-DD)",
     )
+    alternativeTime: str = Field(
+        default="18:00",
+        description="대체 시간 (HH:MM)",
+    )
 
 class DeliveryOptions(BaseModel):
     """배송 옵션 선택"""
@@ -48,77 +56,137 @@ class PaymentMethod(BaseModel):
         description="다음에도 사용하기 위해 저장"
     )
 
+# 대기 중인 elicitation (시간 제한 ELICIT_TIMEOUT 초, 전체 100개 / 연결당 4개까지)
+elicitations = PendingElicitations()
+
+# 예약 엔진 (테이블 11개, 11:00-23:00, 식사 2시간)
+reservations = ReservationEngine()
+
+def seed_fully_booked(day: str):
+    """데모용: 그날의 모든 테이블을 단체 예약으로 채움"""
+    booking_day = parse_date(day)
+    for start in reservations.slot_starts():
+        while reservations.book(booking_day, start, 1, name="단체 예약"):
+            pass
+
+seed_fully_booked("2024-12-25")
+
 @mcp.tool()
-async def book_table(date: str, time: str, party_size: int, ctx: Context) -> str:
-    """레스토랑 테이블 예약 with Elicitation"""
+async def book_table(date: str, time: str, party_size: int, ctx: Context, elicit_timeout: Optional[float] = None) -> str:
+    """레스토랑 테이블 예약 with Elicitation (자리가 없으면 가장 가까운 빈 자리를 제안)"""
     await ctx.info(f"예약 요청: {date} {time}, {party_size}명")
     
-    # 특정 날짜는 예약 불가
-    if date == "2024-12-25":
-        await ctx.warning(f"{date}는 예약이 가득 찼습니다")
-        
-        # 사용자에게 대체 날짜 확인
-        result = await ctx.elicit(
-            message=f"{party_size}명 예약이 {date}에는 불가능합니다. 다른 날짜를 확인하시겠습니까?",
-            schema=BookingPreferences,
+    try:
+        booking_day, start = parse_date(date), parse_time(time)
+        reservation = reservations.book(booking_day, start, party_size)
+    except ValueError as e:
+        return f"❌ 예약할 수 없습니다: {e}"
+    
+    if reservation is not None:
+        await ctx.info(f"예약 완료: {date} {time} ({reservation.table.id})")
+        return f"✅ 예약 완료: {date} {time}, {party_size}명 (테이블 {reservation.table.id})"
+    
+    await ctx.warning(f"{date} {time}는 예약이 가득 찼습니다")
+    
+    # 가장 가까운 빈 자리를 손님이 답할 때까지 잡아 둠
+    timeout = elicitations.timeout if elicit_timeout is None else elicit_timeout
+    hold = reservations.hold_nearest(booking_day, start, party_size, hold_seconds=timeout + 30)
+    if hold is None:
+        return f"❌ 예약이 불가능합니다: 앞뒤 {reservations.search_days}일 안에 {party_size}명이 앉을 빈 자리가 없습니다"
+    
+    alternative_date, alternative_time = hold.day.isoformat(), format_time(hold.start)
+    
+    # 어느 경로로 끝나든 (거절 / 응답 없음 / 예외 / 취소) 확정하지 않은 hold 는 finally 에서 해제
+    confirmed = False
+    try:
+        # 사용자에게 대체 날짜 확인 (응답이 없으면 대체 날짜를 확인하지 않음)
+        result = await elicitations.elicit(
+            ctx,
+            message=(
+                f"{party_size}명 예약이 {date} {time}에는 불가능합니다. "
+                f"가장 가까운 빈 자리는 {alternative_date} {alternative_time} 입니다. 다른 날짜를 확인하시겠습니까?"
+            ),
+            schema=with_defaults(BookingPreferences, {"alternativeDate": alternative_date, "alternativeTime": alternative_time}),
+            timeout=elicit_timeout,
+            fallback={"checkAlternative": False},
         )
 
+        if isinstance(result, FallbackElicitation):
+            await ctx.info("고객이 응답하지 않음")
+            return "❌ 예약이 취소되었습니다 (응답 없음)"
+
         if result.action == "accept" and result.data:
-            if result.data.checkAlternative:
-                await ctx.info(f"대체 날짜로 예약 진행: {result.data.alternativeDate}")
-                return f"✅ 예약 완료: {result.data.alternativeDate} {time}, {party_size}명"
-            else:
+            if not result.data.checkAlternative:
                 await ctx.info("고객이 대체 날짜를 원하지 않음")
                 return "❌ 예약이 취소되었습니다"
+            
+            chosen = (result.data.alternativeDate, result.data.alternativeTime)
+            if chosen == (alternative_date, alternative_time):
+                reservation = reservations.confirm(hold.id)
+                confirmed = reservation is not None
+            else:
+                # 제안과 다른 날짜 / 시간을 고르면 hold 를 먼저 풀고 그 자리로 예약 시도
+                reservations.release(hold.id)
+                try:
+                    reservation = reservations.book(parse_date(chosen[0]), parse_time(chosen[1]), party_size)
+                except ValueError as e:
+                    return f"❌ 예약할 수 없습니다: {e}"
+            
+            if reservation is None:
+                return f"❌ {chosen[0]} {chosen[1]}에도 빈 자리가 없어 예약이 취소되었습니다"
+            
+            await ctx.info(f"대체 날짜로 예약 진행: {chosen[0]} {chosen[1]}")
+            return f"✅ 예약 완료: {chosen[0]} {chosen[1]}, {party_size}명 (테이블 {reservation.table.id})"
         
         await ctx.info("고객이 응답하지 않음")
         return "❌ 예약이 취소되었습니다 (응답 없음)"
+    finally:
+        if not confirmed:
+            reservations.release(hold.id)
 
-    # 예약 가능한 경우
-    await ctx.info(f"예약 완료: {date} {time}")
-    return f"✅ 예약 완료: {date} {time}, {party_size}명"
+SHIPPING_COSTS = {
+    "standard": 5.0,
+    "express": 15.0,
+    "overnight": 30.0
+}
+GIFT_WRAP_COST = 3.0
+
+# 배송 옵션과 결제 방법을 한 번에 묻는 schema (round-trip 1번)
+OrderOptions = combine_schemas("OrderOptions", DeliveryOptions, PaymentMethod)
 
 @mcp.tool()
-async def process_order(items: list[str], total_amount: float, ctx: Context) -> str:
-    """주문 처리 with 배송 옵션 선택"""
+async def process_order(items: list[str], total_amount: float, ctx: Context, elicit_timeout: Optional[float] = None) -> str:
+    """주문 처리 with 배송 옵션 / 결제 방법 선택 (한 번에 질문)"""
     await ctx.info(f"주문 처리 시작: {len(items)}개 상품, 총 ${total_amount}")
     
-    # 배송 옵션 선택 요청
-    delivery_result = await ctx.elicit(
-        message="배송 옵션을 선택해주세요",
-        schema=DeliveryOptions
+    # 배송 옵션 + 결제 방법 선택 요청
+    # 결제 수단은 기본값이 없으므로 응답이 없으면 주문을 진행하지 않음
+    rates = ", ".join(f"{name} ${cost:.0f}" for name, cost in SHIPPING_COSTS.items())
+    order_result = await elicitations.elicit(
+        ctx,
+        message=(
+            f"상품 ${total_amount:.2f} - 배송 옵션과 결제 방법을 선택해주세요 "
+            f"(배송비: {rates}, 선물 포장 +${GIFT_WRAP_COST:.0f})"
+        ),
+        schema=OrderOptions,
+        timeout=elicit_timeout,
     )
     
-    if delivery_result.action != "accept" or not delivery_result.data:
-        await ctx.warning("배송 옵션이 선택되지 않음")
-        return "❌ 주문이 취소되었습니다"
+    options = split_result(order_result, DeliveryOptions, PaymentMethod)
+    if options is None:
+        await ctx.warning("배송 옵션 / 결제 방법이 선택되지 않음")
+        return "❌ 주문이 취소되었습니다" + (" (응답 없음)" if isinstance(order_result, FallbackElicitation) else "")
     
-    delivery = delivery_result.data
+    delivery, payment = options
     
     # 배송비 계산
-    shipping_cost = {
-        "standard": 5.0,
-        "express": 15.0,
-        "overnight": 30.0
-    }.get(delivery.deliveryType, 5.0)
+    shipping_cost = SHIPPING_COSTS.get(delivery.deliveryType, 5.0)
     
     if delivery.giftWrap:
-        shipping_cost += 3.0
+        shipping_cost += GIFT_WRAP_COST
     
     final_total = total_amount + shipping_cost
     
-    # 결제 방법 선택
-    payment_result = await ctx.elicit(
-        message=f"총 ${final_total:.2f} (배송비 포함) - 결제 방법을 선택해주세요",
-        schema=PaymentMethod
-    )
-    
-    if payment_result.action != "accept" or not payment_result.data:
-        await ctx.warning("결제 방법이 선택되지 않음")
-        return "❌ 주문이 취소되었습니다"
-    
-    payment = payment_result.data
-    
     # 주문 완료
     order_id = f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}"
     
@@ -139,60 +207,61 @@ async def process_order(items: list[str], total_amount: float, ctx: Context) ->
     
     return result
 
+class NotificationEnable(BaseModel):
+    enable: bool = Field(description="알림을 받으시겠습니까?")
+    email: bool = Field(default=True, description="이메일로 받기")
+    sms: bool = Field(default=False, description="SMS로 받기")
+
+class NotificationFrequency(BaseModel):
+    frequency: str = Field(
+        default="daily",
+        description="알림 빈도 (immediate/daily/weekly, 알림을 받을 때만)"
+    )
+    quiet_hours: bool = Field(
+        default=True,
+        description="방해 금지 시간 설정 (22:00-08:00, 알림을 받을 때만)"
+    )
+
+# 알림 여부와 빈도를 한 번에 묻는 schema
+NotificationSettings = combine_schemas("NotificationSettings", NotificationEnable, NotificationFrequency)
+
 @mcp.tool()
-async def configure_notification(notification_type: str, ctx: Context) -> str:
-    """알림 설정 with 다단계 Elicitation"""
+async def configure_notification(notification_type: str, ctx: Context, elicit_timeout: Optional[float] = None) -> str:
+    """알림 설정 with Elicitation (알림 여부 / 채널 / 빈도를 한 번에 질문)"""
     await ctx.info(f"알림 설정 시작: {notification_type}")
     
-    # 첫 번째 질문: 알림 받을지 여부
-    class NotificationEnable(BaseModel):
-        enable: bool = Field(description="알림을 받으시겠습니까?")
-        email: bool = Field(default=True, description="이메일로 받기")
-        sms: bool = Field(default=False, description="SMS로 받기")
-    
-    enable_result = await ctx.elicit(
-        message=f"{notification_type} 알림을 설정하시겠습니까?",
-        schema=NotificationEnable
+    # 응답이 없으면 알림을 켜지 않음
+    settings_result = await elicitations.elicit(
+        ctx,
+        message=f"{notification_type} 알림을 설정하시겠습니까? (받을 경우 채널과 빈도도 선택해주세요)",
+        schema=NotificationSettings,
+        timeout=elicit_timeout,
+        fallback={"enable": False},
     )
     
-    if enable_result.action != "accept" or not enable_result.data:
+    settings = split_result(settings_result, NotificationEnable, NotificationFrequency)
+    if settings is None:
         return "❌ 알림 설정이 취소되었습니다"
     
-    if not enable_result.data.enable:
+    enable, frequency = settings
+    if not enable.enable:
+        if isinstance(settings_result, FallbackElicitation):
+            return "✅ 알림이 비활성화되었습니다 (응답 없음, 기본값 적용)"
         return "✅ 알림이 비활성화되었습니다"
     
-    # 두 번째 질문: 알림 빈도
-    class NotificationFrequency(BaseModel):
-        frequency: str = Field(
-            default="daily",
-            description="알림 빈도 (immediate/daily/weekly)"
-        )
-        quiet_hours: bool = Field(
-            default=True,
-            description="방해 금지 시간 설정 (22:00-08:00)"
-        )
-    
-    freq_result = await ctx.elicit(
-        message="알림 빈도를 선택해주세요",
-        schema=NotificationFrequency
-    )
-    
-    if freq_result.action != "accept" or not freq_result.data:
-        return "❌ 알림 설정이 취소되었습니다"
-    
     # 설정 완료
     channels = []
-    if enable_result.data.email:
+    if enable.email:
         channels.append("이메일")
-    if enable_result.data.sms:
+    if enable.sms:
         channels.append("SMS")
     
     result = f"""
 ✅ 알림 설정 완료!
 유형: {notification_type}
 채널: {', '.join(channels)}
-빈도: {freq_result.data.frequency}
-방해 금지: {'설정됨' if freq_result.data.quiet_hours else '설정 안 함'}
+빈도: {frequency.frequency}
+방해 금지: {'설정됨' if frequency.quiet_hours else '설정 안 함'}
 """
     
     await ctx.info("알림 설정 완료")
@@ -219,10 +288,31 @@ Elicitation은 도구 실행 중 사용자에게 추가 정보나 선택을 요
 - 결제 방법 선택
 - 알림 설정 구성
 
+## 시간 제한:
+- 도구마다 elicit_timeout 초 (기본 ELICIT_TIMEOUT 환경 변수, 120초) 안에 응답이 없으면 기본값으로 진행
+- 대기 중인 질문 현황과 지표: elicitation://pending
+
 ## 주의사항:
 - 완전한 MCP 클라이언트(예: Claude Desktop)에서만 정상 작동
 - 일반 테스트 클라이언트에서는 제한적
 """
 
+@mcp.resource("reservations://{date}")
+def reservations_on(date: str) -> str:
+    """그날의 예약 목록 (테이블, 시간, 인원)"""
+    return json_codec.dumps({
+        "date": date,
+        "reservations": [reservation.as_dict() for reservation in reservations.reservations(parse_date(date))],
+        "stats": reservations.stats(),
+    })
+
+@mcp.resource("elicitation://pending")
+def pending_elicitations() -> str:
+    """대기 중인 elicitation 목록과 지표 (시간 초과 / 한도 초과 횟수, 응답 대기 시간)"""
+    return json_codec.dumps({
+        "pending": elicitations.pending(),
+        "metrics": elicitations.stats(),
+    })
+
 if __name__ == "__main__":
     mcp.run() 
\ No newline at end of file
@@ -0,0 +1,147 @@
+#
+# Elicitation 응답 캐시와 기본값 채우기
+#---------------------------------
+# -- create_task_session / process_data_batch 는 호출할 때마다 ctx.elicit() 로 같은 설정을 물어서,
+#    batch 작업이 매번 사람의 응답을 기다리며 멈춥니다.
+# -- ElicitationCache.elicit(ctx, message, schema, context="", policy=None)
+#    - 키: (연결, client_id, schema, context)
+#      연결 = ServerSession 단위 -> 다른 연결의 답은 쓰지 않음 (연결이 끝나면 그 연결의 답은 지움)
+#      client_id = 요청 meta 의 client_id (클라이언트가 마음대로 정하는 값이므로 같은 연결 안에서만 구분에 사용)
+#      schema = 이름 + JSON schema 의 hash (필드가 바뀌면 예전 답은 쓰지 않음)
+#      context = 호출하는 쪽이 주는 구분값 (예: 세션 ID)
+#    - policy (ELICIT_POLICY 환경 변수 또는 생성자의 policy, 기본 ask)
+#      ask      : 항상 물어봄. 마지막 답을 기본값으로 채워서 보냄 (prefill) - 기억된 답으로 질문을 건너뛰지 않음
+#      remember : `ttl` 초 안에 받은 답이 있으면 묻지 않고 그 답을 사용, 없으면 ask 와 같음 (명시적으로 켤 때만)
+#      defaults : 묻지 않음. 마지막 답 (기간 무관) 또는 schema 기본값을 사용 (명시적으로 켤 때만)
+#    - 수락(accept)한 답만 기억함. 거절/취소는 다음에 다시 물어봄
+#    - 지표: 실제로 물어본 횟수, 캐시 사용 횟수, 응답 종류, 응답 대기 시간 (avg / p50 / p95)
+import hashlib
+import json
+import os
+import time
+import weakref
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from mcp.server.elicitation import AcceptedElicitation, ElicitationResult
+from mcp.server.fastmcp import Context
+from pydantic import BaseModel, Field, create_model
+
+from system_metrics import RunningStats
+
+POLICIES = ("ask", "remember", "defaults")
+DEFAULT_TTL = float(os.environ.get("ELICIT_CACHE_TTL", 600))
+DEFAULT_POLICY = os.environ.get("ELICIT_POLICY", "ask")
+
+@dataclass(slots=True)
+class CachedAnswer:
+    values: dict[str, Any]
+    answered_at: float
+
+def schema_key(schema: type[BaseModel]) -> str:
+    digest = hashlib.sha256(json.dumps(schema.model_json_schema(), sort_keys=True).encode()).hexdigest()
+    return f"{schema.__name__}:{digest[:12]}"
+
+_prefilled: dict[tuple, type[BaseModel]] = {}
+
+def with_defaults(schema: type[BaseModel], values: dict[str, Any]) -> type[BaseModel]:
+    """schema 의 기본값을 values 로 바꾼 subclass (클라이언트 입력 폼에 미리 채워짐)"""
+    key = (schema, tuple(sorted(values.items())))
+    if key not in _prefilled:
+        if len(_prefilled) >= 256:
+            _prefilled.clear()
+        fields = {
+            name: (info.annotation, Field(default=values[name], description=info.description))
+            for name, info in schema.model_fields.items() if name in values
+        }
+        _prefilled[key] = create_model(schema.__name__, __base__=schema, __doc__=schema.__doc__, **fields)
+    return _prefilled[key]
+
+class ElicitationCache:
+    def __init__(self, ttl: float = DEFAULT_TTL, policy: str = DEFAULT_POLICY, max_entries: int = 10_000):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown elicitation policy: {policy} (one of {', '.join(POLICIES)})")
+        self.ttl = ttl
+        self.policy = policy
+        self.max_entries = max_entries
+        self._answers: OrderedDict[tuple, CachedAnswer] = OrderedDict()
+        self._session_ids = weakref.WeakKeyDictionary()
+        self.counters = Counter()
+        self.wait = RunningStats()                      # 실제로 물어본 경우의 응답 대기 시간 (초)
+
+    def client_key(self, ctx: Context) -> str:
+        """연결 단위 키 (요청 meta 의 client_id 는 클라이언트가 보내는 값이라 키의 기준으로 쓰지 않음)"""
+        session = ctx.session
+        if session not in self._session_ids:
+            key = self._session_ids[session] = f"session:{id(session)}"
+            # 연결이 끝나면 그 연결에서 받은 답은 지움
+            weakref.finalize(session, self._forget_client, key)
+        return self._session_ids[session]
+
+    def _forget_client(self, client: str):
+        for key in [key for key in self._answers if key[0] == client]:
+            del self._answers[key]
+
+    def forget(self, ctx: Context, schema: type[BaseModel] | None = None):
+        """이 클라이언트가 기억시킨 답을 지움 (schema 를 주면 그 schema 만)"""
+        client = self.client_key(ctx)
+        prefix = schema_key(schema) if schema else None
+        for key in [key for key in self._answers if key[0] == client and (prefix is None or key[2] == prefix)]:
+            del self._answers[key]
+
+    #---------------------------------
+    async def elicit(
+        self,
+        ctx: Context,
+        message: str,
+        schema: type[BaseModel],
+        context: str = "",
+        policy: str | None = None,
+    ) -> ElicitationResult:
+        policy = policy or self.policy
+        if policy not in POLICIES:
+            raise ValueError(f"unknown elicitation policy: {policy} (one of {', '.join(POLICIES)})")
+        key = (self.client_key(ctx), ctx.client_id or "", schema_key(schema), context)
+        cached = self._answers.get(key)
+
+        if policy == "remember" and cached and time.monotonic() - cached.answered_at <= self.ttl:
+            self._answers.move_to_end(key)
+            self.counters["cache_hits"] += 1
+            await ctx.debug(f"기억된 {schema.__name__} 응답 사용")
+            return AcceptedElicitation(data=schema.model_validate(cached.values))
+        if policy == "defaults":
+            self.counters["defaults_used" if cached is None else "cache_hits"] += 1
+            await ctx.debug(f"{schema.__name__}: {'기본값' if cached is None else '마지막 응답'} 사용 (policy=defaults)")
+            return AcceptedElicitation(data=schema.model_validate(cached.values if cached else {}))
+
+        # 물어봄 - 마지막 답이 있으면 기본값으로 채워서
+        request_schema = with_defaults(schema, cached.values) if cached else schema
+        self.counters["prefilled" if cached else "asked_fresh"] += 1
+        started = time.monotonic()
+        result = await ctx.elicit(message=message, schema=request_schema)
+        self.wait.add(time.monotonic() - started)
+        self.counters[result.action] += 1
+
+        if result.action != "accept" or not result.data:
+            return result
+        data = schema.model_validate(result.data.model_dump())
+        self._answers[key] = CachedAnswer(data.model_dump(), time.monotonic())
+        self._answers.move_to_end(key)
+        if len(self._answers) > self.max_entries:
+            self._answers.popitem(last=False)
+        return AcceptedElicitation(data=data)
+
+    def stats(self) -> dict:
+        asked = self.counters["prefilled"] + self.counters["asked_fresh"]
+        skipped = self.counters["cache_hits"] + self.counters["defaults_used"]
+        return {
+            "policy": self.policy,
+            "ttl_seconds": self.ttl,
+            "remembered_answers": len(self._answers),
+            "asked": asked,
+            "skipped": skipped,
+            "skip_rate": round(skipped / (asked + skipped), 3) if asked + skipped else None,
+            **self.counters,
+            "wait_seconds": self.wait.summary(3),
+        }
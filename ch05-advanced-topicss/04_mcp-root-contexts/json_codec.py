@@ -0,0 +1,99 @@
+#
+# 리소스 / 도구 응답과 세션 저장용 JSON 직렬화
+#---------------------------------
+# -- 리소스마다 `json.dumps(..., indent=2, ensure_ascii=False)` 를 쓰면 느리고, 들여쓰기와 공백만으로
+#    응답이 30~50% 커집니다.
+# -- dumps(obj, pretty=False)
+#    - 기본은 공백 없는 compact 출력, 사람이 읽을 때만 pretty=True (2칸 들여쓰기)
+#    - 설치되어 있으면 orjson -> msgspec 순서로 사용하고, 없으면 표준 json
+#      (JSON_BACKEND=orjson|msgspec|json 으로 강제 가능)
+#    - 한글은 그대로 UTF-8 로 (ensure_ascii=False 와 같음)
+#    - datetime / date 는 ISO 8601 문자열, pydantic model 은 model_dump(), 그 밖의 것은 str()
+#    - 빠른 encoder 가 처리하지 못하는 값 (64bit 를 넘는 int 등) 은 표준 json 으로 다시 시도
+# -- loads(text): str / bytes 모두 받음
+import json
+import os
+from datetime import date, datetime
+from typing import Any
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+#---------------------------------
+# 표준 json
+_compact_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_default)
+_pretty_encoder = json.JSONEncoder(ensure_ascii=False, indent=2, default=_default)
+
+def _json_dumps(obj: Any, pretty: bool = False) -> str:
+    return (_pretty_encoder if pretty else _compact_encoder).encode(obj)
+
+def _json_loads(data: str | bytes) -> Any:
+    return json.loads(data)
+
+#---------------------------------
+# orjson / msgspec (선택)
+def _load_orjson():
+    import orjson
+
+    options = orjson.OPT_NON_STR_KEYS
+    pretty_options = options | orjson.OPT_INDENT_2
+
+    def dumps(obj: Any, pretty: bool = False) -> str:
+        try:
+            return orjson.dumps(obj, default=_default, option=pretty_options if pretty else options).decode()
+        except orjson.JSONEncodeError:
+            return _json_dumps(obj, pretty)
+
+    return dumps, orjson.loads
+
+def _load_msgspec():
+    import msgspec
+
+    encoder = msgspec.json.Encoder(enc_hook=_default)
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any, pretty: bool = False) -> str:
+        try:
+            data = encoder.encode(obj)
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            return _json_dumps(obj, pretty)
+        return (msgspec.json.format(data, indent=2) if pretty else data).decode()
+
+    return dumps, decoder.decode
+
+BACKENDS = {
+    "orjson": _load_orjson,
+    "msgspec": _load_msgspec,
+    "json": lambda: (_json_dumps, _json_loads),
+}
+
+def available_backends() -> list[str]:
+    names = []
+    for name, load in BACKENDS.items():
+        try:
+            load()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+def select_backend(name: str | None = None):
+    """(이름, dumps, loads) - name 을 주지 않으면 JSON_BACKEND 또는 설치된 것 중 가장 빠른 것"""
+    name = name or os.environ.get("JSON_BACKEND")
+    if name:
+        if name not in BACKENDS:
+            raise ValueError(f"unknown JSON backend: {name} (one of {', '.join(BACKENDS)})")
+        return (name, *BACKENDS[name]())
+    for name, load in BACKENDS.items():
+        try:
+            return (name, *load())
+        except ImportError:
+            continue
+
+BACKEND, dumps, loads = select_backend()
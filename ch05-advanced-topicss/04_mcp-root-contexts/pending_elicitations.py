@@ -0,0 +1,142 @@
+#
+# Elicitation 시간 제한과 대기 중인 elicitation 관리
+#---------------------------------
+# -- `await ctx.elicit(...)` 에는 시간 제한이 없어서, 응답하지 않는 클라이언트가 있으면 도구 coroutine 과
+#    그 도구가 잡고 있는 자원이 계속 묶여 있습니다.
+# -- PendingElicitations.elicit(ctx, message, schema, timeout=None, fallback=None)
+#    - `timeout` 초 (기본 ELICIT_TIMEOUT 환경 변수, 120초) 안에 응답이 없으면 요청을 기다리지 않고
+#      schema 기본값 + `fallback` 으로 만든 값으로 진행 (필수 필드가 채워지지 않으면 cancel)
+#    - 한도: 전체 `max_pending` 개, 연결당 `max_per_session` 개. 넘으면 묻지 않고 바로 fallback
+#    - 결과가 fallback 이면 FallbackElicitation (action = accept/cancel, reason = timeout/limit)
+#      -> 기존 코드처럼 `result.action == "accept" and result.data` 로 그대로 처리 가능
+#    - 지표: 대기 중인 수 (현재 / 최대), 응답 종류별 횟수, 시간 초과 / 한도 초과 횟수, 응답 대기 시간
+# -- combine_schemas() / split_result(): 여러 단계의 schema 를 한 번에 묻고 (round-trip 1번) 단계별 model 로 나눔
+import asyncio
+import itertools
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from mcp.server.elicitation import ElicitationResult
+from mcp.server.fastmcp import Context
+from pydantic import BaseModel, ValidationError, create_model
+
+from system_metrics import RunningStats
+
+DEFAULT_TIMEOUT = float(os.environ.get("ELICIT_TIMEOUT", 120))
+
+class FallbackElicitation(BaseModel):
+    """클라이언트 응답 없이 정한 결과 (시간 초과 또는 한도 초과)"""
+    action: Literal["accept", "cancel"]
+    data: Any = None
+    reason: Literal["timeout", "limit"]
+
+@dataclass(slots=True)
+class Pending:
+    id: int
+    session: int
+    schema: str
+    message: str
+    started: float
+    timeout: float
+
+    def as_dict(self, now: float) -> dict:
+        return {
+            "id": self.id,
+            "schema": self.schema,
+            "message": self.message,
+            "waiting_seconds": round(now - self.started, 1),
+            "remaining_seconds": round(max(0.0, self.started + self.timeout - now), 1),
+        }
+
+class PendingElicitations:
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_pending: int = 100, max_per_session: int = 4):
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.max_per_session = max_per_session
+        self._pending: dict[int, Pending] = {}
+        self._per_session = Counter()
+        self._ids = itertools.count(1)
+        self.peak = 0
+        self.counters = Counter()
+        self.wait = RunningStats()                      # 클라이언트가 응답한 경우의 대기 시간 (초)
+
+    def _fallback(self, schema: type[BaseModel], fallback: dict | None, reason: str) -> FallbackElicitation:
+        self.counters[reason] += 1
+        try:
+            data = schema.model_validate(fallback or {})
+        except ValidationError:
+            return FallbackElicitation(action="cancel", reason=reason)
+        return FallbackElicitation(action="accept", data=data, reason=reason)
+
+    async def elicit(
+        self,
+        ctx: Context,
+        message: str,
+        schema: type[BaseModel],
+        timeout: float | None = None,
+        fallback: dict[str, Any] | None = None,
+    ) -> ElicitationResult | FallbackElicitation:
+        timeout = self.timeout if timeout is None else timeout
+        session = id(ctx.session)
+        if len(self._pending) >= self.max_pending or self._per_session[session] >= self.max_per_session:
+            await ctx.warning(f"대기 중인 질문이 너무 많아 {schema.__name__} 기본값으로 진행합니다")
+            return self._fallback(schema, fallback, "limit")
+
+        pending = Pending(next(self._ids), session, schema.__name__, message, time.monotonic(), timeout)
+        self._pending[pending.id] = pending
+        self._per_session[session] += 1
+        self.peak = max(self.peak, len(self._pending))
+        self.counters["started"] += 1
+        try:
+            result = await asyncio.wait_for(ctx.elicit(message=message, schema=schema), timeout)
+        except asyncio.TimeoutError:
+            await ctx.warning(f"{timeout:g}초 동안 응답이 없어 {schema.__name__} 기본값으로 진행합니다")
+            return self._fallback(schema, fallback, "timeout")
+        finally:
+            del self._pending[pending.id]
+            self._per_session[session] -= 1
+            if not self._per_session[session]:
+                del self._per_session[session]
+        self.wait.add(time.monotonic() - pending.started)
+        self.counters[result.action] += 1
+        return result
+
+    def pending(self) -> list[dict]:
+        now = time.monotonic()
+        return [pending.as_dict(now) for pending in self._pending.values()]
+
+    def stats(self) -> dict:
+        return {
+            "timeout_seconds": self.timeout,
+            "pending": len(self._pending),
+            "peak_pending": self.peak,
+            "max_pending": self.max_pending,
+            "max_per_session": self.max_per_session,
+            **self.counters,
+            "wait_seconds": self.wait.summary(3),
+        }
+
+#---------------------------------
+# 여러 단계의 질문을 한 번에
+def combine_schemas(name: str, *schemas: type[BaseModel]) -> type[BaseModel]:
+    """schema 들의 필드를 모두 가진 model (필드 이름은 겹치면 안 됨)"""
+    fields = {}
+    for schema in schemas:
+        for field_name, info in schema.model_fields.items():
+            if field_name in fields:
+                raise ValueError(f"field {field_name!r} appears in more than one schema")
+            fields[field_name] = (info.annotation, info)
+    return create_model(name, __doc__=" / ".join(schema.__doc__ or schema.__name__ for schema in schemas), **fields)
+
+def split_result(result, *schemas: type[BaseModel]) -> tuple[BaseModel, ...] | None:
+    """combine_schemas 로 물은 결과를 단계별 model 로 (수락하지 않았으면 None)"""
+    if result.action != "accept" or not result.data:
+        return None
+    values = result.data.model_dump()
+    return tuple(
+        schema.model_validate({name: values[name] for name in schema.model_fields})
+        for schema in schemas
+    )
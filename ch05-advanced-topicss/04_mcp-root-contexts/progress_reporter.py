@@ -0,0 +1,176 @@
+#
+# 진행 알림 / 로그 알림 빈도 제한 (Context wrapper)
+#---------------------------------
+# -- 항목마다 `ctx.report_progress` + `ctx.info`/`ctx.debug` 를 부르면 10만 개 배치는 20만 개 이상의
+#    JSON-RPC 알림이 됩니다. 클라이언트는 그 대부분을 화면에 그리지도 못합니다.
+# -- ProgressReporter
+#    - progress: 초당 최대 `max_rate` 번만 전송. 그 사이의 호출은 마지막 값만 남겨 두었다가(coalesce)
+#      다음 전송 시점에 보냄. 완료(progress >= total) 는 항상 즉시 전송
+#    - log: debug/info 줄은 모아서 한 알림(여러 줄)으로 전송 (`log_batch_size` 줄 또는 `1 / max_rate` 초마다)
+#      warning 이상은 모아 둔 줄을 먼저 보낸 뒤 바로 전송 (순서 유지)
+#    - `async with ProgressReporter(ctx) as reporter:` 블록이 끝나면 남은 것을 모두 전송
+# -- stats() 로 요청된 / 실제 전송된 알림 수를 확인할 수 있습니다.
+# -- SessionNotifier: tool 응답이 끝난 background 작업용 ctx 대용 (ProgressReporter(SessionNotifier(...)))
+import asyncio
+import time
+
+import anyio
+from mcp.server.fastmcp import Context
+from mcp.server.session import ServerSession
+
+BATCHED_LEVELS = ("debug", "info")
+
+class SessionNotifier:
+    """요청이 끝난 뒤에도 ServerSession 으로 진행 상황을 알리는 Context 대용
+
+    원래 요청의 progressToken 은 응답을 보낸 뒤에는 쓸 수 없으므로, 진행률은 로그 알림
+    (notifications/message) 으로 보냅니다. 리소스 변경 알림은 구독한 세션에게만 가도록
+    resource_subscriptions.SubscriptionManager 가 따로 보냅니다.
+    클라이언트 연결이 끊어지면 알림만 멈추고 작업은 계속됩니다.
+    """
+
+    def __init__(self, session: ServerSession, logger: str | None = None):
+        self.session = session
+        self.logger = logger
+        self.connected = True
+
+    async def _send(self, send):
+        if not self.connected:
+            return
+        try:
+            await send()
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            self.connected = False
+
+    async def report_progress(self, progress: float, total: float | None = None, message: str | None = None):
+        percent = f"{progress / total:.0%}" if total else f"{progress:g}"
+        data = f"[{percent}] {message}" if message else f"[{percent}]"
+        await self._send(lambda: self.session.send_log_message(level="info", data=data, logger=self.logger))
+
+    async def log(self, level: str, message: str):
+        await self._send(lambda: self.session.send_log_message(level=level, data=message, logger=self.logger))
+
+class ProgressReporter:
+    """Context 의 progress / log 알림을 coalesce 하는 wrapper"""
+
+    def __init__(self, ctx: Context | SessionNotifier, max_rate: float = 10.0, log_batch_size: int = 50):
+        self.ctx = ctx
+        self.interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.log_batch_size = log_batch_size
+        self._last_progress_at = float("-inf")
+        self._pending_progress = None          # (progress, total, message)
+        self._log_level = None
+        self._log_lines: list[str] = []
+        self._timer: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self.progress_requested = 0
+        self.progress_sent = 0
+        self.logs_requested = 0
+        self.log_notifications_sent = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    #---------------------------------
+    # progress
+    async def progress(self, progress: float, total: float | None = None, message: str | None = None):
+        self.progress_requested += 1
+        now = time.monotonic()
+        final = total is not None and progress >= total
+        async with self._lock:
+            if final or now - self._last_progress_at >= self.interval:
+                self._pending_progress = None
+                await self._send_progress(progress, total, message, now)
+            else:
+                self._pending_progress = (progress, total, message)
+                self._schedule_flush(self._last_progress_at + self.interval - now)
+
+    async def _send_progress(self, progress, total, message, now):
+        # 진행 알림보다 먼저 요청된 로그가 먼저 도착하도록
+        await self._flush_logs()
+        self._last_progress_at = now
+        self.progress_sent += 1
+        await self.ctx.report_progress(progress=progress, total=total, message=message)
+
+    #---------------------------------
+    # logs
+    async def log(self, level: str, message: str):
+        self.logs_requested += 1
+        async with self._lock:
+            if level not in BATCHED_LEVELS:
+                await self._flush_logs()
+                await self._send_log(level, message)
+                return
+            if self._log_lines and self._log_level != level:
+                await self._flush_logs()
+            if not self._log_lines:
+                self._log_level = level
+            self._log_lines.append(message)
+            if len(self._log_lines) >= self.log_batch_size:
+                await self._flush_logs()
+            else:
+                self._schedule_flush(self.interval)
+
+    async def debug(self, message: str):
+        await self.log("debug", message)
+
+    async def info(self, message: str):
+        await self.log("info", message)
+
+    async def warning(self, message: str):
+        await self.log("warning", message)
+
+    async def error(self, message: str):
+        await self.log("error", message)
+
+    async def _flush_logs(self):
+        if not self._log_lines:
+            return
+        lines, self._log_lines = self._log_lines, []
+        await self._send_log(self._log_level, "\n".join(lines))
+
+    async def _send_log(self, level, message):
+        self.log_notifications_sent += 1
+        await self.ctx.log(level, message)
+
+    #---------------------------------
+    def _schedule_flush(self, delay: float):
+        """더 이상 호출이 없어도 보류 중인 progress / log 가 늦게라도 나가도록 예약"""
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later(max(delay, 0.0)))
+
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        async with self._lock:
+            await self._flush_pending()
+
+    async def _flush_pending(self):
+        await self._flush_logs()
+        if self._pending_progress is not None:
+            progress, total, message = self._pending_progress
+            self._pending_progress = None
+            await self._send_progress(progress, total, message, time.monotonic())
+
+    async def flush(self):
+        async with self._lock:
+            await self._flush_pending()
+
+    async def aclose(self):
+        await self.flush()
+        # flush 후에는 보류 중인 것이 없으므로 예약된 timer 는 취소해도 잃는 알림이 없음
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+
+    def stats(self) -> dict:
+        requested = self.progress_requested + self.logs_requested
+        sent = self.progress_sent + self.log_notifications_sent
+        return {
+            "progress_requested": self.progress_requested,
+            "progress_sent": self.progress_sent,
+            "logs_requested": self.logs_requested,
+            "log_notifications_sent": self.log_notifications_sent,
+            "reduction": round(1 - sent / requested, 4) if requested else 0.0,
+        }
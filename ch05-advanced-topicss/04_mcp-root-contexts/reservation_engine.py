@@ -0,0 +1,253 @@
+#
+# 레스토랑 예약 엔진 (book_table 용)
+#---------------------------------
+# -- 기존 book_table 은 `date == "2024-12-25"` 만 예약 불가로 처리하고 테이블 / 좌석 개념이 없었습니다.
+# -- ReservationEngine
+#    - 테이블 목록 (좌석 수) 과 영업 시간, 식사 시간 (`duration` 분) 으로 예약 가능 여부를 판단
+#    - interval index: (테이블, 날짜) 마다 예약을 시작 시각 순으로 정렬한 list
+#      한 테이블의 예약은 겹치지 않으므로 시작 시각이 새 예약의 끝보다 앞인 것 중 마지막 하나만 보면 됨 (bisect, O(log n))
+#    - book(): 인원이 들어가는 가장 작은 빈 테이블에 예약. 확인과 기록을 lock 안에서 한 번에 하므로
+#      동시에 들어온 요청이 같은 자리를 이중 예약하지 않음
+#    - hold: 손님에게 대체 시간을 묻는 동안 그 자리를 잠시 잡아 둠 (`hold_seconds` 뒤 자동으로 풀림)
+#      confirm() 으로 확정, release() 로 해제
+#    - nearest_slot(): 요청 시각에서 가장 가까운 빈 자리 (`step` 분 간격, 앞뒤 `search_days` 일)
+#      가까운 날짜부터 하루씩 테이블별 예약 list 를 한 번 훑어 빈 시각을 구하고, 더 먼 날짜는 건너뜀
+# -- 날짜는 "YYYY-MM-DD", 시각은 "HH:MM" (분 단위 정수로 저장)
+import itertools
+import math
+import threading
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+@dataclass(frozen=True, slots=True)
+class Table:
+    id: str
+    seats: int
+
+@dataclass(slots=True)
+class Reservation:
+    id: str
+    table: Table
+    day: date
+    start: int                                         # 분 (00:00 부터)
+    end: int
+    party_size: int
+    name: str = ""
+    held_until: float | None = None                    # hold 이면 만료 시각 (time.monotonic)
+
+    @property
+    def held(self) -> bool:
+        return self.held_until is not None
+
+    def expired(self, now: float) -> bool:
+        return self.held_until is not None and self.held_until <= now
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "table": self.table.id,
+            "seats": self.table.seats,
+            "date": self.day.isoformat(),
+            "time": format_time(self.start),
+            "until": format_time(self.end),
+            "party_size": self.party_size,
+            "status": "held" if self.held else "confirmed",
+        }
+
+def parse_date(text: str) -> date:
+    return date.fromisoformat(text.strip())
+
+def parse_time(text: str) -> int:
+    hours, minutes = text.strip().split(":")
+    return int(hours) * 60 + int(minutes)
+
+def format_time(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def default_tables() -> list[Table]:
+    # 2인석 4개, 4인석 4개, 6인석 2개, 단체석 (10인) 1개
+    seats = [2] * 4 + [4] * 4 + [6] * 2 + [10]
+    return [Table(f"T{i + 1}", n) for i, n in enumerate(seats)]
+
+class ReservationEngine:
+    def __init__(
+        self,
+        tables: list[Table] | None = None,
+        opening: str = "11:00",
+        closing: str = "23:00",
+        duration: int = 120,
+        step: int = 30,
+        search_days: int = 14,
+    ):
+        # 작은 테이블부터 -> 첫 번째로 맞는 빈 테이블이 가장 알맞은 테이블
+        self.tables = sorted(tables or default_tables(), key=lambda table: (table.seats, table.id))
+        self._seats = [table.seats for table in self.tables]
+        self.opening = parse_time(opening)
+        self.closing = parse_time(closing)
+        self.duration = duration
+        self.step = step
+        self.search_days = search_days
+        self._lock = threading.Lock()
+        self._index: dict[tuple[str, date], list[tuple[int, int, str]]] = {}
+        self._reservations: dict[str, Reservation] = {}
+        self._ids = itertools.count(1)
+        self.counters = {"booked": 0, "rejected": 0, "held": 0, "confirmed": 0, "released": 0, "expired": 0}
+
+    @property
+    def max_party(self) -> int:
+        return self.tables[-1].seats
+
+    def slot_starts(self) -> range:
+        return range(self.opening, self.closing - self.duration + 1, self.step)
+
+    #---------------------------------
+    # interval index (lock 안에서만 호출)
+    def _remove(self, reservation: Reservation):
+        entries = self._index[(reservation.table.id, reservation.day)]
+        entries.pop(bisect_left(entries, (reservation.start, reservation.end, reservation.id)))
+        del self._reservations[reservation.id]
+
+    def _is_free(self, table: Table, day: date, start: int, end: int, now: float) -> bool:
+        entries = self._index.get((table.id, day))
+        while entries:
+            # 시작이 end 보다 앞인 예약 중 마지막 것 (그 앞의 예약들은 이보다 먼저 끝남)
+            i = bisect_left(entries, (end,))
+            if i == 0:
+                return True
+            _, other_end, reservation_id = entries[i - 1]
+            if other_end <= start:
+                return True
+            reservation = self._reservations[reservation_id]
+            if not reservation.expired(now):
+                return False
+            # 만료된 hold 는 지우고 다시 확인
+            self._remove(reservation)
+            self.counters["expired"] += 1
+        return True
+
+    def _free_table(self, day: date, start: int, party_size: int, now: float) -> Table | None:
+        end = start + self.duration
+        # 좌석이 모자란 테이블은 건너뜀
+        for table in self.tables[bisect_left(self._seats, party_size):]:
+            if self._is_free(table, day, start, end, now):
+                return table
+        return None
+
+    def _validate(self, start: int, party_size: int):
+        if party_size < 1:
+            raise ValueError("party_size must be at least 1")
+        if not self.opening <= start <= self.closing - self.duration:
+            raise ValueError(
+                f"reservations start between {format_time(self.opening)} and "
+                f"{format_time(self.closing - self.duration)}"
+            )
+
+    #---------------------------------
+    def book(self, day: date, start: int, party_size: int, name: str = "",
+             hold_seconds: float | None = None) -> Reservation | None:
+        """빈 테이블이 있으면 예약 (hold_seconds 를 주면 그 시간 동안만 잡아 두는 hold), 없으면 None"""
+        self._validate(start, party_size)
+        now = time.monotonic()
+        with self._lock:
+            table = self._free_table(day, start, party_size, now)
+            if table is None:
+                self.counters["rejected"] += 1
+                return None
+            reservation = Reservation(
+                f"R{next(self._ids):06d}", table, day, start, start + self.duration, party_size, name,
+                now + hold_seconds if hold_seconds is not None else None,
+            )
+            insort(self._index.setdefault((table.id, day), []), (reservation.start, reservation.end, reservation.id))
+            self._reservations[reservation.id] = reservation
+            self.counters["held" if reservation.held else "booked"] += 1
+            return reservation
+
+    def confirm(self, reservation_id: str) -> Reservation | None:
+        """hold 를 확정 (만료된 뒤 다른 예약이 그 자리를 가져갔으면 None)"""
+        with self._lock:
+            reservation = self._reservations.get(reservation_id)
+            if reservation is None:
+                return None
+            if reservation.held:
+                reservation.held_until = None
+                self.counters["confirmed"] += 1
+            return reservation
+
+    def release(self, reservation_id: str) -> bool:
+        with self._lock:
+            reservation = self._reservations.get(reservation_id)
+            if reservation is None:
+                return False
+            self._remove(reservation)
+            self.counters["released"] += 1
+            return True
+
+    def _free_starts(self, day: date, party_size: int, now: float) -> set[int]:
+        """그날 인원이 들어가는 빈 테이블이 있는 시작 시각들 (테이블마다 예약 list 를 한 번만 훑음)"""
+        slots = self.slot_starts()
+        free = set()
+        for table in self.tables[bisect_left(self._seats, party_size):]:
+            entries = self._index.get((table.id, day), [])
+            for entry in [entry for entry in entries if self._reservations[entry[2]].expired(now)]:
+                self._remove(self._reservations[entry[2]])
+                self.counters["expired"] += 1
+            j = 0
+            for slot in slots:
+                # slot 전에 끝난 예약은 지나감 (끝 시각도 시작 순서와 같은 순서)
+                while j < len(entries) and entries[j][1] <= slot:
+                    j += 1
+                if j == len(entries) or entries[j][0] >= slot + self.duration:
+                    free.add(slot)
+            if len(free) == len(slots):
+                break
+        return free
+
+    def nearest_slot(self, day: date, start: int, party_size: int) -> tuple[date, int] | None:
+        """요청 시각에서 가장 가까운 빈 자리 (같은 거리면 나중 시각), 요청한 시각 자체는 제외
+
+        가까운 날짜부터 하루씩 빈 시각을 구하고, 남은 날짜들이 지금까지 찾은 자리보다 멀어지면 멈춤
+        """
+        if party_size > self.max_party:
+            return None
+        best = None                                    # (거리, -시각, 날짜, 시작)
+        now = time.monotonic()
+        offsets = sorted(range(-self.search_days, self.search_days + 1), key=lambda offset: (abs(offset), -offset))
+        with self._lock:
+            for offset in offsets:
+                # 다른 날의 자리는 적어도 (|offset| - 1) 일 만큼 떨어져 있음
+                if best is not None and (abs(offset) - 1) * 1440 > best[0]:
+                    break
+                slot_day = day + timedelta(days=offset)
+                for slot in self._free_starts(slot_day, party_size, now):
+                    at = offset * 1440 + slot
+                    if at != start:
+                        best = min(best or (math.inf,), (abs(at - start), -at, slot_day, slot))
+        return (best[2], best[3]) if best is not None else None
+
+    def hold_nearest(self, day: date, start: int, party_size: int, hold_seconds: float,
+                     name: str = "") -> Reservation | None:
+        """가장 가까운 빈 자리를 찾아 hold (찾은 뒤 다른 요청이 먼저 가져가면 다음 자리를 다시 찾음)"""
+        while (slot := self.nearest_slot(day, start, party_size)) is not None:
+            reservation = self.book(*slot, party_size, name, hold_seconds=hold_seconds)
+            if reservation is not None:
+                return reservation
+        return None
+
+    def reservations(self, day: date | None = None) -> list[Reservation]:
+        with self._lock:
+            now = time.monotonic()
+            return sorted(
+                (r for r in self._reservations.values() if (day is None or r.day == day) and not r.expired(now)),
+                key=lambda r: (r.day, r.start, r.table.seats, r.table.id),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tables": len(self.tables),
+                "seats": sum(table.seats for table in self.tables),
+                "reservations": len(self._reservations),
+                **self.counters,
+            }
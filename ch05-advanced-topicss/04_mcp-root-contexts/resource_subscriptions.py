@@ -0,0 +1,154 @@
+#
+# 리소스 구독 (resources/subscribe) 과 resources/updated 알림
+#---------------------------------
+# -- 기존에는 세션이 바뀔 때마다 send_resource_list_changed() 를 보내서, 클라이언트가 목록을 다시 받고
+#    task://session/{id} 를 (모든 로그까지) 통째로 다시 읽어야 했습니다.
+# -- SubscriptionManager
+#    - install(mcp): resources/subscribe, resources/unsubscribe handler 등록 + capability 에 subscribe 표시
+#      (mcp 1.11 의 lowlevel server 는 handler 가 있어도 subscribe=False 로 알리므로 직접 켬)
+#    - notify(uri): 리소스가 바뀌었을 때 호출. 그 uri 를 구독한 세션에만 resources/updated 를 보냄
+#      (리소스의 변경 번호는 리소스 쪽에서 관리 - 예: 세션 레코드의 `version`)
+#    - rate limit: (세션, uri) 마다 `min_interval` 초에 한 번. 그 사이의 변경은 하나로 합쳐서
+#      (coalesce) 간격이 지나면 한 번 보냄 -> 클라이언트는 마지막 상태만 다시 읽으면 됨
+#    - 세션당 구독 수 제한 (`max_per_session`), 연결이 끊긴 세션은 알림 실패 시 정리
+#    - forget(uri): 더 바뀌지 않는 리소스 (끝난 세션) 의 구독자 목록을 지움 (예약된 마지막 알림은 보낸 뒤 정리)
+#      -> 세션이 쌓여도 구독 기록이 늘어나지 않음
+# -- 클라이언트는 알림을 받으면 task://session/{id} (로그 제외) 와
+#    task://session/{id}/logs?after=<마지막 seq> 로 바뀐 부분만 읽습니다.
+import asyncio
+import time
+import weakref
+from collections import Counter
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+from mcp.server.session import ServerSession
+from pydantic import AnyUrl
+
+class _SessionState:
+    __slots__ = ("uris", "last_sent", "pending")
+
+    def __init__(self):
+        self.uris: set[str] = set()
+        self.last_sent: dict[str, float] = {}
+        self.pending: dict[str, asyncio.Task] = {}
+
+class SubscriptionManager:
+    def __init__(self, min_interval: float = 0.5, max_per_session: int = 1000):
+        self.min_interval = min_interval
+        self.max_per_session = max_per_session
+        self._sessions: weakref.WeakKeyDictionary[ServerSession, _SessionState] = weakref.WeakKeyDictionary()
+        self._by_uri: dict[str, weakref.WeakSet[ServerSession]] = {}
+        self.counters = Counter()
+
+    def install(self, mcp: FastMCP):
+        server = mcp._mcp_server
+
+        @server.subscribe_resource()
+        async def on_subscribe(uri: AnyUrl):
+            self.subscribe(server.request_context.session, str(uri))
+
+        @server.unsubscribe_resource()
+        async def on_unsubscribe(uri: AnyUrl):
+            self.unsubscribe(server.request_context.session, str(uri))
+
+        get_capabilities = server.get_capabilities
+
+        def get_capabilities_with_subscribe(*args, **kwargs):
+            capabilities = get_capabilities(*args, **kwargs)
+            if capabilities.resources is not None:
+                capabilities.resources.subscribe = True
+            return capabilities
+
+        server.get_capabilities = get_capabilities_with_subscribe
+
+    #---------------------------------
+    def subscribe(self, session: ServerSession, uri: str):
+        state = self._sessions.setdefault(session, _SessionState())
+        if uri not in state.uris and len(state.uris) >= self.max_per_session:
+            raise ValueError(f"too many subscriptions (max {self.max_per_session})")
+        state.uris.add(uri)
+        self._by_uri.setdefault(uri, weakref.WeakSet()).add(session)
+        self.counters["subscribed"] += 1
+
+    def unsubscribe(self, session: ServerSession, uri: str):
+        state = self._sessions.get(session)
+        if state is None:
+            return
+        self._discard(state, uri)
+        if (task := state.pending.pop(uri, None)) is not None:
+            task.cancel()
+        subscribers = self._by_uri.get(uri)
+        if subscribers is not None:
+            subscribers.discard(session)
+            if not subscribers:
+                del self._by_uri[uri]
+        self.counters["unsubscribed"] += 1
+
+    @staticmethod
+    def _discard(state: _SessionState, uri: str):
+        state.uris.discard(uri)
+        state.last_sent.pop(uri, None)
+
+    def forget(self, uri: str):
+        """더 바뀌지 않는 리소스의 구독 기록을 지움 (이미 예약된 알림은 보낸 뒤 정리)"""
+        for session in list(self._by_uri.pop(uri, ())):
+            state = self._sessions.get(session)
+            if state is not None and uri not in state.pending:
+                self._discard(state, uri)
+        self.counters["forgotten"] += 1
+
+    def _drop(self, session: ServerSession):
+        """연결이 끊긴 세션의 구독을 모두 정리"""
+        state = self._sessions.get(session)
+        if state is None:
+            return
+        for uri in list(state.uris):
+            self.unsubscribe(session, uri)
+        self._sessions.pop(session, None)
+        self.counters["dropped_sessions"] += 1
+
+    #---------------------------------
+    async def notify(self, *uris: str):
+        for uri in uris:
+            for session in list(self._by_uri.get(uri, ())):
+                await self._send_or_defer(session, uri)
+
+    async def _send_or_defer(self, session: ServerSession, uri: str):
+        state = self._sessions.get(session)
+        if state is None:
+            return
+        if uri in state.pending:
+            # 이미 예약된 알림이 이번 변경까지 알려 줌
+            self.counters["coalesced"] += 1
+            return
+        wait = state.last_sent.get(uri, float("-inf")) + self.min_interval - time.monotonic()
+        if wait <= 0:
+            await self._send(session, state, uri)
+        else:
+            state.pending[uri] = asyncio.create_task(self._send_later(session, state, uri, wait))
+
+    async def _send_later(self, session, state, uri, wait):
+        await asyncio.sleep(wait)
+        state.pending.pop(uri, None)
+        if uri in state.uris:
+            await self._send(session, state, uri)
+        if session not in self._by_uri.get(uri, ()):
+            # 기다리는 동안 forget() 된 uri
+            self._discard(state, uri)
+
+    async def _send(self, session, state, uri):
+        try:
+            await session.send_resource_updated(AnyUrl(uri))
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            self._drop(session)
+            return
+        state.last_sent[uri] = time.monotonic()
+        self.counters["sent"] += 1
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "resources": len(self._by_uri),
+            **self.counters,
+        }
@@ -0,0 +1,446 @@
+#
+# 작업 세션 저장소 (task_sessions dict 대체)
+#---------------------------------
+# -- 기존 `task_sessions` dict 는 서버를 재시작하면 모두 사라지고, 단계마다 `logs` 리스트가 끝없이 늘어납니다.
+# -- SessionStore 인터페이스 (create / get / update / append_log / logs / list_by_status / list_all / count)
+#    - MemorySessionStore: 프로세스 메모리 (테스트 / 재시작 보존이 필요 없을 때)
+#    - SqliteSessionStore: SQLite (WAL) 파일
+#      - 쓰기 batching: create/update/append_log 는 메모리 버퍼에 모았다가 `flush_interval` 초마다
+#        (또는 `batch_size` 개가 쌓이면) 한 transaction 으로 기록. 같은 세션의 update 는 하나로 합쳐짐
+#      - hot tier: 최근에 읽고 쓴 세션 `cache_size` 개를 LRU 로 메모리에 보관
+#      - 단계 로그: append-only 테이블. 세션이 끝나거나 `compact_after` 줄이 쌓이면 zlib 으로 압축한
+#        segment 한 줄로 합치고 원본 줄을 지움 (로그 내용은 바뀌지 않음)
+#        로그마다 세션 안의 순번 `seq` 를 붙이고 (세션의 `log_seq` = 마지막 순번),
+#        logs(after=seq) 는 최신 segment 부터 필요한 것만 풀어서 그 뒤의 로그만 돌려줌
+#      - `tasks://active` 는 (status, id) index 로 조회 (전체 scan 없음). ID 가 ULID(task_ids) 라서
+#        id 순서 = 생성 순서이고, `after` (마지막으로 받은 id) 부터 이어 읽는 keyset pagination
+#      - 상태별 세션 수는 메모리 카운터로 유지 (열 때 한 번만 GROUP BY)
+# -- mark_interrupted(statuses): 재시작 후 `statuses` (예: initialized / queued / running) 로 남은 세션을 failed 로 정리
+# -- open_store(): TASK_STORE 환경 변수로 선택 ("memory" 또는 SQLite 파일 경로, 기본 task_sessions.db)
+# -- LazyStore(opener): 처음 사용할 때 opener() 로 저장소를 여는 proxy
+#    batch_engine 의 spawn process pool 은 자식마다 서버 모듈을 다시 import 하므로, 모듈에서 저장소를 바로 열면
+#    자식 프로세스도 SQLite 파일을 열고 flush thread 를 띄움 (시작 시 정리 작업도 다시 실행됨)
+import atexit
+import os
+import sqlite3
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from bisect import bisect_right, insort
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Iterable
+
+import json_codec
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+class SessionStore(ABC):
+    """작업 세션 저장소 인터페이스
+
+    get / list_* 가 돌려주는 dict 는 복사본입니다. 값을 바꿀 때는 update() 를 사용합니다.
+    """
+
+    @abstractmethod
+    def create(self, session: dict[str, Any]) -> dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def get(self, session_id: str) -> dict[str, Any] | None:
+        ...
+
+    @abstractmethod
+    def update(self, session_id: str, **fields) -> dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def append_log(self, session_id: str, entry: dict[str, Any]) -> int:
+        """로그를 추가하고 붙은 순번(seq, 1 부터)을 돌려줌"""
+        ...
+
+    @abstractmethod
+    def logs(self, session_id: str, after: int = 0, limit: int | None = None) -> list[dict[str, Any]]:
+        """seq 가 `after` 보다 큰 로그를 오래된 것부터 최대 `limit` 개"""
+        ...
+
+    @abstractmethod
+    def list_by_status(self, statuses: Iterable[str], limit: int | None = None,
+                       after: str | None = None) -> list[dict[str, Any]]:
+        """id(생성) 순서로 `after` 다음 세션부터 최대 `limit` 개"""
+        ...
+
+    @abstractmethod
+    def count_by_status(self, statuses: Iterable[str]) -> int:
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        """저장된 세션 수 (전체 scan 없음)"""
+        ...
+
+    @abstractmethod
+    def list_all(self, limit: int | None = None, after: str | None = None) -> list[dict[str, Any]]:
+        ...
+
+    def mark_interrupted(self, statuses: Iterable[str], **fields) -> list[str]:
+        """지난 실행에서 끝나지 못한 (`statuses` 상태로 남은) 세션을 `fields` 로 갱신하고 그 id 목록을 돌려줌
+
+        저장소를 다시 연 직후 한 번 호출합니다. 그 세션들을 실행하던 scheduler job 은 이미 사라졌습니다.
+        세션에 `version` (변경 번호) 이 있으면 1 올립니다 (재시작 전에 읽은 상태보다 새 상태가 되도록).
+        """
+        statuses = list(statuses)
+        ids, after = [], None
+        while page := self.list_by_status(statuses, limit=1000, after=after):
+            for session in page:
+                if "version" in session:
+                    self.update(session["id"], version=session["version"] + 1, **fields)
+                else:
+                    self.update(session["id"], **fields)
+                ids.append(session["id"])
+            after = page[-1]["id"]
+        return ids
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+#---------------------------------
+class MemorySessionStore(SessionStore):
+    def __init__(self):
+        self._sessions: dict[str, dict[str, Any]] = {}
+        self._logs: dict[str, list[dict[str, Any]]] = {}
+        self._ids: list[str] = []                            # 정렬된 전체 id 목록
+        self._by_status: dict[str, list[str]] = {}           # status -> 정렬된 id 목록
+
+    def _index(self, session_id, old_status, new_status):
+        if old_status == new_status:
+            return
+        if old_status is not None:
+            ids = self._by_status[old_status]
+            del ids[bisect_right(ids, session_id) - 1]
+        insort(self._by_status.setdefault(new_status, []), session_id)
+
+    @staticmethod
+    def _page(ids, limit, after):
+        start = bisect_right(ids, after) if after else 0
+        return ids[start:start + limit] if limit is not None else ids[start:]
+
+    def create(self, session):
+        session = dict(session)
+        old = self._sessions.get(session["id"])
+        if old is None:
+            insort(self._ids, session["id"])
+        self._sessions[session["id"]] = session
+        self._index(session["id"], old and old["status"], session["status"])
+        return dict(session)
+
+    def get(self, session_id):
+        session = self._sessions.get(session_id)
+        return dict(session) if session is not None else None
+
+    def update(self, session_id, **fields):
+        session = self._sessions[session_id]
+        self._index(session_id, session["status"], fields.get("status", session["status"]))
+        session.update(fields)
+        return dict(session)
+
+    def append_log(self, session_id, entry):
+        logs = self._logs.setdefault(session_id, [])
+        seq = len(logs) + 1
+        logs.append({"seq": seq, **entry})
+        self._sessions[session_id]["log_seq"] = seq
+        return seq
+
+    def logs(self, session_id, after=0, limit=None):
+        logs = self._logs.get(session_id, [])
+        return logs[after:after + limit] if limit is not None else logs[after:]
+
+    def list_by_status(self, statuses, limit=None, after=None):
+        ids = sorted(
+            session_id for status in statuses
+            for session_id in self._page(self._by_status.get(status, []), limit, after)
+        )
+        return [dict(self._sessions[session_id]) for session_id in ids[:limit]]
+
+    def count_by_status(self, statuses):
+        return sum(len(self._by_status.get(status, [])) for status in statuses)
+
+    def count(self):
+        return len(self._sessions)
+
+    def list_all(self, limit=None, after=None):
+        ids = self._page(self._ids, limit, after)
+        return [dict(self._sessions[session_id]) for session_id in ids]
+
+#---------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id          TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,
+    created_at  TEXT NOT NULL,
+    data        TEXT NOT NULL
+);
+DROP INDEX IF EXISTS idx_sessions_status;
+CREATE INDEX IF NOT EXISTS idx_sessions_status_id ON sessions (status, id);
+CREATE TABLE IF NOT EXISTS session_logs (
+    id          INTEGER PRIMARY KEY,
+    session_id  TEXT NOT NULL,
+    entry       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_session_logs_session ON session_logs (session_id, id);
+CREATE TABLE IF NOT EXISTS session_log_segments (
+    session_id  TEXT NOT NULL,
+    last_log_id INTEGER NOT NULL,
+    entries     INTEGER NOT NULL,
+    payload     BLOB NOT NULL,
+    PRIMARY KEY (session_id, last_log_id)
+);
+"""
+
+class SqliteSessionStore(SessionStore):
+    def __init__(self, path: str | os.PathLike, cache_size: int = 256, flush_interval: float = 0.2,
+                 batch_size: int = 500, compact_after: int = 100):
+        self.path = str(path)
+        self.cache_size = cache_size
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.compact_after = compact_after
+        # 모든 접근은 self._lock 아래에서 하므로 connection 하나를 스레드 간에 공유
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()   # hot tier (LRU)
+        self._dirty: dict[str, dict[str, Any]] = {}                     # 아직 기록 안 된 세션
+        self._pending_logs: list[tuple[str, str]] = []                   # 아직 기록 안 된 로그
+        self._raw_logs: dict[str, int] = {}                              # 세션별 압축 안 된 로그 줄 수
+        self._status_counts = Counter(dict(self._conn.execute("SELECT status, COUNT(*) FROM sessions GROUP BY status")))
+        self.flushes = 0
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="session-store-flush", daemon=True)
+        self._flusher.start()
+
+    #---------------------------------
+    # hot tier
+    def _remember(self, session):
+        self._cache[session["id"]] = session
+        self._cache.move_to_end(session["id"])
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _load(self, session_id):
+        session = self._cache.get(session_id)
+        if session is not None:
+            self._cache.move_to_end(session_id)
+            return session
+        session = self._dirty.get(session_id)
+        if session is None:
+            row = self._conn.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            session = json_codec.loads(row[0])
+        self._remember(session)
+        return session
+
+    #---------------------------------
+    def create(self, session):
+        session = dict(session)
+        with self._lock:
+            old = self._load(session["id"])
+            if old is not None:
+                self._status_counts[old["status"]] -= 1
+            self._status_counts[session["status"]] += 1
+            self._remember(session)
+            self._dirty[session["id"]] = session
+            self._maybe_flush()
+        return dict(session)
+
+    def get(self, session_id):
+        with self._lock:
+            session = self._load(session_id)
+            return dict(session) if session is not None else None
+
+    def update(self, session_id, **fields):
+        with self._lock:
+            session = self._load(session_id)
+            if session is None:
+                raise KeyError(session_id)
+            if "status" in fields:
+                self._status_counts[session["status"]] -= 1
+                self._status_counts[fields["status"]] += 1
+            session.update(fields)
+            self._dirty[session_id] = session
+            self._maybe_flush()
+            return dict(session)
+
+    def append_log(self, session_id, entry):
+        with self._lock:
+            session = self._load(session_id)
+            if session is None:
+                raise KeyError(session_id)
+            seq = session["log_seq"] = session.get("log_seq", 0) + 1
+            self._dirty[session_id] = session
+            self._pending_logs.append((session_id, json_codec.dumps({"seq": seq, **entry})))
+            self._maybe_flush()
+            return seq
+
+    def logs(self, session_id, after=0, limit=None):
+        with self._lock:
+            self._flush()
+            entries = [
+                json_codec.loads(entry) for (entry,) in self._conn.execute(
+                    "SELECT entry FROM session_logs WHERE session_id = ? ORDER BY id", (session_id,)
+                )
+            ]
+            # 최신 segment 부터 풀다가 `after` 이전 로그만 남은 segment 에서 멈춤
+            for (payload,) in self._conn.execute(
+                "SELECT payload FROM session_log_segments WHERE session_id = ? ORDER BY last_log_id DESC", (session_id,)
+            ):
+                segment = json_codec.loads(zlib.decompress(payload))
+                entries[:0] = segment
+                if after and segment and segment[0].get("seq", 0) <= after:
+                    break
+        if after:
+            entries = [entry for entry in entries if entry.get("seq", 0) > after]
+        return entries[:limit] if limit is not None else entries
+
+    def list_by_status(self, statuses, limit=None, after=None):
+        rows = []
+        with self._lock:
+            self._flush()
+            # 상태마다 (status, id) index 를 range scan 한 뒤 합침 (IN (...) + ORDER BY 는 정렬이 필요)
+            for status in statuses:
+                rows += self._conn.execute(
+                    "SELECT id, data FROM sessions WHERE status = ? AND id > ? ORDER BY id LIMIT ?",
+                    (status, after or "", -1 if limit is None else limit),
+                ).fetchall()
+        rows.sort()
+        return [json_codec.loads(data) for _, data in rows[:limit]]
+
+    def count_by_status(self, statuses):
+        with self._lock:
+            return sum(self._status_counts[status] for status in statuses)
+
+    def count(self):
+        with self._lock:
+            return sum(self._status_counts.values())
+
+    def list_all(self, limit=None, after=None):
+        with self._lock:
+            self._flush()
+            rows = self._conn.execute(
+                "SELECT data FROM sessions WHERE id > ? ORDER BY id LIMIT ?",
+                (after or "", -1 if limit is None else limit),
+            ).fetchall()
+        return [json_codec.loads(data) for (data,) in rows]
+
+    def __contains__(self, session_id):
+        with self._lock:
+            return self._load(session_id) is not None
+
+    #---------------------------------
+    # write batching
+    def _maybe_flush(self):
+        if len(self._dirty) + len(self._pending_logs) >= self.batch_size:
+            self._flush()
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._dirty and not self._pending_logs:
+            return
+        dirty, self._dirty = self._dirty, {}
+        logs, self._pending_logs = self._pending_logs, []
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "INSERT INTO sessions (id, status, created_at, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET status = excluded.status, data = excluded.data",
+                [(s["id"], s["status"], s["created_at"], json_codec.dumps(s)) for s in dirty.values()],
+            )
+            self._conn.executemany("INSERT INTO session_logs (session_id, entry) VALUES (?, ?)", logs)
+            for session_id, _ in logs:
+                self._raw_logs[session_id] = self._raw_logs.get(session_id, 0) + 1
+            for session_id in {session_id for session_id, _ in logs} | dirty.keys():
+                finished = session_id in dirty and dirty[session_id]["status"] in FINISHED_STATUSES
+                if finished or self._raw_logs.get(session_id, 0) >= self.compact_after:
+                    self._compact(session_id)
+                if finished:
+                    self._raw_logs.pop(session_id, None)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            # 다음 flush 에서 다시 시도하도록 되돌려 놓음 (그 사이에 들어온 것이 더 최신)
+            self._dirty = {**dirty, **self._dirty}
+            self._pending_logs = logs + self._pending_logs
+            raise
+        self.flushes += 1
+
+    def _compact(self, session_id):
+        """압축 안 된 로그 줄들을 segment 한 줄로 합침"""
+        rows = self._conn.execute(
+            "SELECT id, entry FROM session_logs WHERE session_id = ? ORDER BY id", (session_id,)
+        ).fetchall()
+        self._raw_logs[session_id] = 0
+        if not rows:
+            return
+        payload = zlib.compress(("[" + ",".join(entry for _, entry in rows) + "]").encode("utf-8"))
+        self._conn.execute(
+            "INSERT INTO session_log_segments (session_id, last_log_id, entries, payload) VALUES (?, ?, ?, ?)",
+            (session_id, rows[-1][0], len(rows), payload),
+        )
+        self._conn.execute("DELETE FROM session_logs WHERE session_id = ? AND id <= ?", (session_id, rows[-1][0]))
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._flusher.join()
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+#---------------------------------
+def open_store(default_path: str | os.PathLike | None = None) -> SessionStore:
+    """TASK_STORE 환경 변수에 따라 저장소 생성 ("memory" 또는 SQLite 파일 경로)"""
+    target = os.environ.get("TASK_STORE") or default_path or "task_sessions.db"
+    if target == "memory":
+        return MemorySessionStore()
+    Path(target).parent.mkdir(parents=True, exist_ok=True)
+    store = SqliteSessionStore(target)
+    atexit.register(store.close)
+    return store
+
+class LazyStore:
+    """처음 사용할 때 opener() 로 저장소를 여는 proxy (SessionStore 와 같은 method 사용)"""
+
+    def __init__(self, opener):
+        self._opener = opener
+        self._store: SessionStore | None = None
+        self._lock = threading.Lock()
+
+    def _get(self) -> SessionStore:
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = self._opener()
+        return self._store
+
+    def __getattr__(self, name: str):
+        return getattr(self._get(), name)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._get()
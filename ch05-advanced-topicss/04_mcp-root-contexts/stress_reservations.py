@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+예약 엔진 동시성 테스트
+- thread N 개가 같은 며칠에 무작위로 예약 / hold / 확정 / 해제를 동시에 실행한 뒤
+  (테이블, 날짜) 마다 예약 시간이 겹치지 않는지, 좌석 수를 넘는 예약이 없는지 확인
+- elicitation-server 의 book_table 을 같은 시각에 동시에 호출해서 테이블 수만큼만 예약되는지 확인
+- 가장 가까운 빈 자리 검색 시간 측정
+"""
+import argparse
+import asyncio
+import importlib.util
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+from reservation_engine import ReservationEngine, parse_time
+
+def check_invariants(engine: ReservationEngine) -> int:
+    """겹치는 예약 / 좌석보다 많은 인원이 있으면 AssertionError, 확인한 예약 수를 반환"""
+    by_table = defaultdict(list)
+    for reservation in engine.reservations():
+        assert reservation.party_size <= reservation.table.seats, reservation
+        by_table[(reservation.table.id, reservation.day)].append(reservation)
+    for reservations in by_table.values():
+        reservations.sort(key=lambda r: r.start)
+        for before, after in zip(reservations, reservations[1:]):
+            assert before.end <= after.start, f"double booking: {before} / {after}"
+    return sum(len(reservations) for reservations in by_table.values())
+
+def stress_threads(threads: int, operations: int, days: int):
+    engine = ReservationEngine()
+    first_day = date(2025, 1, 6)
+    slots = list(engine.slot_starts())
+    barrier = threading.Barrier(threads)
+    outcomes = defaultdict(int)
+    lock = threading.Lock()
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        local = defaultdict(int)
+        barrier.wait()                                  # 모든 thread 가 동시에 시작
+        for _ in range(operations):
+            day = first_day + timedelta(days=rng.randrange(days))
+            party_size = rng.randint(1, 8)
+            if rng.random() < 0.2:
+                hold = engine.hold_nearest(day, rng.choice(slots), party_size, hold_seconds=rng.choice([0, 5]))
+                if hold is None:
+                    local["no_alternative"] += 1
+                elif rng.random() < 0.5:
+                    local["confirmed" if engine.confirm(hold.id) else "hold_lost"] += 1
+                else:
+                    engine.release(hold.id)
+                    local["released"] += 1
+            else:
+                local["booked" if engine.book(day, rng.choice(slots), party_size) else "full"] += 1
+        with lock:
+            for key, value in local.items():
+                outcomes[key] += value
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - started
+    checked = check_invariants(engine)
+    total = threads * operations
+    print(f"threads: {threads} x {operations} operations in {elapsed:.2f}s ({total / elapsed:,.0f} ops/s)")
+    print(f"  outcomes: {dict(outcomes)}")
+    print(f"  {checked} reservations checked - no overlaps, no over-capacity tables")
+    return engine
+
+def bench_nearest(engine: ReservationEngine, repeat: int = 200):
+    rng = random.Random(0)
+    samples = []
+    for _ in range(repeat):
+        day = date(2025, 1, 6) + timedelta(days=rng.randrange(7))
+        started = time.perf_counter()
+        engine.nearest_slot(day, parse_time("19:00"), rng.randint(1, 8))
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"nearest_slot: median {statistics.median(samples):.3f} ms, max {max(samples):.3f} ms")
+
+async def stress_tool(calls: int):
+    """같은 시각에 book_table 을 동시에 호출 -> 테이블 수만큼만 성공해야 함"""
+    from mcp import types
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    spec = importlib.util.spec_from_file_location("elicitation_server", Path(__file__).parent / "elicitation-server.py")
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+
+    async def decline_alternative(context, params):
+        return types.ElicitResult(action="accept", content={"checkAlternative": False})
+
+    async with create_connected_server_and_client_session(
+        server.mcp._mcp_server, elicitation_callback=decline_alternative
+    ) as session:
+        results = await asyncio.gather(*(
+            session.call_tool("book_table", {"date": "2025-01-10", "time": "19:00", "party_size": 2})
+            for _ in range(calls)
+        ))
+    booked = sum(result.content[0].text.startswith("✅") for result in results)
+    tables = len(server.reservations.tables)
+    check_invariants(server.reservations)
+    assert booked == tables, f"{booked} bookings for {tables} tables"
+    print(f"book_table x {calls} concurrent calls for the same slot: {booked} booked ({tables} tables), "
+          f"{calls - booked} offered an alternative")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--calls", type=int, default=100)
+    args = parser.parse_args()
+    engine = stress_threads(args.threads, args.operations, args.days)
+    bench_nearest(engine)
+    asyncio.run(stress_tool(args.calls))
+
+#--실행 방법
+# > uv run python stress_reservations.py --threads 32 --operations 2000
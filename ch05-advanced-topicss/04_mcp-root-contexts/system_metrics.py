@@ -0,0 +1,297 @@
+#
+# 실제 시스템 지표 수집기 (monitor_system / monitor_metrics 용)
+#---------------------------------
+# -- 기존 도구는 `20 + (i * 2) % 30` 같은 가짜 숫자를 만들었습니다.
+# -- MetricsSampler
+#    - `interval` 초마다 /proc/stat, /proc/meminfo, /proc/diskstats 를 한 번씩 읽음
+#      cpu: 직전 sample 대비 non-idle 시간 비율, memory: 1 - MemAvailable / MemTotal,
+#      disk: 가장 바쁜 디스크의 busy 비율 (io_ticks), disk_read / disk_write: KiB/s
+#    - 결과는 필드별 array('d') ring buffer 에 저장 (최근 `capacity` 개)
+#    - 여러 도구 호출이 동시에 subscribe() 해도 sampler 는 하나만 돌고, 구독자가 없으면 멈춤
+#    - `sinks` 에 등록한 함수는 sample 마다 한 번 호출됨 (timeseries.TimeSeriesStore.add 등)
+#    - /proc 이 없는 OS (macOS, Windows) 에서는 예전처럼 계산된 값을 돌려줌 (source = "simulated")
+# -- RunningStats: sample 마다 O(1) 로 갱신되는 avg / min / max / p50 / p95 (P² 알고리즘)
+import asyncio
+import math
+import os
+import time
+from array import array
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+FIELDS = ("cpu", "memory", "disk", "disk_read", "disk_write")
+SECTOR_BYTES = 512
+
+@dataclass(slots=True)
+class Sample:
+    seq: int
+    timestamp: float
+    cpu: float
+    memory: float
+    disk: float
+    disk_read: float
+    disk_write: float
+    source: str
+
+    def as_dict(self) -> dict:
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.timestamp)),
+            "cpu": round(self.cpu, 1),
+            "memory": round(self.memory, 1),
+            "disk": round(self.disk, 1),
+            "disk_read_kib_s": round(self.disk_read, 1),
+            "disk_write_kib_s": round(self.disk_write, 1),
+        }
+
+#---------------------------------
+# /proc 읽기
+def read_cpu_times() -> tuple[int, int]:
+    """(idle, total) jiffies - /proc/stat 의 첫 줄 (전체 CPU 합계)"""
+    with open("/proc/stat", "rb") as f:
+        values = [int(v) for v in f.readline().split()[1:]]
+    idle = values[3] + (values[4] if len(values) > 4 else 0)       # idle + iowait
+    # guest / guest_nice 는 user / nice 에 이미 포함되어 있음
+    return idle, sum(values[:8])
+
+def read_memory_percent() -> float:
+    info = {}
+    with open("/proc/meminfo", "rb") as f:
+        for line in f:
+            key, value = line.split(b":", 1)
+            if key in (b"MemTotal", b"MemAvailable"):
+                info[key] = int(value.split()[0])
+                if len(info) == 2:
+                    break
+    return 100.0 * (1 - info[b"MemAvailable"] / info[b"MemTotal"])
+
+def _physical_disks() -> set[str]:
+    # 파티션은 /sys/block 에 없음. loop / ram / zram 같은 가상 장치는 제외
+    return {
+        path.name for path in Path("/sys/block").iterdir()
+        if not path.name.startswith(("loop", "ram", "zram", "dm-"))
+    }
+
+def read_disk_counters(disks: set[str]) -> dict[str, tuple[int, int, int]]:
+    """장치별 (읽은 sector, 쓴 sector, io_ticks ms)"""
+    counters = {}
+    with open("/proc/diskstats", "rb") as f:
+        for line in f:
+            fields = line.split()
+            name = fields[2].decode()
+            if name in disks:
+                counters[name] = (int(fields[5]), int(fields[9]), int(fields[12]))
+    return counters
+
+class ProcSource:
+    """/proc 에서 읽은 누적 값의 차이로 sample 계산"""
+    name = "proc"
+
+    def __init__(self):
+        self.disks = _physical_disks()
+        self._prev = self._read()
+
+    def _read(self):
+        return time.monotonic(), read_cpu_times(), read_disk_counters(self.disks)
+
+    def sample(self) -> tuple[float, ...]:
+        now, (idle, total), disks = current = self._read()
+        prev_at, (prev_idle, prev_total), prev_disks = self._prev
+        self._prev = current
+        elapsed = max(now - prev_at, 1e-6)
+        d_total = total - prev_total
+        cpu = 100.0 * (1 - (idle - prev_idle) / d_total) if d_total > 0 else 0.0
+        read = write = busy = 0.0
+        for name, (sectors_read, sectors_written, io_ticks) in disks.items():
+            if name not in prev_disks:
+                continue
+            prev_read, prev_written, prev_ticks = prev_disks[name]
+            read += (sectors_read - prev_read) * SECTOR_BYTES / 1024 / elapsed
+            write += (sectors_written - prev_written) * SECTOR_BYTES / 1024 / elapsed
+            busy = max(busy, min(100.0, (io_ticks - prev_ticks) / (elapsed * 1000) * 100))
+        return cpu, read_memory_percent(), busy, read, write
+
+class SimulatedSource:
+    """/proc 이 없을 때 쓰는 예전 방식의 계산 값"""
+    name = "simulated"
+
+    def __init__(self):
+        self.i = 0
+
+    def sample(self) -> tuple[float, ...]:
+        i, self.i = self.i, self.i + 1
+        return 20 + (i * 2) % 30, 40 + (i * 3) % 20, 60 + (i % 10), 0.0, 0.0
+
+def default_source():
+    if os.path.exists("/proc/stat") and os.path.isdir("/sys/block"):
+        return ProcSource()
+    return SimulatedSource()
+
+#---------------------------------
+class MetricRing:
+    """필드별 array('d') ring buffer"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.columns = {name: array("d", bytes(8 * capacity)) for name in FIELDS}
+        self.seq = 0                                  # 마지막으로 기록한 sample 번호 (1 부터)
+
+    def append(self, timestamp: float, values: tuple[float, ...]):
+        self.seq += 1
+        slot = self.seq % self.capacity
+        self.timestamps[slot] = timestamp
+        for name, value in zip(FIELDS, values):
+            self.columns[name][slot] = value
+
+    @property
+    def oldest(self) -> int:
+        return max(1, self.seq - self.capacity + 1)
+
+    def get(self, seq: int, source: str) -> Sample:
+        slot = seq % self.capacity
+        return Sample(seq, self.timestamps[slot], *(self.columns[name][slot] for name in FIELDS), source)
+
+class Subscription:
+    def __init__(self, sampler: "MetricsSampler"):
+        self.sampler = sampler
+        self.last_seq = sampler.ring.seq
+
+    async def next(self) -> Sample:
+        """다음 sample (늦게 읽어서 ring buffer 에서 밀려났으면 남아 있는 가장 오래된 것부터)"""
+        sampler = self.sampler
+        while sampler.ring.seq <= self.last_seq:
+            await sampler._tick.wait()
+        self.last_seq = max(self.last_seq + 1, sampler.ring.oldest)
+        return sampler.ring.get(self.last_seq, sampler.source.name)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Sample:
+        return await self.next()
+
+class MetricsSampler:
+    """구독자가 있는 동안만 도는 공유 sampler"""
+
+    def __init__(self, interval: float = 1.0, capacity: int = 3600, source=None):
+        self.interval = interval
+        self.ring = MetricRing(capacity)
+        self.source = source
+        self.subscribers = 0
+        self.sinks: list = []                         # sink(timestamp, {field: value})
+        self._task: asyncio.Task | None = None
+        self._tick = asyncio.Event()
+
+    @asynccontextmanager
+    async def subscribe(self):
+        if self._task is None or self._task.done():
+            if self.source is None:
+                self.source = default_source()
+            self._tick = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        self.subscribers += 1
+        try:
+            yield Subscription(self)
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+    async def _run(self):
+        # 시작 시각 기준의 일정한 간격으로 (처리 시간만큼 밀리지 않도록)
+        started = time.monotonic()
+        ticks = 0
+        self.source.sample()                          # 기준값 (첫 차이 계산용)
+        while True:
+            ticks += 1
+            await asyncio.sleep(max(0.0, started + ticks * self.interval - time.monotonic()))
+            timestamp, values = time.time(), self.source.sample()
+            self.ring.append(timestamp, values)
+            for sink in self.sinks:
+                sink(timestamp, dict(zip(FIELDS, values)))
+            # 기다리던 구독자를 모두 깨우고 다음 sample 용 event 로 교체
+            tick, self._tick = self._tick, asyncio.Event()
+            tick.set()
+
+#---------------------------------
+# incremental 통계
+class P2Quantile:
+    """P² 알고리즘 (Jain & Chlamtac, 1985): marker 5개로 quantile 을 추정, sample 당 O(1)"""
+
+    def __init__(self, p: float):
+        self.p = p
+        self.q: list[float] = []                      # marker 높이
+        self.n = [0, 1, 2, 3, 4]                      # marker 위치
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.increment = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x: float):
+        q, n = self.q, self.n
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+        if x < q[0]:
+            q[0], k = x, 0
+        elif x >= q[4]:
+            q[4], k = x, 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increment[i]
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                estimate = self._parabolic(i, d)
+                if not q[i - 1] < estimate < q[i + 1]:
+                    estimate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = estimate
+                n[i] += d
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self.q, self.n
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float | None:
+        if not self.q:
+            return None
+        if len(self.q) < 5:
+            return self.q[round(self.p * (len(self.q) - 1))]
+        return self.q[2]
+
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.p50 = P2Quantile(0.5)
+        self.p95 = P2Quantile(0.95)
+
+    def add(self, x: float):
+        self.count += 1
+        self.mean += (x - self.mean) / self.count
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        self.p50.add(x)
+        self.p95.add(x)
+
+    def summary(self, digits: int = 2) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "avg": round(self.mean, digits),
+            "min": round(self.min, digits),
+            "max": round(self.max, digits),
+            "p50": round(self.p50.value(), digits),
+            "p95": round(self.p95.value(), digits),
+        }
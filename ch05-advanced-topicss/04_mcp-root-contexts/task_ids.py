@@ -0,0 +1,60 @@
+#
+# 정렬 가능한 작업 ID (ULID 형식)
+#---------------------------------
+# -- 기존 `f"task_{datetime.now().timestamp()}"` 는 같은 시각에 만들어진 세션끼리 ID 가 겹쳐
+#    서로 덮어쓸 수 있고, 문자열 정렬 순서가 생성 순서와 맞지 않습니다.
+# -- new_task_id(): `task_` + 26자 ULID (Crockford base32)
+#    - 앞 48bit: 생성 시각 (ms) -> 문자열 정렬 = 생성 순서 (ID 인덱스가 곧 생성 시각 인덱스)
+#    - 뒤 80bit: 난수 -> 여러 프로세스가 동시에 만들어도 충돌하지 않음
+#    - 같은 ms 안에서(또는 시계가 뒤로 가도) 난수 부분을 1씩 증가시켜 항상 단조 증가
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+ENCODING = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+RANDOM_BITS = 80
+
+def encode(value: int, length: int = 26) -> str:
+    chars = []
+    for _ in range(length):
+        value, index = divmod(value, 32)
+        chars.append(ENCODING[index])
+    return "".join(reversed(chars))
+
+def decode(text: str) -> int:
+    value = 0
+    for char in text:
+        value = value * 32 + ENCODING.index(char)
+    return value
+
+class TaskIdGenerator:
+    """단조 증가하는 ULID 생성기 (스레드 안전)"""
+
+    def __init__(self, prefix: str = "task_"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def __call__(self) -> str:
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), "big")
+            else:
+                self._last_random += 1
+                if self._last_random >> RANDOM_BITS:
+                    # 1ms 안에 2^80 개를 넘게 만들 일은 없지만, 넘치면 다음 ms 로 넘어감
+                    self._last_ms += 1
+                    self._last_random = 0
+            value = (self._last_ms << RANDOM_BITS) | self._last_random
+        return self.prefix + encode(value)
+
+    def timestamp(self, task_id: str) -> datetime:
+        """ID 에 들어 있는 생성 시각"""
+        value = decode(task_id.removeprefix(self.prefix))
+        return datetime.fromtimestamp((value >> RANDOM_BITS) / 1000, tz=timezone.utc)
+
+new_task_id = TaskIdGenerator()
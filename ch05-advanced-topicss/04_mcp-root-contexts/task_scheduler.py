@@ -0,0 +1,181 @@
+#
+# 우선순위 background 작업 scheduler (execute_task 용)
+#---------------------------------
+# -- 기존 execute_task 는 tool 호출 안에서 작업을 끝까지 실행하므로 클라이언트 요청이 그동안 열려 있고,
+#    TaskConfiguration.priority 는 실행 순서에 아무 영향이 없었습니다.
+# -- TaskScheduler
+#    - submit(): 작업을 우선순위(high > medium > low) 큐에 넣고 바로 돌아옴
+#    - 동시 실행 수 제한: 전체 `workers` 개, 우선순위별 상한 `caps` (기본: low 는 절반까지만 ->
+#      low 작업이 많이 쌓여도 high / medium 이 실행될 자리가 남음)
+#    - 같은 우선순위 안에서는 먼저 들어온 순서 (FIFO)
+#    - cancel(): 대기 중이면 큐에서 빼고, 실행 중이면 task 를 cancel
+#    - metrics(): 우선순위별 큐 길이 / 실행 수, 대기 시간 (최근 `wait_samples` 개의 평균, p50, p95, max)
+# -- 환경 변수: TASK_WORKERS (기본 4)
+import asyncio
+import itertools
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+PRIORITIES = ("high", "medium", "low")
+DEFAULT_WORKERS = int(os.environ.get("TASK_WORKERS", 4))
+
+@dataclass
+class Job:
+    id: str
+    priority: str
+    func: Callable[[], Awaitable[Any]]
+    seq: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+    finished_at: float | None = None
+    status: str = "queued"                   # queued / running / completed / failed / cancelled
+    error: str | None = None
+    task: asyncio.Task | None = None
+
+    @property
+    def wait_time(self) -> float:
+        return (self.started_at or time.monotonic()) - self.enqueued_at
+
+class TaskScheduler:
+    """우선순위 큐 + 동시 실행 수 제한 background scheduler"""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, caps: dict[str, int] | None = None, wait_samples: int = 1024):
+        self.workers = max(workers, 1)
+        self.caps = {"high": self.workers, "medium": self.workers, "low": max(self.workers // 2, 1)}
+        self.caps.update(caps or {})
+        self._queues: dict[str, deque[Job]] = {priority: deque() for priority in PRIORITIES}
+        self._running: dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        self._jobs: dict[str, Job] = {}          # 대기 / 실행 중인 작업만
+        self._seq = itertools.count()
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._wait_times: dict[str, deque[float]] = {p: deque(maxlen=wait_samples) for p in PRIORITIES}
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    @staticmethod
+    def normalize_priority(priority: str) -> str:
+        priority = (priority or "").lower()
+        return priority if priority in PRIORITIES else "medium"
+
+    def _ensure_started(self):
+        # event loop 안에서 처음 submit 될 때 dispatcher 시작
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    #---------------------------------
+    async def submit(self, job_id: str, priority: str, func: Callable[[], Awaitable[Any]]) -> Job:
+        """작업을 큐에 넣음 (같은 id 가 이미 대기 / 실행 중이면 그 작업을 돌려줌)"""
+        if job_id in self._jobs:
+            return self._jobs[job_id]
+        self._ensure_started()
+        job = Job(id=job_id, priority=self.normalize_priority(priority), func=func, seq=next(self._seq))
+        self._jobs[job_id] = job
+        self.counters["submitted"] += 1
+        self._queues[job.priority].append(job)
+        self._wakeup.set()
+        return job
+
+    async def cancel(self, job_id: str) -> bool:
+        """작업 취소 (실행 중이면 task 가 실제로 끝날 때까지 기다림)"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        if job.status == "queued":
+            self._queues[job.priority].remove(job)
+            self._finish(job, "cancelled")
+        elif job.task is not None:
+            job.task.cancel()
+            await asyncio.wait([job.task])
+        return True
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def position(self, job_id: str) -> int | None:
+        """대기 중인 작업이 몇 번째로 실행될지 (0 부터, 우선순위 순)"""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != "queued":
+            return None
+        ahead = 0
+        for priority in PRIORITIES:
+            if priority == job.priority:
+                return ahead + self._queues[priority].index(job)
+            ahead += len(self._queues[priority])
+
+    #---------------------------------
+    def _next_job(self) -> Job | None:
+        if sum(self._running.values()) >= self.workers:
+            return None
+        for priority in PRIORITIES:
+            if self._queues[priority] and self._running[priority] < self.caps[priority]:
+                return self._queues[priority][0]
+        return None
+
+    async def _dispatch(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                # submit / 작업 종료 때 다시 깨어남
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            self._queues[job.priority].popleft()
+            self._running[job.priority] += 1
+            job.status = "running"
+            job.started_at = time.monotonic()
+            self._wait_times[job.priority].append(job.wait_time)
+            job.task = asyncio.create_task(job.func(), name=f"task-{job.id}")
+            # 시작 전에 cancel 되어도 done callback 은 호출되므로 실행 수가 항상 반환됨
+            job.task.add_done_callback(lambda task, job=job: self._on_done(job, task))
+
+    def _on_done(self, job: Job, task: asyncio.Task):
+        if task.cancelled():
+            status = "cancelled"
+        elif task.exception() is not None:
+            job.error = str(task.exception())
+            status = "failed"
+        else:
+            status = "completed"
+        self._running[job.priority] -= 1
+        self._finish(job, status)
+        self._wakeup.set()
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished_at = time.monotonic()
+        self.counters[status] += 1
+        self._jobs.pop(job.id, None)
+
+    async def shutdown(self):
+        """대기 중인 작업은 버리고 실행 중인 작업은 cancel"""
+        for job in list(self._jobs.values()):
+            await self.cancel(job.id)
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+
+    #---------------------------------
+    def metrics(self) -> dict:
+        waits = {}
+        for priority, samples in self._wait_times.items():
+            ordered = sorted(samples)
+            pending = [job.wait_time for job in self._queues[priority]]
+            waits[priority] = {
+                "samples": len(ordered),
+                "avg_s": round(sum(ordered) / len(ordered), 3) if ordered else None,
+                "p50_s": round(ordered[len(ordered) // 2], 3) if ordered else None,
+                "p95_s": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)], 3) if ordered else None,
+                "max_s": round(ordered[-1], 3) if ordered else None,
+                "oldest_queued_s": round(max(pending), 3) if pending else None,
+            }
+        return {
+            "workers": self.workers,
+            "caps": dict(self.caps),
+            "queue_depth": {priority: len(queue) for priority, queue in self._queues.items()},
+            "running": dict(self._running),
+            "wait_time": waits,
+            **self.counters,
+        }
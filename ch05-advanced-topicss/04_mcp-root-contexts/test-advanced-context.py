@@ -5,8 +5,10 @@ Context 고급 기능 테스트 클라이언트
 import asyncio
 from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.stdio import stdio_client
+from pydantic import AnyUrl
 import json
 from typing import Optional
+from log_collector import LogEntry, RingBufferLogCollector
 
 # 서버 파라미터 설정
 server_params = StdioServerParameters(
@@ -16,20 +18,13 @@ server_params = StdioServerParameters(
     name="Advanced Context Demo"
 )
 
-class AdvancedLogCollector:
-    """고급 로그 수집기"""
-    def __init__(self):
-        self.logs = []
-        self.progress_updates = []
-        
-    async def __call__(self, params: types.LoggingMessageNotificationParams) -> None:
-        log_entry = {
-            "level": params.level,
-            "message": params.data,
-            "timestamp": getattr(params, 'timestamp', None)
-        }
-        self.logs.append(log_entry)
-        
+class AdvancedLogCollector(RingBufferLogCollector):
+    """고급 로그 수집기 (최근 로그만 ring buffer 에 보관, 레벨별 카운터, debug sampling)"""
+    def __init__(self, capacity: int = 1000, debug_sample_every: int = 1):
+        super().__init__(capacity=capacity, debug_sample_every=debug_sample_every, echo=self.print_entry)
+
+    @staticmethod
+    def print_entry(entry: LogEntry) -> None:
         # 로그 레벨에 따른 이모지
         emoji = {
             "debug": "🔍",
@@ -37,9 +32,9 @@ class AdvancedLogCollector:
             "warning": "⚠️",
             "error": "❌",
             "critical": "🚨"
-        }.get(params.level, "📝")
+        }.get(entry.level, "📝")
         
-        print(f"{emoji} [{params.level.upper()}] {params.data}")
+        print(f"{emoji} [{entry.level.upper()}] {entry.data}")
 
 class NotificationHandler:
     """알림 처리기"""
@@ -190,7 +185,7 @@ async def test_task_session(session: ClientSession):
             print(f"❌ 예상치 못한 오류: {e}")
             return
         
-        # 2. 작업 실행
+        # 2. 작업 실행 (create_task_session 에서 이미 큐에 들어감 -> 현재 상태만 확인)
         print("\n2️⃣ 작업 실행")
         exec_result = await session.call_tool(
             "execute_task",
@@ -199,13 +194,26 @@ async def test_task_session(session: ClientSession):
         
         if exec_result.content:
             exec_data = json.loads(exec_result.content[0].text)
-            print(f"✅ 작업 완료: {exec_data.get('status')}")
-            print(f"   실행 시간: {exec_data.get('execution_time')}")
+            print(f"✅ 작업 상태: {exec_data.get('status')} (우선순위 {exec_data.get('priority')})")
         
-        # 3. 세션 정보 조회 (리소스)
+        # 3. 세션 정보 조회 (리소스) - background 작업이 끝날 때까지 확인
         print("\n3️⃣ 세션 정보 조회")
         resource_uri = f"task://session/{session_id}"
-        resource = await session.read_resource(resource_uri)
+        # 구독하면 세션이 바뀔 때 resources/updated 알림이 옴 -> 로그는 마지막 seq 이후만 읽음
+        await session.subscribe_resource(AnyUrl(resource_uri))
+        last_seq = 0
+        while True:
+            resource = await session.read_resource(resource_uri)
+            task = json.loads(resource.contents[0].text).get('session', {})
+            logs = await session.read_resource(f"{resource_uri}/logs?after={last_seq}")
+            for entry in json.loads(logs.contents[0].text).get('logs', []):
+                print(f"   📝 #{entry['seq']} {entry['step']} ({entry['progress']:.0%})")
+                last_seq = entry['seq']
+            if task.get('status') not in ('initialized', 'queued', 'running'):
+                break
+            await asyncio.sleep(1)
+        await session.unsubscribe_resource(AnyUrl(resource_uri))
+        print(f"✅ 작업 {task.get('status')}: 실행 시간 {task.get('execution_time')}")
         if resource.contents:
             print(f"📄 세션 정보:\n{resource.contents[0].text}")
 
@@ -271,6 +279,22 @@ async def test_resources(session: ClientSession):
     if resource.contents:
         data = json.loads(resource.contents[0].text)
         print(f"활성 작업 수: {data.get('active_tasks')}개")
+    
+    # scheduler 지표 조회
+    print("\n📊 scheduler 지표 조회")
+    resource = await session.read_resource("scheduler://metrics")
+    if resource.contents:
+        data = json.loads(resource.contents[0].text)
+        print(f"큐 길이: {data.get('queue_depth')}, 실행 중: {data.get('running')}")
+        print(f"완료 {data.get('completed')}개, 취소 {data.get('cancelled')}개, 실패 {data.get('failed')}개")
+    
+    # elicitation 지표 조회 (같은 설정 질문을 캐시로 건너뛴 횟수, 응답 대기 시간)
+    print("\n📊 elicitation 지표 조회")
+    resource = await session.read_resource("elicitation://metrics")
+    if resource.contents:
+        data = json.loads(resource.contents[0].text)
+        print(f"물어본 횟수: {data.get('asked')}, 건너뛴 횟수: {data.get('skipped')} (policy={data.get('policy')})")
+        print(f"응답 대기 시간: {data.get('wait_seconds')}")
 
 async def run():
     """메인 실행 함수"""
@@ -317,14 +341,13 @@ async def run():
             print("\n" + "="*60)
             print("📊 최종 통계")
             print("="*60)
-            print(f"총 로그 메시지: {len(log_collector.logs)}개")
+            stats = log_collector.stats()
+            print(f"총 로그 메시지: {stats['received']}개 (보관 {stats['retained']}개, "
+                  f"밀려남 {stats['evicted']}개, debug sampling 제외 {stats['sampled_out']}개)")
             print(f"총 알림: {len(notification_handler.notifications)}개")
             
-            # 로그 레벨별 통계
-            level_counts = {}
-            for log in log_collector.logs:
-                level = log['level']
-                level_counts[level] = level_counts.get(level, 0) + 1
+            # 로그 레벨별 통계 (ring buffer 에서 밀려난 로그까지 포함)
+            level_counts = log_collector.level_counts
             
             print("\n로그 레벨별 통계:")
             for level, count in sorted(level_counts.items()):
@@ -68,69 +68,55 @@ async def elicitation_handler(context, params):
             print(f"📝 사용자 응답: {response_data}")
             return types.ElicitResult(action="accept", content=response_data)
     
-    elif "배송 옵션" in params.message:
+    # 서버가 여러 단계의 질문을 한 번에 보내므로 (combine_schemas) 스키마의 필드를 보고 필요한 것만 물어봄
+    properties = params.requestedSchema.get("properties", {})
+    yes = ['y', 'yes', '예', '네']
+    response_data = {}
+    
+    if "deliveryType" in properties:
         # 배송 옵션 선택
         print(f"질문: {params.message}")
         
         delivery_type = input("배송 방법을 선택하세요 (standard/express/overnight): ").strip()
-        gift_wrap = input("선물 포장을 원하시나요? (y/n): ").lower().strip() in ['y', 'yes', '예', '네']
+        gift_wrap = input("선물 포장을 원하시나요? (y/n): ").lower().strip() in yes
         special_instructions = input("특별 요청사항 (없으면 엔터): ").strip()
         
-        response_data = {
+        response_data.update({
             "deliveryType": delivery_type if delivery_type else "standard",
             "giftWrap": gift_wrap,
             "specialInstructions": special_instructions if special_instructions else None
-        }
-        print(f"📝 사용자 응답: {response_data}")
-        return types.ElicitResult(action="accept", content=response_data)
+        })
     
-    elif "결제 방법" in params.message:
+    if "method" in properties:
         # 결제 방법 선택
-        print(f"질문: {params.message}")
-        
         method = input("결제 수단을 선택하세요 (card/bank/paypal): ").strip()
-        save_for_future = input("다음에도 사용하기 위해 저장하시겠습니까? (y/n): ").lower().strip() in ['y', 'yes', '예', '네']
+        save_for_future = input("다음에도 사용하기 위해 저장하시겠습니까? (y/n): ").lower().strip() in yes
         
-        response_data = {
+        response_data.update({
             "method": method if method else "card",
             "saveForFuture": save_for_future
-        }
-        print(f"📝 사용자 응답: {response_data}")
-        return types.ElicitResult(action="accept", content=response_data)
+        })
     
-    elif "알림" in params.message:
-        # 알림 설정
+    if "enable" in properties:
+        # 알림 설정 (알림 여부 + 빈도)
         print(f"질문: {params.message}")
         
-        if "설정하시겠습니까" in params.message:
-            enable = input("알림을 받으시겠습니까? (y/n): ").lower().strip() in ['y', 'yes', '예', '네']
-            if enable:
-                email = input("이메일로 받으시겠습니까? (y/n): ").lower().strip() in ['y', 'yes', '예', '네']
-                sms = input("SMS로 받으시겠습니까? (y/n): ").lower().strip() in ['y', 'yes', '예', '네']
-                response_data = {
-                    "enable": True,
-                    "email": email,
-                    "sms": sms
-                }
-            else:
-                response_data = {
-                    "enable": False,
-                    "email": False,
-                    "sms": False
-                }
-        else:
-            frequency = input("알림 빈도를 선택하세요 (immediate/daily/weekly): ").strip()
-            quiet_hours = input("방해 금지 시간을 설정하시겠습니까? (y/n): ").lower().strip() in ['y', 'yes', '예', '네']
-            response_data = {
-                "frequency": frequency if frequency else "daily",
-                "quiet_hours": quiet_hours
-            }
+        enable = input("알림을 받으시겠습니까? (y/n): ").lower().strip() in yes
+        response_data.update({"enable": enable, "email": False, "sms": False})
+        if enable:
+            response_data["email"] = input("이메일로 받으시겠습니까? (y/n): ").lower().strip() in yes
+            response_data["sms"] = input("SMS로 받으시겠습니까? (y/n): ").lower().strip() in yes
+            if "frequency" in properties:
+                frequency = input("알림 빈도를 선택하세요 (immediate/daily/weekly): ").strip()
+                response_data["frequency"] = frequency if frequency else "daily"
+                response_data["quiet_hours"] = input("방해 금지 시간을 설정하시겠습니까? (y/n): ").lower().strip() in yes
+    
+    if response_data:
         print(f"📝 사용자 응답: {response_data}")
         return types.ElicitResult(action="accept", content=response_data)
     
-    else:
-        print("📝 기본 응답: 취소")
-        return types.ElicitResult(action="cancel")
+    print("📝 기본 응답: 취소")
+    return types.ElicitResult(action="cancel")
 
 async def test_elicitation_server():
     """Elicitation 서버 테스트"""
@@ -0,0 +1,253 @@
+#
+# 모니터링 지표 시계열 저장소 (해상도별 rollup + downsampling)
+#---------------------------------
+# -- 기존 monitor_system 은 수집한 sample 을 모두 응답에 넣었으므로 몇 시간짜리 모니터링은 응답이 매우 커집니다.
+# -- TimeSeriesStore
+#    - 해상도(tier): raw (sample 그대로), 10s, 1m, 1h
+#      rollup tier 는 bucket 마다 필드별 min / max / sum 과 sample 수를 보관 -> avg = sum / count
+#      sample 이 들어올 때 각 tier 의 열린 bucket 만 갱신하므로 sample 당 O(tier 수)
+#    - 보관 기간: tier 별 ring buffer (필드별 array('d') 열) 크기 = 보관 기간 / 해상도
+#      MONITOR_RETENTION="raw=1h,10s=1d,1m=7d,1h=90d" 형식으로 변경 가능
+#    - rows(): 구간을 `points` 개 이하의 행(bucket 평균)으로
+#    - query(): 한 필드를 LTTB (Largest-Triangle-Three-Buckets) 또는 min/max bucket 으로 downsampling
+#      구간을 덮는 가장 촘촘한 tier 를 고르되, 읽을 점이 `points` 의 10배를 넘으면 더 거친 tier 사용
+import os
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+DEFAULT_RETENTION = "raw=1h,10s=1d,1m=7d,1h=90d"
+
+def parse_duration(text: str) -> float:
+    return float(text[:-1]) * UNITS[text[-1]] if text[-1] in UNITS else float(text)
+
+def parse_retention(text: str) -> dict[str, float]:
+    """"raw=1h,10s=1d" -> {"raw": 3600, "10s": 86400}"""
+    return {
+        name.strip(): parse_duration(value.strip())
+        for name, value in (item.split("=") for item in text.split(",") if item.strip())
+    }
+
+def _column(size: int) -> array:
+    return array("d", bytes(8 * size))
+
+class _Timestamps:
+    """ring buffer 의 timestamp 를 오래된 것부터 index 로 읽게 해 주는 view (bisect 용)"""
+
+    def __init__(self, tier: "Tier"):
+        self.tier = tier
+
+    def __len__(self):
+        return self.tier.size
+
+    def __getitem__(self, index: int) -> float:
+        return self.tier.ts[self.tier.slot(index)]
+
+@dataclass
+class Window:
+    """tier 에서 읽은 구간 (열 단위)"""
+    resolution: str
+    ts: list[float]
+    avg: dict[str, list[float]]
+    min: dict[str, list[float]]
+    max: dict[str, list[float]]
+
+class Tier:
+    def __init__(self, name: str, step: float, retention: float, fields: tuple[str, ...], sample_interval: float):
+        self.name = name
+        self.step = step                                   # 0 이면 raw
+        self.fields = fields
+        self.capacity = max(1, int(retention // (step or sample_interval)))
+        self.ts = _column(self.capacity)
+        self.count = _column(self.capacity)
+        self.sum = {field: _column(self.capacity) for field in fields}
+        if step:
+            self.min = {field: _column(self.capacity) for field in fields}
+            self.max = {field: _column(self.capacity) for field in fields}
+        else:
+            # raw 는 bucket 하나에 sample 하나 -> min = max = sum
+            self.min = self.max = self.sum
+        self.size = 0
+        self.head = 0                                      # 다음에 쓸 slot
+        self.evicted = 0
+        self._open = None                                  # rollup 의 아직 닫히지 않은 bucket
+
+    def slot(self, index: int) -> int:
+        return (self.head - self.size + index) % self.capacity
+
+    @property
+    def oldest(self) -> float | None:
+        return self.ts[self.slot(0)] if self.size else None
+
+    def _commit(self, ts, count, sums, mins, maxs):
+        slot = self.head
+        self.ts[slot] = ts
+        self.count[slot] = count
+        for field in self.fields:
+            self.sum[field][slot] = sums[field]
+            self.min[field][slot] = mins[field]
+            self.max[field][slot] = maxs[field]
+        self.head = (self.head + 1) % self.capacity
+        if self.size == self.capacity:
+            self.evicted += 1
+        else:
+            self.size += 1
+
+    def add(self, ts: float, values: dict[str, float]):
+        if not self.step:
+            self._commit(ts, 1, values, values, values)
+            return
+        bucket = ts - ts % self.step
+        if self._open is not None and self._open[0] != bucket:
+            self._commit(*self._open)
+            self._open = None
+        if self._open is None:
+            self._open = [bucket, 0, dict.fromkeys(self.fields, 0.0), dict(values), dict(values)]
+        _, _, sums, mins, maxs = self._open
+        self._open[1] += 1
+        for field, value in values.items():
+            sums[field] += value
+            if value < mins[field]:
+                mins[field] = value
+            if value > maxs[field]:
+                maxs[field] = value
+
+    def covers(self, start: float) -> bool:
+        # 아직 밀려난 것이 없으면 들어온 데이터를 모두 갖고 있음
+        return self.evicted == 0 or (self.oldest is not None and self.oldest <= start)
+
+    def count_between(self, start: float, end: float) -> int:
+        view = _Timestamps(self)
+        return bisect_right(view, end) - bisect_left(view, start) + (self._open is not None)
+
+    def window(self, start: float, end: float, fields) -> Window:
+        view = _Timestamps(self)
+        slots = [self.slot(i) for i in range(bisect_left(view, start), bisect_right(view, end))]
+        ts = [self.ts[slot] for slot in slots]
+        counts = [self.count[slot] for slot in slots]
+        avg = {f: [self.sum[f][slot] / n for slot, n in zip(slots, counts)] for f in fields}
+        mins = {f: [self.min[f][slot] for slot in slots] for f in fields}
+        maxs = {f: [self.max[f][slot] for slot in slots] for f in fields}
+        # 열려 있는 (진행 중인) bucket 도 마지막 점으로 포함
+        if self._open is not None and start <= self._open[0] <= end:
+            bucket, count, sums, open_min, open_max = self._open
+            ts.append(bucket)
+            for f in fields:
+                avg[f].append(sums[f] / count)
+                mins[f].append(open_min[f])
+                maxs[f].append(open_max[f])
+        return Window(self.name, ts, avg, mins, maxs)
+
+#---------------------------------
+# downsampling
+def lttb(xs: list[float], ys: list[float], threshold: int) -> list[int]:
+    """Largest-Triangle-Three-Buckets (Steinarsson, 2013) - 남길 점들의 index"""
+    n = len(xs)
+    if threshold >= n:
+        return list(range(n))
+    if threshold < 3:
+        return [0, n - 1] if threshold == 2 else [0]
+    selected = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # 다음 bucket 의 평균점
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+        # 현재 bucket 에서 (이전 선택점, 다음 bucket 평균점) 과 만드는 삼각형이 가장 큰 점
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+def bucket_bounds(n: int, buckets: int) -> list[tuple[int, int]]:
+    buckets = max(1, min(buckets, n))
+    return [(n * i // buckets, n * (i + 1) // buckets) for i in range(buckets)]
+
+#---------------------------------
+class TimeSeriesStore:
+    def __init__(self, fields: tuple[str, ...], retention: dict[str, float] | str | None = None,
+                 sample_interval: float = 1.0):
+        if retention is None or isinstance(retention, str):
+            retention = parse_retention(retention or os.environ.get("MONITOR_RETENTION", DEFAULT_RETENTION))
+        self.fields = tuple(fields)
+        self.tiers = [
+            Tier(name, 0 if name == "raw" else parse_duration(name), seconds, self.fields, sample_interval)
+            for name, seconds in sorted(retention.items(), key=lambda item: 0 if item[0] == "raw" else parse_duration(item[0]))
+        ]
+        self.samples = 0
+
+    def add(self, ts: float, values: dict[str, float]):
+        self.samples += 1
+        for tier in self.tiers:
+            tier.add(ts, values)
+
+    def pick_tier(self, start: float, end: float, points: int) -> Tier:
+        covering = [tier for tier in self.tiers if tier.covers(start)]
+        finer = None
+        for tier in covering:
+            count = tier.count_between(start, end)
+            if count <= points * 10:
+                # 너무 거칠어서 `points` 개도 안 나오면 한 단계 촘촘한 tier 를 읽어서 줄임
+                return finer if count < points and finer is not None else tier
+            finer = tier
+        # 가장 거친 tier 로도 안 되면 그것을, 구간이 보관 기간 밖이면 가장 오래 보관하는 tier 를 사용
+        return covering[-1] if covering else self.tiers[-1]
+
+    def rows(self, start: float, end: float, points: int, fields=None) -> tuple[str, list[dict]]:
+        """구간을 `points` 개 이하의 행으로 (행 = 연속한 bucket 들의 평균)"""
+        fields = fields or self.fields
+        window = self.pick_tier(start, end, points).window(start, end, fields)
+        rows = []
+        for lo, hi in bucket_bounds(len(window.ts), points) if window.ts else []:
+            row = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(window.ts[lo]))}
+            for field in fields:
+                values = window.avg[field][lo:hi]
+                row[field] = round(sum(values) / len(values), 1)
+            rows.append(row)
+        return window.resolution, rows
+
+    def query(self, field: str, start: float, end: float, points: int = 100, method: str = "lttb") -> dict:
+        if field not in self.fields:
+            raise ValueError(f"unknown field: {field} (one of {', '.join(self.fields)})")
+        tier = self.pick_tier(start, end, points)
+        window = tier.window(start, end, (field,))
+        stamp = lambda t: time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(t))
+        if method == "minmax":
+            # bucket 마다 (시작 시각, 최솟값, 최댓값) -> 순간적인 spike 도 사라지지 않음
+            series = [
+                [stamp(window.ts[lo]), round(min(window.min[field][lo:hi]), 2), round(max(window.max[field][lo:hi]), 2)]
+                for lo, hi in (bucket_bounds(len(window.ts), points) if window.ts else [])
+            ]
+        elif method == "lttb":
+            keep = lttb(window.ts, window.avg[field], points)
+            series = [[stamp(window.ts[i]), round(window.avg[field][i], 2)] for i in keep]
+        else:
+            raise ValueError(f"unknown method: {method} (lttb or minmax)")
+        return {
+            "field": field,
+            "method": method,
+            "resolution": tier.name,
+            "source_points": len(window.ts),
+            "points": len(series),
+            "series": series,
+        }
+
+    def stats(self) -> dict:
+        return {
+            "samples": self.samples,
+            "tiers": {
+                tier.name: {"points": tier.size, "capacity": tier.capacity, "oldest": tier.oldest}
+                for tier in self.tiers
+            },
+        }
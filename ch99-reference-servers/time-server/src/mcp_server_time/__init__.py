@@ -8,9 +8,11 @@ def main():
     parser = argparse.ArgumentParser(description="give a model the ability to handle time queries and timezone conversions")
     parser.add_argument("--local-timezone", type=str, default="UTC", 
                        help="Override local timezone (default: UTC)")
+    parser.add_argument("--pretty-json", action="store_true",
+                       help="Indent tool results (default: compact JSON)")
     args = parser.parse_args()
     
-    asyncio.run(serve(args.local_timezone))
+    asyncio.run(serve(args.local_timezone, args.pretty_json))
     
 if __name__ == "__main__":
     main()
\ No newline at end of file
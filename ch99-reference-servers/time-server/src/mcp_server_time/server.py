@@ -1,6 +1,5 @@
 from datetime import datetime, timedelta
 from enum  import Enum
-import json
 from typing import Sequence
 
 try:
@@ -146,7 +145,7 @@ class TimeServer:
         )
 
 #=============================================================    
-async def serve(local_timezone: str | None = None) -> None:
+async def serve(local_timezone: str | None = None, pretty_json: bool = False) -> None:
     server = Server("mcp-time-server")
     time_server = TimeServer()
     local_tz = str(get_local_tz(local_timezone))
@@ -223,7 +222,8 @@ async def serve(local_timezone: str | None = None) -> None:
                 raise ValueError(f"No result returned for tool: {name}")
                 
             return [
-                TextContent(type="text", text=json.dumps(result.model_dump(), indent=2))
+                # -- pydantic-core (Rust) 로 바로 직렬화, 기본은 compact (--pretty-json 일 때만 들여쓰기)
+                TextContent(type="text", text=result.model_dump_json(indent=2 if pretty_json else None))
             ]
         except Exception as e:
             return [